@@ -25,7 +25,8 @@ def _get_db(config: dict) -> duckdb.DuckDBPyConnection:
     with _db_lock:
         if _db_conn is None:
             base_path = config["general"]["base_path"]
-            _db_conn = connect_and_register_views(base_path, config=config)
+            # Read-only queries only, so a cursor on the shared view set is safe
+            _db_conn = connect_and_register_views(base_path, config=config, shared=True)
         return _db_conn
 
 
@@ -6,18 +6,24 @@ import signal
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 import websockets
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Initialise quiet-by-default logging for production/containerised environments
 from tools.logging_setup import setup_logging
 setup_logging()
 
+from collector.exchanges.binance import parse_binance_message
 from tools.common import (
     ensure_dir,
-    ensure_parent_dir,
     get_exchange_config,
     get_local_date_str_utc,
     get_raw_base_dir,
@@ -45,6 +51,18 @@ def _log_connection_event(raw_root: str, exchange_name: str, event: str, reason:
         pass  # Don't let event logging break the collector
 
 
+# Raw JSONL files are written through a large binary buffer; it is flushed
+# on rotation and close, so at most one rotation window sits in memory.
+WRITER_BUFFER_BYTES = 1 << 20
+
+
+def _encode_jsonl_line(obj: Dict[str, Any]) -> bytes:
+    """Encode one record as a UTF-8 JSON line (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
 class NetworkTimeoutWarning(UserWarning):
     """
     Custom warning for network timeout and connection issues.
@@ -64,30 +82,34 @@ class RotatingJSONLWriter:
     part_index: int = 0
     next_rotation_epoch: float = field(default_factory=lambda: 0.0)
     fp: Optional[Any] = None
+    _ensured_dirs: Set[str] = field(default_factory=set, repr=False)
 
     def _resolve_dir(self, date_str: str) -> str:
         dirpath = os.path.join(self.base_dir, self.symbol, date_str)
-        ensure_dir(dirpath)
+        # mkdir once per (symbol, date); later rotations reuse the result
+        if dirpath not in self._ensured_dirs:
+            ensure_dir(dirpath)
+            self._ensured_dirs.add(dirpath)
         return dirpath
 
     def _next_part_index(self, dirpath: str) -> int:
-        # Determine next part number by scanning directory once per day rollover
+        # Determine next part number with one directory scan when a day is
+        # opened; rotations then advance part_index in memory
+        max_part = 0
         try:
-            files = [f for f in os.listdir(dirpath) if f.lower().endswith(".jsonl")]
-            max_part = 0
-            for f in files:
-                # Expect pattern part_XXX.jsonl
-                name = os.path.splitext(f)[0]
-                if name.startswith("part_"):
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    # Expect pattern part_XXX.jsonl
+                    name, ext = os.path.splitext(entry.name)
+                    if ext.lower() != ".jsonl" or not name.startswith("part_"):
+                        continue
                     try:
-                        idx = int(name.split("_")[1])
-                        if idx > max_part:
-                            max_part = idx
-                    except Exception:
+                        max_part = max(max_part, int(name.split("_")[1]))
+                    except ValueError:
                         continue
-            return max_part + 1
         except FileNotFoundError:
-            return 1
+            pass
+        return max_part + 1
 
     def _open_new_file(self, now_epoch: float) -> None:
         date_str = get_local_date_str_utc(epoch=now_epoch)
@@ -101,14 +123,19 @@ class RotatingJSONLWriter:
 
         filename = f"part_{self.part_index:03d}.jsonl"
         path = os.path.join(dirpath, filename)
-        ensure_parent_dir(path)
         if self.fp:
             try:
                 self.fp.flush()
                 self.fp.close()
             except Exception:
                 pass
-        self.fp = open(path, "a", encoding="utf-8")
+        try:
+            self.fp = open(path, "ab", buffering=WRITER_BUFFER_BYTES)
+        except FileNotFoundError:
+            # Directory removed since it was cached (e.g. cleanup); recreate it
+            self._ensured_dirs.discard(dirpath)
+            self._resolve_dir(self.current_date)
+            self.fp = open(path, "ab", buffering=WRITER_BUFFER_BYTES)
         # Set next rotation boundary
         window = int(now_epoch // self.interval_sec) * self.interval_sec
         self.next_rotation_epoch = float(window + self.interval_sec)
@@ -126,8 +153,7 @@ class RotatingJSONLWriter:
         t = time.time() if now_epoch is None else now_epoch
         self._rotate_if_needed(t)
         if self.fp:
-            line = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
-            self.fp.write(line + "\n")
+            self.fp.write(_encode_jsonl_line(obj))
 
     def close(self) -> None:
         if self.fp:
@@ -141,76 +167,11 @@ class RotatingJSONLWriter:
 def parse_event(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Parse Binance combined-stream or ws-subscription message into a normalized record.
-    Returns a dict with keys: symbol, ts_event, ts_recv, price, qty, side, bid, ask, stream.
+    Returns a dict with keys: exchange, symbol, ts_event, ts_recv, price, qty, side,
+    bid, ask, stream, trade_id.
     """
     try:
-        # Combined stream payload includes {"stream": "...", "data": {...}}
-        stream = message.get("stream")
-        data = message.get("data", message)
-
-        # Derive type
-        if stream:
-            if "@trade" in stream:
-                typ = "trade"
-            elif "@bookTicker" in stream:
-                typ = "bookTicker"
-            else:
-                typ = data.get("e", "unknown")
-        else:
-            etype = str(data.get("e", "")).lower()
-            if "trade" in etype:
-                typ = "trade"
-            elif "bookticker" in etype:
-                typ = "bookTicker"
-            else:
-                typ = etype or "unknown"
-
-        symbol = str(data.get("s", "")).upper()
-        ts_event = int(data.get("E") or data.get("T") or int(time.time() * 1000))
-        ts_recv = int(time.time() * 1000)
-
-        price = None
-        qty = None
-        side = None
-        bid = None
-        ask = None
-        trade_id = None
-
-        if typ == "trade":
-            # Trade payload: p (price), q (qty), m (is buyer maker), t (trade ID)
-            p = data.get("p")
-            q = data.get("q")
-            t = data.get("t")
-            if p is not None:
-                price = float(p)
-            if q is not None:
-                qty = float(q)
-            if t is not None:
-                trade_id = int(t)
-            mflag = data.get("m")
-            side = "sell" if bool(mflag) else "buy"
-        elif typ == "bookTicker":
-            # Best bid/ask payload: b (bid price), a (ask price)
-            b = data.get("b")
-            a = data.get("a")
-            if b is not None:
-                bid = float(b)
-            if a is not None:
-                ask = float(a)
-
-        record = {
-            "symbol": symbol,
-            "ts_event": ts_event,
-            "ts_recv": ts_recv,
-            "price": price,
-            "qty": qty,
-            "side": side,
-            "bid": bid,
-            "ask": ask,
-            "stream": typ,
-            "trade_id": trade_id,
-        }
-        return record
+        return parse_binance_message(message)
     except Exception as e:
         logger.exception(f"Failed to parse event message: {e}")
         return None
@@ -8,6 +8,106 @@ from loguru import logger
 from collector.exchanges.base import ExchangeAdapter
 
 
+# Stream suffix (after "@") -> normalised event type
+_STREAM_TYPES = {
+    "trade": "trade",
+    "bookTicker": "bookTicker",
+}
+
+
+def _event_type(raw_msg: Dict[str, Any], data: Dict[str, Any]) -> str:
+    """Derive the normalised event type from the stream name or payload."""
+    stream = raw_msg.get("stream")
+    if stream:
+        return _STREAM_TYPES.get(stream.rpartition("@")[2]) or data.get("e", "unknown")
+
+    etype = str(data.get("e", "")).lower()
+    if "trade" in etype:
+        return "trade"
+    if "bookticker" in etype:
+        return "bookTicker"
+    return etype or "unknown"
+
+
+def _parse_trade(data: Dict[str, Any], typ: str, exchange: str) -> Dict[str, Any]:
+    # Trade payload: p (price), q (qty), m (is buyer maker), t (trade ID)
+    get = data.get
+    ts_recv = int(time.time() * 1000)
+    p = get("p")
+    q = get("q")
+    t = get("t")
+    return {
+        "exchange": exchange,
+        "symbol": str(get("s", "")).upper(),
+        "ts_event": int(get("E") or get("T") or ts_recv),
+        "ts_recv": ts_recv,
+        "price": float(p) if p is not None else None,
+        "qty": float(q) if q is not None else None,
+        "side": "sell" if get("m") else "buy",
+        "bid": None,
+        "ask": None,
+        "stream": typ,
+        "trade_id": int(t) if t is not None else None,
+    }
+
+
+def _parse_book_ticker(data: Dict[str, Any], typ: str, exchange: str) -> Dict[str, Any]:
+    # Best bid/ask payload: b (bid price), a (ask price)
+    get = data.get
+    ts_recv = int(time.time() * 1000)
+    b = get("b")
+    a = get("a")
+    return {
+        "exchange": exchange,
+        "symbol": str(get("s", "")).upper(),
+        "ts_event": int(get("E") or get("T") or ts_recv),
+        "ts_recv": ts_recv,
+        "price": None,
+        "qty": None,
+        "side": None,
+        "bid": float(b) if b is not None else None,
+        "ask": float(a) if a is not None else None,
+        "stream": typ,
+        "trade_id": None,
+    }
+
+
+def _parse_other(data: Dict[str, Any], typ: str, exchange: str) -> Dict[str, Any]:
+    get = data.get
+    ts_recv = int(time.time() * 1000)
+    return {
+        "exchange": exchange,
+        "symbol": str(get("s", "")).upper(),
+        "ts_event": int(get("E") or get("T") or ts_recv),
+        "ts_recv": ts_recv,
+        "price": None,
+        "qty": None,
+        "side": None,
+        "bid": None,
+        "ask": None,
+        "stream": typ,
+        "trade_id": None,
+    }
+
+
+_PARSERS = {
+    "trade": _parse_trade,
+    "bookTicker": _parse_book_ticker,
+}
+
+
+def parse_binance_message(raw_msg: Dict[str, Any], exchange: str = "binance") -> Dict[str, Any]:
+    """
+    Parse a Binance combined-stream or ws-subscription message.
+
+    Dispatches on the event type to a specialised handler; raises on
+    malformed payloads so callers can log and skip.
+    """
+    data = raw_msg.get("data", raw_msg)
+    typ = _event_type(raw_msg, data)
+    return _PARSERS.get(typ, _parse_other)(data, typ, exchange)
+
+
 class BinanceAdapter(ExchangeAdapter):
     """Adapter for Binance combined WebSocket streams (trade + bookTicker)."""
 
@@ -28,69 +128,7 @@ class BinanceAdapter(ExchangeAdapter):
 
     def parse_event(self, raw_msg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
-            stream = raw_msg.get("stream")
-            data = raw_msg.get("data", raw_msg)
-
-            if stream:
-                if "@trade" in stream:
-                    typ = "trade"
-                elif "@bookTicker" in stream:
-                    typ = "bookTicker"
-                else:
-                    typ = data.get("e", "unknown")
-            else:
-                etype = str(data.get("e", "")).lower()
-                if "trade" in etype:
-                    typ = "trade"
-                elif "bookticker" in etype:
-                    typ = "bookTicker"
-                else:
-                    typ = etype or "unknown"
-
-            symbol = str(data.get("s", "")).upper()
-            ts_event = int(data.get("E") or data.get("T") or int(time.time() * 1000))
-            ts_recv = int(time.time() * 1000)
-
-            price = None
-            qty = None
-            side = None
-            bid = None
-            ask = None
-            trade_id = None
-
-            if typ == "trade":
-                p = data.get("p")
-                q = data.get("q")
-                t = data.get("t")
-                if p is not None:
-                    price = float(p)
-                if q is not None:
-                    qty = float(q)
-                if t is not None:
-                    trade_id = int(t)
-                mflag = data.get("m")
-                side = "sell" if bool(mflag) else "buy"
-            elif typ == "bookTicker":
-                b = data.get("b")
-                a = data.get("a")
-                if b is not None:
-                    bid = float(b)
-                if a is not None:
-                    ask = float(a)
-
-            return {
-                "exchange": self.exchange_name,
-                "symbol": symbol,
-                "ts_event": ts_event,
-                "ts_recv": ts_recv,
-                "price": price,
-                "qty": qty,
-                "side": side,
-                "bid": bid,
-                "ask": ask,
-                "stream": typ,
-                "trade_id": trade_id,
-            }
+            return parse_binance_message(raw_msg, self.exchange_name)
         except Exception as e:
             logger.exception(f"Binance parse error: {e}")
             return None
@@ -102,6 +102,12 @@ def parse_args() -> argparse.Namespace:
         default="parquet",
         help="Output format for slice mode (parquet or csv).",
     )
+    parser.add_argument(
+        "--columns",
+        type=str,
+        default=None,
+        help="Comma-separated columns to export in slice mode (default: all).",
+    )
     parser.add_argument(
         "--report",
         type=str,
@@ -253,6 +259,7 @@ def main() -> None:
             source=args.source,
             out=args.out,
             format=args.format,
+            columns=[c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None,
         )
         return
 
@@ -4,31 +4,46 @@ QA Configuration
 Loads and validates QA configuration with sane defaults.
 """
 
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any, Dict
 
 from loguru import logger
 
 
-# Default QA configuration
-DEFAULT_QA_CONFIG = {
+# Default QA configuration (read-only; use _clone_defaults() for a mutable copy)
+DEFAULT_QA_CONFIG = MappingProxyType({
     "enable_ai": True,
     "hourly_window_min": 90,
     "daily_run_utc": "00:15",
     "ai_labeler": "rules",
-    "iforest": {
+    "iforest": MappingProxyType({
         "n_estimators": 200,
         "contamination": 0.005,
         "random_state": 42
-    },
-    "zscore": {
+    }),
+    "zscore": MappingProxyType({
         "window": "1h",
         "k": 5.0
-    },
-    "jump": {
+    }),
+    "jump": MappingProxyType({
         "k_sigma": 6.0,
         "spread_stable_bps": 50
+    })
+})
+
+
+def _clone_defaults() -> Dict[str, Any]:
+    """
+    Return a mutable copy of DEFAULT_QA_CONFIG.
+
+    Defaults are two levels deep with immutable leaves, so copying each
+    nested block is enough (and much cheaper than copy.deepcopy).
+    """
+    return {
+        key: dict(value) if isinstance(value, Mapping) else value
+        for key, value in DEFAULT_QA_CONFIG.items()
     }
-}
 
 
 def load_qa_config(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -44,7 +59,7 @@ def load_qa_config(config: Dict[str, Any]) -> Dict[str, Any]:
     qa_config = config.get("qa", {})
 
     # Apply defaults for missing keys
-    resolved = DEFAULT_QA_CONFIG.copy()
+    resolved = _clone_defaults()
     resolved.update(qa_config)
 
     # Ensure nested dicts are merged properly
@@ -67,6 +82,39 @@ def load_qa_config(config: Dict[str, Any]) -> Dict[str, Any]:
     return resolved
 
 
+VALID_LABELERS = ["rules", "llm", "hybrid"]
+
+
+def _is_numeric(value: Any) -> bool:
+    """Check whether value is an int or float."""
+    return isinstance(value, (int, float))
+
+
+# Validation rules: (dotted key, default if missing, check, error message).
+# Keys are split once at import time and rules are evaluated in order.
+_VALIDATION_RULES = tuple(
+    (tuple(key.split(".")), default, check, message)
+    for key, default, check, message in (
+        ("enable_ai", None, lambda v: isinstance(v, bool),
+         "qa.enable_ai must be boolean"),
+        ("hourly_window_min", None, _is_numeric,
+         "qa.hourly_window_min must be numeric"),
+        ("hourly_window_min", None, lambda v: v > 0,
+         "qa.hourly_window_min must be positive"),
+        ("daily_run_utc", None, lambda v: isinstance(v, str),
+         "qa.daily_run_utc must be string (HH:MM format)"),
+        ("ai_labeler", None, lambda v: v in VALID_LABELERS,
+         f"qa.ai_labeler must be one of {VALID_LABELERS}"),
+        ("iforest.contamination", 0, lambda v: 0 < v < 1,
+         "qa.iforest.contamination must be in (0, 1)"),
+        ("zscore.k", 0, lambda v: v > 0,
+         "qa.zscore.k must be positive"),
+        ("jump.k_sigma", 0, lambda v: v > 0,
+         "qa.jump.k_sigma must be positive"),
+    )
+)
+
+
 def _validate_qa_config(qa_config: Dict[str, Any]) -> None:
     """
     Validate QA configuration.
@@ -77,33 +125,13 @@ def _validate_qa_config(qa_config: Dict[str, Any]) -> None:
     Raises:
         ValueError: If configuration is invalid
     """
-    if not isinstance(qa_config.get("enable_ai"), bool):
-        raise ValueError("qa.enable_ai must be boolean")
-
-    if not isinstance(qa_config.get("hourly_window_min"), (int, float)):
-        raise ValueError("qa.hourly_window_min must be numeric")
-
-    if qa_config["hourly_window_min"] <= 0:
-        raise ValueError("qa.hourly_window_min must be positive")
-
-    if not isinstance(qa_config.get("daily_run_utc"), str):
-        raise ValueError("qa.daily_run_utc must be string (HH:MM format)")
-
-    valid_labelers = ["rules", "llm", "hybrid"]
-    if qa_config.get("ai_labeler") not in valid_labelers:
-        raise ValueError(f"qa.ai_labeler must be one of {valid_labelers}")
-
-    # Validate nested configs
-    iforest = qa_config.get("iforest", {})
-    if iforest.get("contamination", 0) <= 0 or iforest.get("contamination", 0) >= 1:
-        raise ValueError("qa.iforest.contamination must be in (0, 1)")
-
-    zscore = qa_config.get("zscore", {})
-    if zscore.get("k", 0) <= 0:
-        raise ValueError("qa.zscore.k must be positive")
-
-    jump = qa_config.get("jump", {})
-    if jump.get("k_sigma", 0) <= 0:
-        raise ValueError("qa.jump.k_sigma must be positive")
+    for path, default, check, message in _VALIDATION_RULES:
+        value = qa_config
+        for part in path[:-1]:
+            value = value.get(part, {})
+        value = value.get(path[-1], default)
+
+        if not check(value):
+            raise ValueError(message)
 
     logger.debug("QA configuration validated successfully")
@@ -14,15 +14,23 @@ Verdict logic:
 
 import json
 import os
-from collections import defaultdict
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from qa.schema_validator import SEVERITY_MAP
 
+# Schema score penalty per violation, by severity
+SEVERITY_PENALTIES = {
+    "critical": 0.5,
+    "major": 0.2,
+    "minor": 0.05,
+}
+
 
 def load_violations(violations_path: str) -> List[Dict[str, Any]]:
     """Load schema violations from JSONL file."""
@@ -80,63 +88,132 @@ def compute_fusion_scores(
     Returns:
         DataFrame with columns: ts, symbol, verdict, score, metadata
     """
-    # Group violations by symbol
-    violations_by_symbol = defaultdict(list)
-    for v in violations:
-        violations_by_symbol[v["symbol"]].append(v)
+    # All per-symbol aggregation is done in single groupby passes below, so
+    # the cost is O(V + A + S) and stays single-threaded: the only remaining
+    # per-symbol Python work is metadata JSON encoding, which holds the GIL.
+    symbols = pd.Index(all_symbols, name="symbol")
+    severities = list(SEVERITY_PENALTIES)
+
+    # Per-symbol severity table, built once and reused for every count below
+    if violations:
+        vdf = pd.DataFrame(violations, columns=["symbol", "severity"])
+        severity_table = (
+            vdf.groupby(["symbol", "severity"]).size()
+            .unstack(fill_value=0)
+            .reindex(symbols, fill_value=0)
+        )
+        violations_count = severity_table.sum(axis=1)
+        severity_counts = severity_table.reindex(columns=severities, fill_value=0)
+    else:
+        violations_count = pd.Series(0, index=symbols)
+        severity_counts = pd.DataFrame(0, index=symbols, columns=severities)
+
+    # Anomaly count and mean confidence per symbol in a single groupby pass
+    if anomalies:
+        adf = pd.DataFrame(anomalies, columns=["symbol", "confidence"])
+        if "confidence" not in adf or adf["confidence"].isna().any():
+            # Unlabelled anomalies default to 0.5, matching _compute_ai_confidence
+            adf["confidence"] = [a.get("confidence", 0.5) for a in anomalies]
+        anomaly_stats = (
+            adf.groupby("symbol")["confidence"].agg(["size", "mean"])
+            .reindex(symbols)
+        )
+        anomalies_count = anomaly_stats["size"].fillna(0).to_numpy(dtype="int64")
+        mean_confidence = anomaly_stats["mean"].to_numpy(dtype="float64")
+    else:
+        anomalies_count = np.zeros(len(symbols), dtype="int64")
+        mean_confidence = np.full(len(symbols), np.nan)
 
-    # Group anomalies by symbol
-    anomalies_by_symbol = defaultdict(list)
-    for a in anomalies:
-        anomalies_by_symbol[a["symbol"]].append(a)
+    violations_count = violations_count.to_numpy(dtype="int64")
+    critical_count = severity_counts["critical"].to_numpy(dtype="int64")
+    major_count = severity_counts["major"].to_numpy(dtype="int64")
+    minor_count = severity_counts["minor"].to_numpy(dtype="int64")
 
-    # Compute scores per symbol
-    rows = []
+    # Component scores, using the same formulas as the _compute_* helpers
+    schema_score = _schema_score_from_counts(critical_count, major_count, minor_count)
+    detector_score = _detector_score_from_count(anomalies_count)
+    ai_confidence = _ai_confidence_from_mean(anomalies_count, mean_confidence)
 
-    for symbol in all_symbols:
-        symbol_violations = violations_by_symbol.get(symbol, [])
-        symbol_anomalies = anomalies_by_symbol.get(symbol, [])
+    # Fusion score
+    fusion_score = 0.7 * schema_score + 0.2 * detector_score + 0.1 * ai_confidence
 
-        # Compute component scores
-        schema_score = _compute_schema_score(symbol_violations)
-        detector_score = _compute_detector_score(symbol_anomalies)
-        ai_confidence = _compute_ai_confidence(symbol_anomalies)
+    # Determine verdict
+    verdicts = _verdict_from(fusion_score, critical_count > 0, major_count > 0)
+
+    # Metadata
+    metadata = [
+        json.dumps({
+            "violations_count": v_count,
+            "anomalies_count": a_count,
+            "critical_count": crit,
+            "major_count": major,
+            "minor_count": minor,
+            "schema_score": round(s_score, 4),
+            "detector_score": round(d_score, 4),
+            "ai_confidence": round(ai_conf, 4),
+        })
+        for v_count, a_count, crit, major, minor, s_score, d_score, ai_conf in zip(
+            violations_count.tolist(),
+            anomalies_count.tolist(),
+            critical_count.tolist(),
+            major_count.tolist(),
+            minor_count.tolist(),
+            schema_score.tolist(),
+            detector_score.tolist(),
+            ai_confidence.tolist(),
+        )
+    ]
+
+    df = pd.DataFrame({
+        "ts": pd.Timestamp(f"{date_str}T00:00:00Z").as_unit("ns"),
+        "symbol": list(all_symbols),
+        "verdict": verdicts.tolist(),
+        "score": [round(score, 4) for score in fusion_score.tolist()],
+        "metadata": metadata,
+    })
+    logger.info(f"Computed fusion scores for {len(df)} symbols")
 
-        # Fusion score
-        fusion_score = 0.7 * schema_score + 0.2 * detector_score + 0.1 * ai_confidence
+    return df
 
-        # Determine verdict
-        verdict, has_critical, has_major = _compute_verdict(
-            fusion_score, symbol_violations
-        )
 
-        # Metadata
-        metadata = {
-            "violations_count": len(symbol_violations),
-            "anomalies_count": len(symbol_anomalies),
-            "critical_count": sum(1 for v in symbol_violations if v["severity"] == "critical"),
-            "major_count": sum(1 for v in symbol_violations if v["severity"] == "major"),
-            "minor_count": sum(1 for v in symbol_violations if v["severity"] == "minor"),
-            "schema_score": round(schema_score, 4),
-            "detector_score": round(detector_score, 4),
-            "ai_confidence": round(ai_confidence, 4),
-        }
+# Score and verdict formulas. Each accepts scalars or per-symbol NumPy
+# arrays, so compute_fusion_scores and the per-list _compute_* helpers below
+# share one definition.
 
-        # Create row
-        row = {
-            "ts": pd.Timestamp(f"{date_str}T00:00:00Z"),
-            "symbol": symbol,
-            "verdict": verdict,
-            "score": round(fusion_score, 4),
-            "metadata": json.dumps(metadata)
-        }
+def _schema_score_from_counts(critical, major, minor):
+    """Schema score in [0, 1] from per-severity violation counts."""
+    penalty = (
+        critical * SEVERITY_PENALTIES["critical"] +
+        major * SEVERITY_PENALTIES["major"] +
+        minor * SEVERITY_PENALTIES["minor"]
+    )
+    return np.maximum(0.0, 1.0 - penalty)
 
-        rows.append(row)
 
-    df = pd.DataFrame(rows)
-    logger.info(f"Computed fusion scores for {len(df)} symbols")
+def _detector_score_from_count(anomaly_count):
+    """Detector score in [0, 1] from an anomaly count."""
+    # Assume ~10 anomalies per day is "normal" noise
+    normal_anomaly_count = 10
+    return np.maximum(0.0, 1.0 / (1.0 + anomaly_count / normal_anomaly_count))
 
-    return df
+
+def _ai_confidence_from_mean(anomaly_count, mean_confidence):
+    """Data-quality confidence in [0, 1] from anomaly count and mean confidence."""
+    # Invert: high anomaly confidence = low data quality confidence
+    return np.where(
+        anomaly_count > 0,
+        np.clip(1.0 - np.nan_to_num(mean_confidence, nan=0.0), 0.0, 1.0),
+        1.0,  # No anomalies = high confidence in data quality
+    )
+
+
+def _verdict_from(fusion_score, has_critical, has_major):
+    """PASS/REVIEW/FAIL from fusion score and severity flags."""
+    return np.select(
+        [has_critical | (fusion_score < 0.65), has_major | (fusion_score < 0.85)],
+        ["FAIL", "REVIEW"],
+        default="PASS",
+    )
 
 
 def _compute_schema_score(violations: List[Dict[str, Any]]) -> float:
@@ -145,30 +222,9 @@ def _compute_schema_score(violations: List[Dict[str, Any]]) -> float:
 
     Returns score in [0, 1] where 1 = perfect (no violations).
     """
-    if not violations:
-        return 1.0
-
-    # Count violations by severity
-    critical_count = sum(1 for v in violations if v["severity"] == "critical")
-    major_count = sum(1 for v in violations if v["severity"] == "major")
-    minor_count = sum(1 for v in violations if v["severity"] == "minor")
-
-    # Penalty weights
-    critical_penalty = 0.5
-    major_penalty = 0.2
-    minor_penalty = 0.05
-
-    # Compute total penalty
-    penalty = (
-        critical_count * critical_penalty +
-        major_count * major_penalty +
-        minor_count * minor_penalty
-    )
-
-    # Score = 1 - penalty (clamped to [0, 1])
-    score = max(0.0, 1.0 - penalty)
-
-    return score
+    # Count violations by severity in a single pass
+    counts = Counter(v["severity"] for v in violations)
+    return float(_schema_score_from_counts(counts["critical"], counts["major"], counts["minor"]))
 
 
 def _compute_detector_score(anomalies: List[Dict[str, Any]]) -> float:
@@ -177,18 +233,7 @@ def _compute_detector_score(anomalies: List[Dict[str, Any]]) -> float:
 
     Returns score in [0, 1] where 1 = perfect (no anomalies).
     """
-    if not anomalies:
-        return 1.0
-
-    # Simple penalty: each anomaly reduces score
-    # Assume ~10 anomalies per day is "normal" noise
-    normal_anomaly_count = 10
-    anomaly_ratio = len(anomalies) / normal_anomaly_count
-
-    # Score decays logarithmically
-    score = 1.0 / (1.0 + anomaly_ratio)
-
-    return max(0.0, score)
+    return float(_detector_score_from_count(len(anomalies)))
 
 
 def _compute_ai_confidence(anomalies: List[Dict[str, Any]]) -> float:
@@ -198,16 +243,13 @@ def _compute_ai_confidence(anomalies: List[Dict[str, Any]]) -> float:
     Returns average confidence in [0, 1].
     """
     if not anomalies:
-        return 1.0  # No anomalies = high confidence in data quality
+        return 1.0
 
     # Average confidence from labeled anomalies
     confidences = [a.get("confidence", 0.5) for a in anomalies]
     avg_confidence = sum(confidences) / len(confidences)
 
-    # Invert: high anomaly confidence = low data quality confidence
-    score = 1.0 - avg_confidence
-
-    return max(0.0, min(1.0, score))
+    return float(_ai_confidence_from_mean(len(anomalies), avg_confidence))
 
 
 def _compute_verdict(
@@ -220,16 +262,19 @@ def _compute_verdict(
     Returns:
         (verdict, has_critical, has_major) tuple
     """
-    has_critical = any(v["severity"] == "critical" for v in violations)
-    has_major = any(v["severity"] == "major" for v in violations)
-
-    # Verdict logic
-    if has_critical or fusion_score < 0.65:
-        verdict = "FAIL"
-    elif has_major or fusion_score < 0.85:
-        verdict = "REVIEW"
-    else:
-        verdict = "PASS"
+    # Single pass over violations, stopping once both severities are seen
+    has_critical = False
+    has_major = False
+    for v in violations:
+        severity = v["severity"]
+        if severity == "critical":
+            has_critical = True
+        elif severity == "major":
+            has_major = True
+        if has_critical and has_major:
+            break
+
+    verdict = str(_verdict_from(fusion_score, has_critical, has_major))
 
     return verdict, has_critical, has_major
 
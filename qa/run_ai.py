@@ -16,6 +16,7 @@ import time
 from collections import Counter
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -27,6 +28,7 @@ from qa.utils import (
     ensure_qa_directories,
     format_duration,
     get_qa_ai_path,
+    get_qa_pool,
     get_qa_schema_path,
     parse_date_args,
     parse_instant,
@@ -45,6 +47,10 @@ except ImportError:
     sys.exit(1)
 
 
+# int64 representation of NaT (missing/unparseable timestamp)
+NAT_NS = np.iinfo(np.int64).min
+
+
 def resolve_day(token: str) -> str:
     """
     Resolve TODAY/YESTERDAY tokens to YYYY-MM-DD format.
@@ -72,6 +78,10 @@ def cluster_anomalies(records: list, cooldown_seconds: int = 5) -> list:
     Reduces bursty duplicates by merging anomalies that occur within
     cooldown_seconds of each other for the same symbol+detector pair.
 
+    Timestamps may be ISO-8601 strings, datetimes or numpy datetime64
+    values. They are normalised to int64 UTC nanoseconds in one vectorised
+    call; records keep their original "ts" values.
+
     Args:
         records: List of anomaly dictionaries (must have symbol, ts, detector keys)
         cooldown_seconds: Window in seconds to cluster anomalies
@@ -82,39 +92,55 @@ def cluster_anomalies(records: list, cooldown_seconds: int = 5) -> list:
     if not records or cooldown_seconds <= 0:
         return records
 
+    # Precompute group keys and UTC nanosecond timestamps once so the sweep
+    # below only does list indexing. Interned strings make key equality a
+    # pointer compare. Unparseable timestamps become NaT (int64 minimum).
+    keys = [
+        (sys.intern(str(r.get("symbol", ""))), sys.intern(str(r.get("detector", ""))))
+        for r in records
+    ]
+    ts_all = _to_utc_ns([r.get("ts", "") for r in records])
+    valid_all = ts_all != NAT_NS
+    ts_values = ts_all.tolist()
+
     # Sort by symbol, detector, then timestamp
-    sorted_records = sorted(records, key=lambda r: (r.get("symbol", ""), r.get("detector", ""), r.get("ts", "")))
+    order = sorted(range(len(records)), key=lambda i: (keys[i], ts_values[i]))
+    sorted_records = [records[i] for i in order]
+    valid = valid_all[order]
+
+    # Compute bucket boundaries for all valid records in one array pass
+    valid_idx = np.flatnonzero(valid)
+    group_codes = {}
+    group_id = np.fromiter(
+        (group_codes.setdefault(keys[order[i]], len(group_codes)) for i in valid_idx.tolist()),
+        dtype=np.int64,
+        count=len(valid_idx),
+    )
+    ts_ns = ts_all[order][valid_idx]
+    breaks = _cluster_breaks(ts_ns, group_id, int(cooldown_seconds * 1_000_000_000))
+
+    new_bucket = np.zeros(len(sorted_records), dtype=bool)
+    new_bucket[valid_idx] = breaks
+    new_bucket = new_bucket.tolist()
+    valid = valid.tolist()
 
     clustered = []
     bucket = []
-    last_ts = None
-    last_key = None
-
-    for rec in sorted_records:
-        symbol = rec.get("symbol", "")
-        detector = rec.get("detector", "")
-        ts_str = rec.get("ts", "")
-        key = (symbol, detector)
 
-        # Parse timestamp
-        try:
-            ts = pd.Timestamp(ts_str, tz="UTC")
-        except:
+    for i, rec in enumerate(sorted_records):
+        if not valid[i]:
             # Invalid timestamp, emit as-is
             clustered.append(rec)
             continue
 
-        # Check if same group and within cooldown
-        if bucket and key == last_key and last_ts and (ts - last_ts).total_seconds() <= cooldown_seconds:
+        # Same group and within cooldown of the previous record
+        if not new_bucket[i]:
             bucket.append(rec)
         else:
             # Flush previous bucket
             if bucket:
                 clustered.append(_flush_bucket(bucket))
             bucket = [rec]
-            last_key = key
-
-        last_ts = ts
 
     # Flush final bucket
     if bucket:
@@ -123,6 +149,43 @@ def cluster_anomalies(records: list, cooldown_seconds: int = 5) -> list:
     return clustered
 
 
+def _to_utc_ns(values: list) -> np.ndarray:
+    """
+    Convert mixed timestamp values to int64 UTC nanoseconds.
+
+    Args:
+        values: ISO-8601 strings, datetimes or datetime64 values
+
+    Returns:
+        int64 array; unparseable values are NAT_NS
+    """
+    ts = pd.to_datetime(
+        pd.Series(values, dtype=object), utc=True, errors="coerce", format="ISO8601"
+    )
+    return ts.dt.as_unit("ns").to_numpy(dtype="datetime64[ns]").view("int64")
+
+
+def _cluster_breaks(ts_ns: np.ndarray, group_id: np.ndarray, cooldown_ns: int) -> np.ndarray:
+    """
+    Find where a new cluster starts in a sorted anomaly sequence.
+
+    A record starts a new cluster when its (symbol, detector) group differs
+    from the previous record or it is more than cooldown_ns after it.
+
+    Args:
+        ts_ns: Timestamps as int64 nanoseconds, sorted within each group
+        group_id: Integer group code per record
+        cooldown_ns: Cooldown window in nanoseconds
+
+    Returns:
+        Boolean array, True where a record starts a new cluster
+    """
+    breaks = np.ones(len(ts_ns), dtype=bool)
+    if len(ts_ns) > 1:
+        breaks[1:] = (group_id[1:] != group_id[:-1]) | (np.diff(ts_ns) > cooldown_ns)
+    return breaks
+
+
 def _flush_bucket(bucket: list) -> dict:
     """
     Flush a bucket of anomalies into a single clustered record.
@@ -374,26 +437,24 @@ def main():
         # Run detectors
         all_anomalies = []
 
-        try:
-            zscore_anomalies = zscore_detector.detect(df, clean_mask)
-            all_anomalies.extend(zscore_anomalies)
-            logger.debug(f"ZScore detector found {len(zscore_anomalies)} anomalies")
-        except Exception as e:
-            logger.error(f"ZScore detector failed: {e}")
-
-        try:
-            jump_anomalies = jump_detector.detect(df, clean_mask)
-            all_anomalies.extend(jump_anomalies)
-            logger.debug(f"Jump detector found {len(jump_anomalies)} anomalies")
-        except Exception as e:
-            logger.error(f"Jump detector failed: {e}")
-
-        try:
-            iforest_anomalies = iforest_detector.detect(df, clean_mask)
-            all_anomalies.extend(iforest_anomalies)
-            logger.debug(f"IsolationForest detector found {len(iforest_anomalies)} anomalies")
-        except Exception as e:
-            logger.error(f"IsolationForest detector failed: {e}")
+        # Detectors only read df, so run them concurrently on the shared pool
+        pool = get_qa_pool()
+        futures = [
+            (name, pool.submit(detector.detect, df, clean_mask))
+            for name, detector in (
+                ("ZScore", zscore_detector),
+                ("Jump", jump_detector),
+                ("IsolationForest", iforest_detector),
+            )
+        ]
+
+        for name, future in futures:
+            try:
+                detector_anomalies = future.result()
+                all_anomalies.extend(detector_anomalies)
+                logger.debug(f"{name} detector found {len(detector_anomalies)} anomalies")
+            except Exception as e:
+                logger.error(f"{name} detector failed: {e}")
 
         # Label anomalies
         if all_anomalies:
@@ -16,6 +16,8 @@ import duckdb
 import pandas as pd
 from loguru import logger
 
+from qa.utils import to_iso8601_utc as _cached_to_iso8601_utc
+
 # Import existing rule functions (NO duplication)
 from tools.validate_rules import (
     rule_r1_ohlc_ordering,
@@ -42,11 +44,7 @@ SEVERITY_MAP = {
 
 def to_iso8601_utc(ts: pd.Timestamp) -> str:
     """Convert pandas Timestamp to ISO8601 UTC string."""
-    if ts.tzinfo is None:
-        ts = ts.tz_localize('UTC')
-    else:
-        ts = ts.tz_convert('UTC')
-    return ts.isoformat()
+    return _cached_to_iso8601_utc(ts)
 
 
 def validate_schema(
@@ -4,9 +4,13 @@ QA Utilities
 Provides atomic file writing, path helpers, and common utilities.
 """
 
+import atexit
+import functools
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -16,6 +20,18 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 from loguru import logger
 
+from tools.common import LOG_FILE_FORMAT
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Shared worker pool for QA steps, created on first use
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
 # ISO-8601 timestamp formats supported
 ISO_FORMATS = [
     "%Y-%m-%dT%H:%M:%S%z",     # 2025-10-24T00:00:00+00:00
@@ -74,45 +90,70 @@ def parse_instant(s: str) -> Optional[datetime]:
     raise ValueError(f"Unrecognised datetime format: {s}")
 
 
-def atomic_write_jsonl(records: List[Dict[str, Any]], path: str) -> None:
+def atomic_write_jsonl(records: List[Dict[str, Any]], path: str, durable: bool = False) -> None:
     """
     Atomically write JSONL file using temp file + os.replace().
 
+    Records are encoded with orjson (falling back to the stdlib json module)
+    and written to the temp file in a single call.
+
     Args:
         records: List of dictionaries to write (one per line)
         path: Final output path
+        durable: fsync the temp file before the rename (default: False)
     """
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp_path = path + '.tmp'
+    _atomic_write_bytes(_encode_jsonl(records), path, durable=durable)
+    logger.debug(f"Atomically wrote {len(records)} records to {path}")
 
-    try:
-        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
-            for record in records:
-                json.dump(record, f, ensure_ascii=False)
-                f.write('\n')
-        os.replace(tmp_path, path)
-        logger.debug(f"Atomically wrote {len(records)} records to {path}")
-    except Exception as e:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
-        raise e
+
+def _encode_jsonl(records: List[Dict[str, Any]]) -> bytes:
+    """Encode records as UTF-8 JSONL bytes (one object per line)."""
+    if not records:
+        return b""
+
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        lines = [orjson.dumps(record, default=_json_default, option=option) for record in records]
+    else:
+        lines = [
+            json.dumps(record, ensure_ascii=False, default=_json_default).encode('utf-8')
+            for record in records
+        ]
+
+    return b"\n".join(lines) + b"\n"
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialise timestamp values (e.g. pandas Timestamp) as ISO8601 UTC."""
+    if isinstance(obj, datetime):
+        return to_iso8601_utc(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
-def atomic_write_parquet(df: pd.DataFrame, path: str, compression: str = 'snappy') -> None:
+def atomic_write_parquet(df: pd.DataFrame, path: str, compression: str = 'zstd') -> None:
     """
     Atomically write Parquet file using temp file + os.replace().
 
+    Columns are dictionary-encoded, which keeps low-cardinality string
+    columns (symbol, verdict) small on disk and cheap to decode.
+
     Args:
         df: DataFrame to write
         path: Final output path
-        compression: Compression codec (default: snappy)
+        compression: Compression codec (default: zstd)
     """
     os.makedirs(os.path.dirname(path), exist_ok=True)
     tmp_path = path + '.tmp'
 
     try:
-        table = pa.Table.from_pandas(df)
-        pq.write_table(table, tmp_path, compression=compression)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(
+            table,
+            tmp_path,
+            compression=compression,
+            use_dictionary=True,
+            data_page_size=1 << 20,
+        )
         os.replace(tmp_path, path)
         logger.debug(f"Atomically wrote {len(df)} rows to {path}")
     except Exception as e:
@@ -121,28 +162,75 @@ def atomic_write_parquet(df: pd.DataFrame, path: str, compression: str = 'snappy
         raise e
 
 
-def atomic_write_text(content: str, path: str) -> None:
+def atomic_write_text(content: str, path: str, durable: bool = False) -> None:
     """
     Atomically write text file using temp file + os.replace().
 
     Args:
         content: Text content to write
         path: Final output path
+        durable: fsync the temp file before the rename (default: False)
+    """
+    _atomic_write_bytes(content.encode('utf-8'), path, durable=durable)
+    logger.debug(f"Atomically wrote text to {path}")
+
+
+def _atomic_write_bytes(payload: bytes, path: str, durable: bool = False) -> None:
+    """
+    Write a bytes buffer to path via temp file + os.replace().
+
+    Uses raw file descriptors (os.open/os.write) since the whole payload
+    is already in memory and needs no Python-level buffering.
+
+    Args:
+        payload: Bytes to write
+        path: Final output path
+        durable: fsync the temp file before the rename
     """
     os.makedirs(os.path.dirname(path), exist_ok=True)
     tmp_path = path + '.tmp'
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
 
     try:
-        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
-            f.write(content)
+        fd = os.open(tmp_path, flags, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(tmp_path, path)
-        logger.debug(f"Atomically wrote text to {path}")
     except Exception as e:
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
         raise e
 
 
+def get_qa_pool() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool used for parallel QA work.
+
+    The pool is created lazily on first use and shut down at exit, so
+    repeated QA steps reuse the same worker threads.
+
+    Returns:
+        Shared ThreadPoolExecutor
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 4,
+                    thread_name_prefix="qa",
+                )
+                atexit.register(_POOL.shutdown)
+    return _POOL
+
+
 def ensure_qa_directories(base_path: str) -> None:
     """
     Ensure all QA output directories exist.
@@ -182,10 +270,14 @@ def get_qa_report_path(base_path: str, date_str: str) -> str:
     return os.path.join(base_path, "reports", "qa", f"{date_str}_qa_report.md")
 
 
+@functools.lru_cache(maxsize=4096)
 def to_iso8601_utc(dt: datetime) -> str:
     """
     Convert datetime to ISO8601 UTC string.
 
+    Results are memoised: violation and anomaly records frequently repeat
+    the same timestamps across symbols and rules.
+
     Args:
         dt: Datetime object (will be converted to UTC if naive)
 
@@ -272,8 +364,9 @@ def setup_qa_logging(base_path: str, log_name: str, log_level: str = "INFO") ->
         level="DEBUG",
         backtrace=True,
         diagnose=False,
-        enqueue=False,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        enqueue=True,
+        colorize=False,
+        format=LOG_FILE_FORMAT,
     )
 
     # Add stdout handler with minimal format (respects log_level)
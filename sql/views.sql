@@ -6,6 +6,9 @@
 -- Note: These views are designed to make analysis "one SELECT away"
 
 PRAGMA threads=4;
+-- Cache parquet metadata across queries; ORDER BY clauses still apply
+SET enable_object_cache=true;
+SET preserve_insertion_order=false;
 
 -- ========================================
 -- 1) bars_1s - Base 1-second bars from our collector
@@ -0,0 +1,32 @@
+"""Shared pytest configuration."""
+
+import os
+
+import duckdb
+import pytest
+
+# Unit tests run one small query per connection: a single worker thread skips
+# spinning up a cpu_count()-sized pool on every connect.
+DUCKDB_TEST_CONFIG = {"threads": "1", "memory_limit": "512MB", "enable_object_cache": "false"}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: test makes live network calls (set RUN_NETWORK_TESTS=1 to run)")
+    config.addinivalue_line("markers", "readonly: test only reads the data lake and is safe to run in parallel (pytest -n)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_NETWORK_TESTS") == "1":
+        return
+    skip_network = pytest.mark.skip(reason="network test; set RUN_NETWORK_TESTS=1 to run")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture
+def duckdb_memory():
+    """Fresh single-threaded in-memory DuckDB connection."""
+    conn = duckdb.connect(":memory:", config=DUCKDB_TEST_CONFIG)
+    yield conn
+    conn.close()
@@ -211,3 +211,89 @@ def test_flush_bucket_multiple():
     assert flushed["cluster"]["start_ts"] == base_ts.isoformat()
     assert flushed["cluster"]["end_ts"] == (base_ts + timedelta(seconds=4)).isoformat()
     assert flushed["cluster"]["max_abs_z"] == 8.5  # Max absolute value
+
+
+def test_cluster_anomalies_invalid_timestamp_passthrough():
+    """Test that records with unparseable timestamps are emitted unchanged."""
+    base_ts = datetime(2025, 10, 24, 12, 0, 0, tzinfo=timezone.utc)
+
+    bad = {
+        "symbol": "TEST",
+        "detector": "JUMP",
+        "ts": "not-a-timestamp",
+        "features": {"z_score": 7.0},
+    }
+    anomalies = [
+        {
+            "symbol": "TEST",
+            "detector": "JUMP",
+            "ts": base_ts.isoformat(),
+            "features": {"z_score": 7.0},
+        },
+        {
+            "symbol": "TEST",
+            "detector": "JUMP",
+            "ts": (base_ts + timedelta(seconds=2)).isoformat(),
+            "features": {"z_score": 7.5},
+        },
+        bad,
+    ]
+
+    clustered = cluster_anomalies(anomalies, cooldown_seconds=5)
+
+    assert len(clustered) == 2
+    assert bad in clustered
+    merged = [c for c in clustered if "cluster" in c]
+    assert len(merged) == 1
+    assert merged[0]["cluster"]["count"] == 2
+
+
+def test_cluster_anomalies_large_interleaved_groups():
+    """Test clustering on a larger shuffled input across several groups."""
+    import random
+
+    base_ts = datetime(2025, 10, 24, 12, 0, 0, tzinfo=timezone.utc)
+
+    anomalies = []
+    for symbol in ("SYM1", "SYM2"):
+        for detector in ("JUMP", "ZSCORE"):
+            # Bursts of 5 records 1s apart, bursts 60s apart
+            for burst in range(10):
+                for k in range(5):
+                    anomalies.append({
+                        "symbol": symbol,
+                        "detector": detector,
+                        "ts": (base_ts + timedelta(seconds=60 * burst + k)).isoformat(),
+                        "features": {"z_score": float(k)},
+                    })
+    random.Random(0).shuffle(anomalies)
+
+    clustered = cluster_anomalies(anomalies, cooldown_seconds=5)
+
+    assert len(clustered) == 2 * 2 * 10
+    assert all(c["cluster"]["count"] == 5 for c in clustered)
+    assert all(c["cluster"]["max_abs_z"] == 4.0 for c in clustered)
+
+
+def test_cluster_anomalies_datetime_timestamps():
+    """Test clustering accepts datetime and pandas Timestamp values for ts."""
+    import pandas as pd
+
+    base_ts = datetime(2025, 10, 24, 12, 0, 0, tzinfo=timezone.utc)
+
+    anomalies = [
+        {"symbol": "TEST", "detector": "JUMP", "ts": base_ts, "features": {"z_score": 7.0}},
+        {"symbol": "TEST", "detector": "JUMP", "ts": pd.Timestamp(base_ts + timedelta(seconds=2)),
+         "features": {"z_score": 7.5}},
+        {"symbol": "TEST", "detector": "JUMP", "ts": (base_ts + timedelta(seconds=3)).isoformat(),
+         "features": {"z_score": 6.0}},
+        {"symbol": "TEST", "detector": "JUMP", "ts": base_ts + timedelta(seconds=30),
+         "features": {"z_score": 9.0}},
+    ]
+
+    clustered = cluster_anomalies(anomalies, cooldown_seconds=5)
+
+    assert len(clustered) == 2
+    assert clustered[0]["cluster"]["count"] == 3
+    assert clustered[0]["cluster"]["start_ts"] == base_ts
+    assert "cluster" not in clustered[1]
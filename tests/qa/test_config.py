@@ -4,11 +4,9 @@ Fast tests for QA configuration.
 No file I/O - pure in-memory unit tests.
 """
 
-import copy
-
 import pytest
 
-from qa.config import DEFAULT_QA_CONFIG, _validate_qa_config, load_qa_config
+from qa.config import DEFAULT_QA_CONFIG, _clone_defaults, _validate_qa_config, load_qa_config
 
 
 def test_default_qa_config():
@@ -67,14 +65,14 @@ def test_load_qa_config_nested():
 
 def test_validate_qa_config_valid():
     """Test validation with valid configuration."""
-    qa_config = copy.deepcopy(DEFAULT_QA_CONFIG)
+    qa_config = _clone_defaults()
     # Should not raise
     _validate_qa_config(qa_config)
 
 
 def test_validate_qa_config_invalid_enable_ai():
     """Test validation with invalid enable_ai."""
-    qa_config = copy.deepcopy(DEFAULT_QA_CONFIG)
+    qa_config = _clone_defaults()
     qa_config["enable_ai"] = "true"  # Should be bool
 
     with pytest.raises(ValueError, match="enable_ai must be boolean"):
@@ -83,7 +81,7 @@ def test_validate_qa_config_invalid_enable_ai():
 
 def test_validate_qa_config_invalid_window():
     """Test validation with invalid window."""
-    qa_config = copy.deepcopy(DEFAULT_QA_CONFIG)
+    qa_config = _clone_defaults()
     qa_config["hourly_window_min"] = -10
 
     with pytest.raises(ValueError, match="hourly_window_min must be positive"):
@@ -92,7 +90,7 @@ def test_validate_qa_config_invalid_window():
 
 def test_validate_qa_config_invalid_labeler():
     """Test validation with invalid labeler."""
-    qa_config = copy.deepcopy(DEFAULT_QA_CONFIG)
+    qa_config = _clone_defaults()
     qa_config["ai_labeler"] = "invalid"
 
     with pytest.raises(ValueError, match="ai_labeler must be one of"):
@@ -101,7 +99,7 @@ def test_validate_qa_config_invalid_labeler():
 
 def test_validate_qa_config_invalid_contamination():
     """Test validation with invalid contamination."""
-    qa_config = copy.deepcopy(DEFAULT_QA_CONFIG)
+    qa_config = _clone_defaults()
     qa_config["iforest"]["contamination"] = 1.5  # Must be in (0, 1)
 
     with pytest.raises(ValueError, match="contamination must be in"):
@@ -110,12 +108,42 @@ def test_validate_qa_config_invalid_contamination():
 
 def test_validate_qa_config_invalid_zscore_k():
     """Test validation with invalid zscore k."""
-    qa_config = copy.deepcopy(DEFAULT_QA_CONFIG)
+    qa_config = _clone_defaults()
     qa_config["zscore"]["k"] = -3.0
 
     with pytest.raises(ValueError, match="zscore.k must be positive"):
         _validate_qa_config(qa_config)
 
 
+def test_validate_qa_config_invalid_jump_k_sigma():
+    """Test validation with invalid jump k_sigma."""
+    qa_config = _clone_defaults()
+    qa_config["jump"]["k_sigma"] = 0
+
+    with pytest.raises(ValueError, match="jump.k_sigma must be positive"):
+        _validate_qa_config(qa_config)
+
+
+def test_validate_qa_config_missing_nested_block():
+    """Test validation when a nested block is missing entirely."""
+    qa_config = _clone_defaults()
+    del qa_config["iforest"]
+
+    with pytest.raises(ValueError, match="contamination must be in"):
+        _validate_qa_config(qa_config)
+
+
+def test_load_qa_config_does_not_share_defaults():
+    """Test resolved configs are independent of the read-only defaults."""
+    qa_config = load_qa_config({})
+    qa_config["iforest"]["contamination"] = 0.5
+
+    assert DEFAULT_QA_CONFIG["iforest"]["contamination"] == 0.005
+    assert load_qa_config({})["iforest"]["contamination"] == 0.005
+
+    with pytest.raises(TypeError):
+        DEFAULT_QA_CONFIG["enable_ai"] = False
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -161,5 +161,65 @@ def test_compute_fusion_scores_with_violations():
     assert df.iloc[0]["verdict"] in ["REVIEW", "FAIL"]
 
 
+def test_compute_schema_score_mixed_severities():
+    """Test schema score with a mix of severities and unknown levels."""
+    violations = [
+        {"severity": "major"},
+        {"severity": "minor"},
+        {"severity": "minor"},
+        {"severity": "info"},
+    ]
+    score = _compute_schema_score(violations)
+    # 0.2 + 2 * 0.05 = 0.3 penalty, unknown severities ignored
+    assert score == pytest.approx(0.7)
+
+
+def test_compute_fusion_scores_matches_scalar_helpers():
+    """Test vectorised fusion scoring agrees with the per-symbol helpers."""
+    import json
+
+    violations = [
+        {"symbol": "BTCUSDT", "severity": "critical"},
+        {"symbol": "ETHUSDT", "severity": "major"},
+        {"symbol": "ETHUSDT", "severity": "minor"},
+        {"symbol": "UNKNOWN", "severity": "minor"},
+    ]
+    anomalies = [
+        {"symbol": "ETHUSDT", "confidence": 0.8},
+        {"symbol": "SOLUSDT", "confidence": 0.4},
+        {"symbol": "SOLUSDT"},
+    ]
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "ADAUSDT"]
+
+    df = compute_fusion_scores(violations, anomalies, symbols, "2025-10-23")
+
+    assert list(df["symbol"]) == symbols
+    for _, row in df.iterrows():
+        sym_v = [v for v in violations if v["symbol"] == row["symbol"]]
+        sym_a = [a for a in anomalies if a["symbol"] == row["symbol"]]
+        expected = (
+            0.7 * _compute_schema_score(sym_v) +
+            0.2 * _compute_detector_score(sym_a) +
+            0.1 * _compute_ai_confidence(sym_a)
+        )
+        verdict, _, _ = _compute_verdict(expected, sym_v)
+
+        assert row["score"] == pytest.approx(round(expected, 4))
+        assert row["verdict"] == verdict
+
+        meta = json.loads(row["metadata"])
+        assert meta["violations_count"] == len(sym_v)
+        assert meta["anomalies_count"] == len(sym_a)
+
+
+def test_compute_verdict_critical_and_major():
+    """Test verdict flags when both critical and major violations exist."""
+    violations = [{"severity": "minor"}, {"severity": "major"}, {"severity": "critical"}]
+    verdict, has_critical, has_major = _compute_verdict(0.9, violations)
+    assert verdict == "FAIL"
+    assert has_critical
+    assert has_major
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -19,6 +19,7 @@ from qa.utils import (
     format_duration,
     get_qa_ai_path,
     get_qa_fusion_path,
+    get_qa_pool,
     get_qa_report_path,
     get_qa_schema_path,
     parse_date_args,
@@ -141,5 +142,90 @@ def test_atomic_write_text():
             assert read_content == content
 
 
+def test_atomic_write_jsonl_unicode_and_empty():
+    """Test JSONL writing keeps non-ASCII text and handles empty input."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "test.jsonl")
+        records = [{"rationale": "Δ price jump → review", "features": {"z_score": 7.5}}]
+
+        atomic_write_jsonl(records, path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        assert content.endswith("\n")
+        assert json.loads(content) == records[0]
+
+        atomic_write_jsonl([], path)
+        assert os.path.getsize(path) == 0
+
+
+def test_atomic_write_parquet_zstd_dictionary():
+    """Test Parquet writing uses zstd and dictionary-encodes string columns."""
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "test.parquet")
+        df = pd.DataFrame({
+            "symbol": ["BTCUSDT", "ETHUSDT"] * 50,
+            "score": [0.9] * 100,
+        })
+
+        atomic_write_parquet(df, path)
+
+        column = pq.ParquetFile(path).metadata.row_group(0).column(0)
+        assert column.compression == "ZSTD"
+        assert any("DICTIONARY" in enc for enc in column.encodings)
+        assert not os.path.exists(path + ".tmp")
+
+
+def test_to_iso8601_utc_naive_and_cached():
+    """Test naive datetimes are treated as UTC and repeat calls hit the cache."""
+    to_iso8601_utc.cache_clear()
+    dt = datetime(2025, 10, 23, 12, 34, 56)
+
+    first = to_iso8601_utc(dt)
+    second = to_iso8601_utc(dt)
+
+    assert first == second == "2025-10-23T12:34:56+00:00"
+    assert to_iso8601_utc.cache_info().hits == 1
+
+
+def test_atomic_write_text_durable_overwrite():
+    """Test durable text writes replace existing content and leave no temp file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "nested", "test.txt")
+
+        atomic_write_text("first version that is longer", path)
+        atomic_write_text("second\n", path, durable=True)
+
+        with open(path, 'rb') as f:
+            assert f.read() == b"second\n"
+        assert not os.path.exists(path + ".tmp")
+
+
+def test_get_qa_pool_is_shared():
+    """Test the QA thread pool is created once and reused."""
+    pool = get_qa_pool()
+    assert get_qa_pool() is pool
+    assert list(pool.map(lambda x: x * 2, [1, 2, 3])) == [2, 4, 6]
+
+
+def test_atomic_write_jsonl_timestamps():
+    """Test JSONL writing formats datetime and pandas Timestamp values."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "test.jsonl")
+        records = [
+            {"ts": datetime(2025, 10, 23, 12, 0, 0, tzinfo=timezone.utc)},
+            {"ts": pd.Timestamp("2025-10-23T14:00:01+02:00")},
+        ]
+
+        atomic_write_jsonl(records, path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        assert rows[0]["ts"] == "2025-10-23T12:00:00+00:00"
+        assert rows[1]["ts"] == "2025-10-23T12:00:01+00:00"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,7 +1,7 @@
 """
 Tests for SQL schema creation and management.
 
-Tests schema.sql against temporary SQLite database to verify:
+Tests schema.sql against in-memory SQLite database to verify:
 - Table creation
 - Idempotency
 - Integrity verification
@@ -11,33 +11,39 @@ Tests schema.sql against temporary SQLite database to verify:
 import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
 
-from tools.sql_manager import apply_schema, register_views_if_supported, verify_integrity
+from tools.sql_manager import (
+    _load_schema_statements,
+    apply_schema,
+    enable_sqlite_pragmas,
+    register_views_if_supported,
+    verify_integrity,
+)
 
 
 @pytest.fixture
 def temp_sqlite_db():
     """
-    Create temporary SQLite database for testing.
+    Create in-memory SQLite database for testing.
 
-    Yields SQLAlchemy engine, cleans up after test.
+    StaticPool shares the single in-memory connection across the engine so
+    schema and data persist for the whole test. Yields SQLAlchemy engine.
     """
-    # Create temporary database file
-    db_fd, db_path = tempfile.mkstemp(suffix='.db')
-    os.close(db_fd)  # Close file descriptor, engine will open it
-
-    # Create SQLAlchemy engine
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
 
     yield engine
 
-    # Cleanup
     engine.dispose()
-    if os.path.exists(db_path):
-        os.remove(db_path)
 
 
 @pytest.fixture
@@ -221,19 +227,25 @@ def test_insert_and_query_bars_1s(temp_sqlite_db):
 
     apply_schema(engine)
 
-    # Insert test data
+    # Insert test data (executemany in a single transaction)
+    rows = [
+        {"symbol": "BTCUSDT", "ts": f"2025-01-01 00:00:0{i}", "open": 50000 + i, "high": 50100,
+         "low": 49900, "close": 50050, "volume_base": 100.5, "trade_count": 150}
+        for i in range(3)
+    ]
     with engine.begin() as conn:
         conn.execute(text("""
             INSERT INTO bars_1s (symbol, ts, open, high, low, close, volume_base, trade_count)
-            VALUES ('BTCUSDT', '2025-01-01 00:00:00', 50000, 50100, 49900, 50050, 100.5, 150)
-        """))
+            VALUES (:symbol, :ts, :open, :high, :low, :close, :volume_base, :trade_count)
+        """), rows)
 
     # Query data
     with engine.connect() as conn:
-        result = conn.execute(text("SELECT symbol, open, close FROM bars_1s WHERE symbol = 'BTCUSDT'"))
-        row = result.fetchone()
+        result = conn.execute(text("SELECT symbol, open, close FROM bars_1s WHERE symbol = 'BTCUSDT' ORDER BY ts"))
+        fetched = result.fetchall()
 
-    assert row is not None
+    assert len(fetched) == 3
+    row = fetched[0]
     assert row[0] == "BTCUSDT"
     assert row[1] == 50000
     assert row[2] == 50050
@@ -313,3 +325,85 @@ def test_apply_schema_handles_missing_file():
 
         engine.dispose()
         os.remove(db_path)
+
+
+def test_verify_integrity_fail_missing_index(temp_sqlite_db):
+    """Test that verify_integrity() detects missing indexes."""
+    engine = temp_sqlite_db
+
+    apply_schema(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS idx_bars_1s_ts"))
+
+    all_present, missing = verify_integrity(engine)
+
+    assert all_present is False
+    assert missing == ["index:bars_1s.idx_bars_1s_ts"]
+
+
+def test_apply_schema_caches_parsed_statements(temp_sqlite_db):
+    """Test that schema.sql is parsed once and reused across calls."""
+    engine = temp_sqlite_db
+
+    _load_schema_statements.cache_clear()
+
+    assert apply_schema(engine) is True
+    assert apply_schema(engine) is True
+
+    info = _load_schema_statements.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_enable_sqlite_pragmas(tmp_path):
+    """Test that SQLite connections are opened in WAL mode."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'wal.db'}", echo=False)
+    enable_sqlite_pragmas(engine)
+
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    finally:
+        engine.dispose()
+
+
+def test_connect_and_register_views_uses_config_dict(tmp_path, monkeypatch):
+    """Test that a configured SQL engine is built from the dict, without a temp config file."""
+    from tools.db import connect_and_register_views
+
+    monkeypatch.delenv("CRYPTO_DB_URL", raising=False)
+    config = {"database": {"url": f"sqlite:///{(tmp_path / 'lake.db').as_posix()}"}}
+
+    with patch("tempfile.NamedTemporaryFile") as temp_file:
+        engine = connect_and_register_views(str(tmp_path), config=config)
+    try:
+        temp_file.assert_not_called()
+        assert engine.dialect.name == "sqlite"
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        engine.dispose()
+
+
+def test_get_connection_with_views_caches_engine(tmp_path, monkeypatch):
+    """Test that repeated calls share one engine unless a fresh one is requested."""
+    from tools import db
+
+    monkeypatch.delenv("CRYPTO_DB_URL", raising=False)
+    monkeypatch.setattr(db, "_ENGINE_CACHE", {})
+    config = {
+        "general": {"base_path": str(tmp_path)},
+        "database": {"url": f"sqlite:///{(tmp_path / 'lake.db').as_posix()}"},
+    }
+
+    first = db.get_connection_with_views(config)
+    try:
+        assert db.get_connection_with_views(config) is first
+        fresh = db.get_connection_with_views(config, fresh=True)
+        assert fresh is not first
+        assert db.get_connection_with_views(config) is fresh
+    finally:
+        first.dispose()
+        fresh.dispose()
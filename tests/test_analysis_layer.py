@@ -3,14 +3,32 @@
 import os
 import tempfile
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import duckdb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
-from tools.db import load_views_sql, connect_and_register_views
-from tools.slice import build_slice_query, export_slice
+from tools.db import (
+    _find_files,
+    _parse_view_statements,
+    _read_views_template,
+    _resolve_views_sql,
+    _split_sql_statements,
+    connect_and_register_views,
+    is_sqlalchemy_engine,
+    load_views_sql,
+    refresh_bars_1m,
+)
+from tools.ingest_duckdb import ingest_partitions
+from tools.slice import _parse_iso, build_slice_query, export_slice
 from tools.validate_rules import (
+    R5_FOR,
+    RuleColumns,
+    _find_gaps,
     rule_r1_ohlc_ordering,
     rule_r2_positive_prices,
     rule_r3_ask_gte_bid,
@@ -20,8 +38,8 @@ from tools.validate_rules import (
 )
 
 
-def create_test_bars_parquet(tmp_path: str, symbol: str = "TESTUSDT") -> str:
-    """Create a small test parquet file for bars_1s."""
+def create_test_bars_table(symbol: str = "TESTUSDT") -> pa.Table:
+    """Create a small in-memory Arrow table of raw bars_1s rows."""
     base_ts = datetime.now(timezone.utc).replace(microsecond=0)
 
     df = pd.DataFrame({
@@ -40,34 +58,39 @@ def create_test_bars_parquet(tmp_path: str, symbol: str = "TESTUSDT") -> str:
         "spread": [0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1],
     })
 
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def create_test_bars_parquet(tmp_path: str, symbol: str = "TESTUSDT") -> str:
+    """Create a small test parquet file for bars_1s."""
     # Create directory structure
     parquet_dir = os.path.join(tmp_path, "parquet", "binance", symbol)
     os.makedirs(parquet_dir, exist_ok=True)
 
     parquet_path = os.path.join(parquet_dir, "test.parquet")
-    df.to_parquet(parquet_path, index=False, compression="snappy")
+    pq.write_table(create_test_bars_table(symbol), parquet_path, compression="snappy")
 
     return tmp_path
 
 
 def test_views_compile_smoke():
     """Test 1: Views compile and execute without errors."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        # Create test data
-        base_path = create_test_bars_parquet(tmp_dir)
+    # Views read an in-memory Arrow table; no parquet files are written
+    table = create_test_bars_table()
 
-        # Load views SQL using the centralized loader
-        views_sql = load_views_sql(base_path)
+    # Load views SQL using the centralized loader
+    views_sql = load_views_sql("/tmp/crypto_lake")
 
-        # Verify @@BASE@@ was replaced
-        assert "@@BASE@@" not in views_sql, "@@BASE@@ should be replaced with actual path"
+    # Verify @@BASE@@ was replaced
+    assert "@@BASE@@" not in views_sql, "@@BASE@@ should be replaced with actual path"
 
-        # Create minimal views for test (only bars, skip klines/macro that need missing data)
-        conn = duckdb.connect(":memory:")
+    # Create minimal views for test (only bars, skip klines/macro that need missing data)
+    conn = duckdb.connect(":memory:")
+    conn.register("bars_raw_view", table)
 
-        try:
-            # Create just the bars views manually to avoid missing file errors
-            minimal_sql = f"""
+    try:
+        # Create just the bars views manually to avoid missing file errors
+        minimal_sql = """
 PRAGMA threads=4;
 
 CREATE OR REPLACE VIEW bars_1s AS
@@ -86,7 +109,7 @@ SELECT
     bid,
     ask,
     spread
-FROM read_parquet('{base_path.replace(chr(92), "/")}/parquet/binance/*/**.parquet')
+FROM bars_raw_view
 WHERE window_start IS NOT NULL
 ORDER BY symbol, ts;
 
@@ -111,26 +134,26 @@ GROUP BY exchange, symbol, date_trunc('minute', ts)
 ORDER BY exchange, symbol, ts;
 """
 
-            conn.execute(minimal_sql)
+        conn.execute(minimal_sql)
 
-            # Test query on bars_1s
-            result = conn.execute("SELECT COUNT(*) FROM bars_1s").fetchone()
-            assert result[0] > 0, "bars_1s should return data"
+        # Test query on bars_1s
+        result = conn.execute("SELECT COUNT(*) FROM bars_1s").fetchone()
+        assert result[0] > 0, "bars_1s should return data"
 
-            # Test query on bars_1m (should aggregate)
-            result = conn.execute("SELECT COUNT(*) FROM bars_1m").fetchone()
-            assert result[0] > 0, "bars_1m should return aggregated data"
+        # Test query on bars_1m (should aggregate)
+        result = conn.execute("SELECT COUNT(*) FROM bars_1m").fetchone()
+        assert result[0] > 0, "bars_1m should return aggregated data"
 
-            # Verify columns in bars_1s
-            result = conn.execute("SELECT * FROM bars_1s LIMIT 1").fetchdf()
-            expected_cols = ["exchange", "symbol", "ts", "open", "high", "low", "close",
-                           "volume_base", "volume_quote", "trade_count", "vwap",
-                           "bid", "ask", "spread"]
-            assert all(col in result.columns for col in expected_cols), \
-                f"Missing columns in bars_1s. Got: {list(result.columns)}"
+        # Verify columns in bars_1s
+        result = conn.execute("SELECT * FROM bars_1s LIMIT 1").fetchdf()
+        expected_cols = ["exchange", "symbol", "ts", "open", "high", "low", "close",
+                        "volume_base", "volume_quote", "trade_count", "vwap",
+                        "bid", "ask", "spread"]
+        assert all(col in result.columns for col in expected_cols), \
+            f"Missing columns in bars_1s. Got: {list(result.columns)}"
 
-        finally:
-            conn.close()
+    finally:
+        conn.close()
 
 
 @pytest.mark.skip(reason="Requires all data paths (klines, macro) to exist - integration test only")
@@ -207,50 +230,103 @@ def test_validation_rules():
 
     df_normal = pd.DataFrame(normal_data)
 
+    def with_overrides(overrides):
+        """Rule columns of df_normal with {(col, row): value} overrides.
+
+        The frame is shared by every case; only the overridden columns are
+        copied, so df_normal itself is never modified.
+        """
+        cols = RuleColumns(df_normal)
+        for col in {col for col, _ in overrides}:
+            cols[col] = cols[col].copy()
+        for (col, row), value in overrides.items():
+            cols[col][row] = value
+        return cols
+
     # Test R1: OHLC ordering violation
-    df_r1_violation = df_normal.copy()
-    df_r1_violation.loc[0, "high"] = 99.0  # high < low, violation
-    r1_count, _ = rule_r1_ohlc_ordering(df_r1_violation)
+    r1_count, _ = rule_r1_ohlc_ordering(df_normal, with_overrides({("high", 0): 99.0}))  # high < low
     assert r1_count > 0, "R1 should detect OHLC ordering violation"
 
     # Test R2: Positive prices violation
-    df_r2_violation = df_normal.copy()
-    df_r2_violation.loc[0, "close"] = -1.0  # negative price, violation
-    r2_count, _ = rule_r2_positive_prices(df_r2_violation)
+    r2_count, _ = rule_r2_positive_prices(df_normal, with_overrides({("close", 0): -1.0}))
     assert r2_count > 0, "R2 should detect negative price violation"
 
     # Test R3: Ask >= Bid violation
-    df_r3_violation = df_normal.copy()
-    df_r3_violation.loc[0, "ask"] = 99.0  # ask < bid, violation
-    r3_count, _ = rule_r3_ask_gte_bid(df_r3_violation)
+    r3_count, _ = rule_r3_ask_gte_bid(df_normal, with_overrides({("ask", 0): 99.0}))  # ask < bid
     assert r3_count > 0, "R3 should detect ask < bid violation"
 
     # Test R4: No NaNs in OHLC violation
-    df_r4_violation = df_normal.copy()
-    df_r4_violation.loc[0, "close"] = None  # NaN in close, violation
-    r4_count, _ = rule_r4_no_nans_ohlc(df_r4_violation)
+    r4_count, _ = rule_r4_no_nans_ohlc(df_normal, with_overrides({("close", 0): float("nan")}))
     assert r4_count > 0, "R4 should detect NaN in OHLC violation"
 
     # Test R5: Timestamp continuity (1s timeframe)
-    df_r5_violation = df_normal.copy()
-    # Create a gap > 1 second
-    df_r5_violation.loc[2, "ts"] = df_r5_violation.loc[1, "ts"] + pd.Timedelta(seconds=5)
-    df_r5_violation.loc[3, "ts"] = df_r5_violation.loc[2, "ts"] + pd.Timedelta(seconds=1)
-    df_r5_violation.loc[4, "ts"] = df_r5_violation.loc[3, "ts"] + pd.Timedelta(seconds=1)
-    r5_count, _ = rule_r5_timestamp_continuity(df_r5_violation, tf="1s")
+    # Shift rows 2-4 by 5 seconds to create a gap > 1 second between rows 1 and 2
+    ts_ns = RuleColumns(df_normal)["ts"]
+    r5_cols = with_overrides({("ts", i): ts_ns[i] + 5 * 1_000_000_000 for i in (2, 3, 4)})
+    r5_count, _ = rule_r5_timestamp_continuity(df_normal, "1s", r5_cols)
     assert r5_count > 0, "R5 should detect timestamp gap violation"
 
     # Test R6: Spread sanity violation
-    df_r6_violation = df_normal.copy()
-    df_r6_violation.loc[0, "spread"] = -0.5  # negative spread, violation
-    r6_count, _, _ = rule_r6_spread_sanity(df_r6_violation)
+    r6_count, _, _ = rule_r6_spread_sanity(df_normal, with_overrides({("spread", 0): -0.5}))
     assert r6_count > 0, "R6 should detect negative spread violation"
 
+    # The shared frame is clean and untouched
+    assert df_normal["high"].iloc[0] == 100.5
+    cols = RuleColumns(df_normal)
+    assert rule_r1_ohlc_ordering(df_normal, cols)[0] == 0
+    assert rule_r5_timestamp_continuity(df_normal, "1s", cols)[0] == 0
+
+
+def test_validation_rules_counts_and_offending_rows():
+    """Vectorised rules report exact counts, NaN handling and per-symbol gaps."""
+    base_ts = pd.Timestamp("2025-10-21T00:00:00Z")
+    ts = list(pd.date_range(start=base_ts, periods=4, freq="1s", tz="UTC"))
+
+    df = pd.DataFrame({
+        # Interleaved symbols: a gap in BBB must not be masked by AAA rows
+        "symbol": ["AAA", "BBB", "AAA", "BBB", "AAA", "BBB"],
+        "ts": [ts[0], ts[0], ts[1], ts[3], ts[2], ts[3] + pd.Timedelta(seconds=4)],
+        "open": [100.0, 100.0, float("nan"), 100.0, 100.0, 100.0],
+        "high": [101.0, 101.0, 101.0, 99.0, 101.0, 101.0],
+        "low": [99.0, 99.0, 99.0, 99.5, 99.0, 99.0],
+        "close": [100.0, 100.0, 100.0, 100.0, 100.0, 100.0],
+        "bid": [100.0, 100.0, float("nan"), 100.0, 100.0, 100.0],
+        "ask": [100.1, 99.0, 100.1, 100.1, 100.1, 100.1],
+        "spread": [0.1, 0.1, 0.1, 6.0, -0.1, 0.1],
+    })
+
+    # R1: NaN open and high < low both count
+    r1_count, r1_rows = rule_r1_ohlc_ordering(df)
+    assert r1_count == 2
+    assert list(r1_rows.index) == [2, 3]
+
+    r4_count, _ = rule_r4_no_nans_ohlc(df)
+    assert r4_count == 1
+
+    # R3 ignores the row with a NaN bid
+    r3_count, r3_rows = rule_r3_ask_gte_bid(df)
+    assert r3_count == 1
+    assert r3_rows["symbol"].tolist() == ["BBB"]
+
+    # R5: BBB jumps 3s then 4s; AAA is continuous
+    r5_count, r5_rows = rule_r5_timestamp_continuity(df, tf="1s")
+    assert r5_count == 2
+    assert r5_rows["symbol"].tolist() == ["BBB", "BBB"]
+    assert r5_rows["ts_diff"].tolist() == [pd.Timedelta(seconds=3), pd.Timedelta(seconds=4)]
 
-def test_build_slice_query():
+    # R6: one negative spread, one excessive spread; NaN bid row not checked
+    r6_count, r6_rows, r6_stats = rule_r6_spread_sanity(df)
+    assert r6_count == 2
+    assert r6_stats["total_checked"] == 5
+    assert r6_stats["negative_spread_count"] == 1
+    assert r6_stats["excessive_spread_count"] == 1
+    assert r6_rows["spread"].tolist() == [-0.1, 6.0]
+
+
+def test_build_slice_query(duckdb_memory):
     """Test slice query building logic."""
     # Test 1s bars
-    query, columns = build_slice_query(
+    query, params, columns = build_slice_query(
         symbols=["SOLUSDT", "BTCUSDT"],
         start="2025-10-21T00:00:00Z",
         end="2025-10-21T01:00:00Z",
@@ -258,11 +334,13 @@ def test_build_slice_query():
         source="bars",
     )
     assert "bars_1s" in query, "Should use bars_1s view for 1s timeframe"
-    assert "SOLUSDT" in query and "BTCUSDT" in query, "Should include symbols in query"
+    assert params == [["SOLUSDT", "BTCUSDT"], 1761004800000, 1761008400000], \
+        "Should bind symbols and time range (epoch ms) as parameters"
+    assert "SOLUSDT" not in query, "Symbols should not be inlined into SQL"
     assert "symbol" in columns and "ts" in columns, "Should include required columns"
 
     # Test 1m bars
-    query, columns = build_slice_query(
+    query, params, columns = build_slice_query(
         symbols=["SOLUSDT"],
         start="2025-10-21T00:00:00Z",
         end="2025-10-21T01:00:00Z",
@@ -272,7 +350,7 @@ def test_build_slice_query():
     assert "bars_1m" in query, "Should use bars_1m view for 1m timeframe"
 
     # Test 1m klines
-    query, columns = build_slice_query(
+    query, params, columns = build_slice_query(
         symbols=["SOLUSDT"],
         start="2025-10-21T00:00:00Z",
         end="2025-10-21T01:00:00Z",
@@ -282,6 +360,40 @@ def test_build_slice_query():
     assert "klines_1m" in query, "Should use klines_1m view for klines source"
     assert "taker_buy_base" in columns, "Klines should have taker_buy columns"
 
+    # Explicit column projection selects only the requested columns
+    query_cols, _, columns_cols = build_slice_query(
+        ["SOLUSDT"], "2025-10-21T00:00:00Z", "2025-10-21T01:00:00Z",
+        "1m", "bars", columns=["ts", "symbol", "close"],
+    )
+    assert columns_cols == ["ts", "symbol", "close"]
+    assert "SELECT ts, symbol, close" in query_cols
+    assert "spread" not in query_cols, "Unselected columns should not be read"
+
+    with pytest.raises(ValueError, match="Unknown columns"):
+        build_slice_query(["SOLUSDT"], "2025-10-21T00:00:00Z", "2025-10-21T01:00:00Z",
+                          "1m", "bars", columns=["close; DROP TABLE bars_1m"])
+
+    # Same shape reuses the cached SQL text
+    query_again, _, _ = build_slice_query(["BTCUSDT"], "2025-10-22T00:00:00Z",
+                                          "2025-10-23T00:00:00Z", "1m", "klines")
+    assert query_again is query, "SQL template should be cached per (tf, source)"
+
+    # Parameterised query executes against DuckDB
+    duckdb_memory.execute("""
+        CREATE TABLE klines_1m AS
+        SELECT symbol, ts,
+               1.0 AS open, 1.0 AS high, 1.0 AS low, 1.0 AS close,
+               1.0 AS volume_base, 1.0 AS volume_quote, 1 AS trade_count,
+               1.0 AS taker_buy_base, 1.0 AS taker_buy_quote
+        FROM (VALUES
+            ('SOLUSDT', TIMESTAMPTZ '2025-10-21 00:00:00+00'),
+            ('SOLUSDT', TIMESTAMPTZ '2025-10-21 01:00:00+00'),
+            ('BTCUSDT', TIMESTAMPTZ '2025-10-21 00:30:00+00')
+        ) AS t(symbol, ts)
+    """)
+    rows = duckdb_memory.execute(query, params).fetchall()
+    assert len(rows) == 1, "End bound should be exclusive and symbols filtered"
+
 
 def test_load_views_sql_placeholder_replacement():
     """Test base path replacement in SQL using centralized loader."""
@@ -294,3 +406,414 @@ def test_load_views_sql_placeholder_replacement():
         # Verify @@BASE@@ was replaced
         assert "@@BASE@@" not in sql, "Should remove all @@BASE@@ placeholders"
         assert "D:/CryptoDataLake" in sql, "Should replace @@BASE@@ with normalized path"
+
+
+def test_materialized_bars_1m_incremental_refresh():
+    """bars_1m can be stored as a table and refreshed from new partitions."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_dir = os.path.join(tmp_dir, "parquet", "binance", "TESTUSDT")
+        os.makedirs(parquet_dir)
+
+        def write_bars(name, start, periods):
+            ts = pd.date_range(start=start, periods=periods, freq="1s", tz="UTC")
+            pd.DataFrame({
+                "symbol": "TESTUSDT",
+                "window_start": ts,
+                "open": 100.0, "high": 101.0, "low": 99.0, "close": 100.5,
+                "volume_base": 1.0, "volume_quote": 100.0, "trade_count": 1,
+                "vwap": 100.0, "bid": 100.0, "ask": 100.1, "spread": 0.1,
+            }).to_parquet(os.path.join(parquet_dir, name), index=False)
+
+        # Minute 00:00 complete, minute 00:01 partial (30 bars)
+        write_bars("a.parquet", "2025-10-21T00:00:00Z", 90)
+
+        sql = load_views_sql(tmp_dir, materialize=True)
+        assert "CREATE OR REPLACE TABLE bars_1m" in sql
+        assert "CREATE OR REPLACE VIEW bars_1m AS" not in sql
+
+        conn = connect_and_register_views(tmp_dir, materialize=True)
+        try:
+            table_type = conn.execute(
+                "SELECT table_type FROM information_schema.tables WHERE table_name = 'bars_1m'"
+            ).fetchone()[0]
+            assert table_type == "BASE TABLE"
+            assert conn.execute("SELECT sum(bar_count) FROM bars_1m").fetchone()[0] == 90
+
+            # New partition completes minute 00:01 and adds minute 00:02
+            write_bars("b.parquet", "2025-10-21T00:01:30Z", 60)
+            inserted = refresh_bars_1m(conn)
+
+            assert inserted == 2
+            rows = conn.execute("SELECT bar_count FROM bars_1m ORDER BY ts").fetchall()
+            assert [r[0] for r in rows] == [60, 60, 30]
+            last_ts = conn.execute("SELECT last_ts FROM _bars_1m_wm").fetchone()[0]
+            assert pd.Timestamp(last_ts).minute == 2
+        finally:
+            conn.close()
+
+
+def test_load_views_sql_scan_settings():
+    """Views header enables the object cache, plus httpfs for remote lakes."""
+    local_sql = load_views_sql("/data/lake")
+    assert "SET enable_object_cache=true;" in local_sql
+    assert "SET preserve_insertion_order=false;" in local_sql
+    assert "httpfs" not in local_sql
+
+    remote_sql = load_views_sql("s3://bucket/lake/")
+    assert remote_sql.startswith("INSTALL httpfs;\nLOAD httpfs;\nSET http_keep_alive=true;")
+    assert "read_parquet('s3://bucket/lake/parquet/binance/**/*.parquet')" in remote_sql
+
+
+def test_load_views_sql_caches_template(tmp_path):
+    """views.sql is read once per mtime; base paths are substituted per call."""
+    sql_file = tmp_path / "views.sql"
+    sql_file.write_text("SELECT * FROM read_parquet('@@BASE@@/x.parquet');\n", encoding="utf-8")
+    _read_views_template.cache_clear()
+
+    first = load_views_sql("/lake/a", sql_path=str(sql_file))
+    second = load_views_sql("/lake/b", sql_path=str(sql_file))
+    assert "/lake/a/x.parquet" in first and "/lake/b/x.parquet" in second
+    assert _read_views_template.cache_info().misses == 1
+    assert _read_views_template.cache_info().hits == 1
+
+    # Editing the file invalidates the cached template
+    sql_file.write_text("SELECT 1 FROM read_parquet('@@BASE@@/y.parquet');\n", encoding="utf-8")
+    os.utime(sql_file, (0, os.path.getmtime(sql_file) + 10))
+    assert "/lake/a/y.parquet" in load_views_sql("/lake/a", sql_path=str(sql_file))
+
+
+def test_find_gaps_matches_per_symbol_diff():
+    """Gap kernel agrees with a per-symbol sort/diff on shuffled multi-symbol data."""
+    rng = np.random.default_rng(7)
+    n = 5000
+    symbols = rng.choice(["AAA", "BBB", "CCC"], size=n)
+    steps = rng.choice([1, 1, 1, 2, 5], size=n).astype("int64") * 1_000_000_000
+    ts_ns = np.cumsum(steps)
+    ts_ns[rng.choice(n, size=20, replace=False)] = np.iinfo(np.int64).min  # NaT
+
+    codes, uniques = pd.factorize(symbols)
+    order, gap_pos, gap_ns = _find_gaps(ts_ns, codes, 1_000_000_000)
+
+    expected = 0
+    for sym in uniques:
+        sym_ts = np.sort(ts_ns[(symbols == sym) & (ts_ns != np.iinfo(np.int64).min)])
+        expected += int((np.diff(sym_ts) > 1_000_000_000).sum())
+
+    assert len(gap_pos) == expected
+    assert (gap_ns > 1_000_000_000).all()
+    after = ts_ns[order[gap_pos]]
+    before = ts_ns[order[gap_pos - 1]]
+    assert (after - before == gap_ns).all()
+    assert (codes[order[gap_pos]] == codes[order[gap_pos - 1]]).all()
+
+
+def test_rules_share_one_rule_columns_instance():
+    """Test that rules fill a shared RuleColumns and match fresh per-rule results."""
+    ts = pd.date_range("2025-01-01", periods=6, freq="1s", tz="UTC")
+    df = pd.DataFrame({
+        "symbol": ["A", "A", "A", "B", "B", "B"],
+        "ts": ts.delete(2).append(pd.DatetimeIndex([ts[-1] + pd.Timedelta(seconds=5)])),
+        "open": [100.0, 99.0, -1.0, np.nan, 100.0, 100.0],
+        "high": [101.0, 98.0, 101.0, 101.0, 101.0, 101.0],
+        "low": [99.0, 97.0, -2.0, 99.0, 99.0, 99.0],
+        "close": [100.0, 97.5, 100.0, 100.0, 100.0, 100.0],
+        "bid": [99.9, 98.0, np.nan, 100.0, 99.0, 90.0],
+        "ask": [100.1, 97.0, 100.0, 100.2, 99.1, 110.0],
+        "spread": [0.2, -1.0, np.nan, 0.2, 0.1, 20.0],
+    })
+
+    cols = RuleColumns(df)
+    assert rule_r1_ohlc_ordering(df, cols)[0] == rule_r1_ohlc_ordering(df)[0] == 2
+    assert set(cols) == {"open", "high", "low", "close"}, "Empty shared instance must be used"
+    open_array = cols["open"]
+
+    assert rule_r2_positive_prices(df, cols)[0] == rule_r2_positive_prices(df)[0] == 2
+    assert cols["open"] is open_array, "Columns are converted once and reused"
+    assert rule_r3_ask_gte_bid(df, cols)[0] == rule_r3_ask_gte_bid(df)[0] == 1
+    assert rule_r4_no_nans_ohlc(df, cols)[0] == rule_r4_no_nans_ohlc(df)[0] == 1
+    assert (
+        rule_r5_timestamp_continuity(df, "1s", cols)[0]
+        == rule_r5_timestamp_continuity(df, "1s")[0]
+    )
+    assert rule_r6_spread_sanity(df, cols)[0] == rule_r6_spread_sanity(df)[0] == 2
+    assert {"ts", "symbol_codes", "bid", "ask", "spread"} <= set(cols)
+
+
+def test_parse_iso_epoch_ms():
+    """ISO bounds parse to UTC epoch milliseconds and are cached."""
+    _parse_iso.cache_clear()
+
+    assert _parse_iso("2025-10-21T00:00:00Z") == 1761004800000
+    assert _parse_iso("2025-10-21T00:00:00") == 1761004800000, "Naive input is UTC"
+    assert _parse_iso("2025-10-21T02:00:00+02:00") == 1761004800000
+    assert _parse_iso("2025-10-21T00:00:00.250Z") == 1761004800250
+
+    _parse_iso("2025-10-21T00:00:00Z")
+    assert _parse_iso.cache_info().hits == 1
+
+    with pytest.raises(ValueError):
+        _parse_iso("not-a-timestamp")
+
+
+def test_duckdb_store_ingest_and_attach():
+    """Ingested partitions are served from bars.duckdb, once per partition."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path = create_test_bars_parquet(tmp_dir)
+
+        stats = ingest_partitions(base_path)
+        assert stats["partitions_ingested"] == 1
+        assert stats["rows_ingested"] == 10
+
+        stats = ingest_partitions(base_path)
+        assert stats["partitions_ingested"] == 0, "Partitions should be ingested once"
+        assert stats["partitions_skipped"] == 1
+
+        conn = connect_and_register_views(base_path)
+        try:
+            databases = {row[0] for row in conn.execute("SELECT database_name FROM duckdb_databases()").fetchall()}
+            assert "store" in databases, "Store should be attached when bars.duckdb exists"
+            assert conn.execute("SELECT COUNT(*) FROM bars_1s").fetchone()[0] == 10
+            assert conn.execute("SELECT COUNT(*) FROM bars_1m").fetchone()[0] > 0
+        finally:
+            conn.close()
+
+        conn = connect_and_register_views(base_path, config={"duckdb": {"use_store": False}})
+        try:
+            databases = {row[0] for row in conn.execute("SELECT database_name FROM duckdb_databases()").fetchall()}
+            assert "store" not in databases, "Config should select the Parquet backend"
+            assert conn.execute("SELECT COUNT(*) FROM bars_1s").fetchone()[0] == 10
+        finally:
+            conn.close()
+
+
+def test_duckdb_store_serves_current_day_and_changed_partitions_from_parquet(tmp_path):
+    """bars_1s unions the store with Parquet partitions it does not currently cover."""
+    today = datetime.now(timezone.utc)
+    past_dir = tmp_path / "parquet" / "binance" / "TESTUSDT" / "year=2025" / "month=1" / "day=2"
+    today_dir = (
+        tmp_path / "parquet" / "binance" / "TESTUSDT"
+        / f"year={today.year}" / f"month={today.month}" / f"day={today.day}"
+    )
+    for path in (past_dir, today_dir):
+        path.mkdir(parents=True)
+        pq.write_table(create_test_bars_table(), path / "part-0.parquet")
+    base_path = str(tmp_path)
+
+    stats = ingest_partitions(base_path)
+    assert stats["partitions_ingested"] == 1, "Today's partition is left to Parquet"
+
+    def count_and_covered():
+        conn = connect_and_register_views(base_path)
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM bars_1s").fetchone()[0]
+            covered = [row[0] for row in conn.execute(
+                "SELECT partition FROM _bars_1s_store_partitions"
+            ).fetchall()]
+            return count, covered
+        finally:
+            conn.close()
+
+    assert count_and_covered() == (20, ["TESTUSDT/year=2025/month=1/day=2"])
+
+    # A rewritten partition is read from Parquet until it is re-ingested
+    pq.write_table(create_test_bars_table(), past_dir / "part-1.parquet")
+    assert count_and_covered() == (30, [])
+
+    stats = ingest_partitions(base_path)
+    assert stats["partitions_ingested"] == 1
+    assert stats["partitions_refreshed"] == 1
+    assert stats["rows_ingested"] == 20
+    assert count_and_covered() == (30, ["TESTUSDT/year=2025/month=1/day=2"])
+    assert ingest_partitions(base_path)["partitions_ingested"] == 0
+
+
+def test_r5_specialised_per_timeframe():
+    """R5 checks are pre-bound per timeframe; unknown timeframes are skipped."""
+    df = pd.DataFrame({
+        "symbol": ["A"] * 4,
+        "ts": pd.to_datetime([
+            "2025-01-01 00:00:00", "2025-01-01 00:01:00.500",
+            "2025-01-01 00:02:30", "2025-01-01 00:05:00",
+        ], utc=True, format="ISO8601"),
+    })
+
+    positions, _ = R5_FOR["1m"](RuleColumns(df))
+    assert positions.tolist() == [2], "Sub-second offsets should not break minute alignment"
+
+    positions, gaps = R5_FOR["1s"](RuleColumns(df))
+    assert len(positions) == 3
+    assert gaps.min() > 1_000_000_000
+
+    count, offending = rule_r5_timestamp_continuity(df, "5m")
+    assert count == 0 and offending.empty
+
+
+def test_duckdb_memory_fixture_single_threaded(duckdb_memory):
+    """Test that unit-test DuckDB connections skip the worker pool."""
+    assert duckdb_memory.execute("SELECT current_setting('threads')").fetchone()[0] == 1
+    assert duckdb_memory.execute("SELECT current_setting('enable_object_cache')").fetchone()[0] is False
+
+
+def test_load_views_sql_caches_resolved_sql(tmp_path):
+    """Repeat loads for the same base return the cached resolved SQL until the file changes."""
+    sql_file = tmp_path / "views.sql"
+    sql_file.write_text("SELECT * FROM read_parquet('@@BASE@@/x.parquet');\n", encoding="utf-8")
+    _resolve_views_sql.cache_clear()
+
+    first = load_views_sql("/lake/a", sql_path=str(sql_file))
+    with patch("tools.db._read_views_template") as read_template:
+        assert load_views_sql("/lake/a/", sql_path=str(sql_file)) is first
+    read_template.assert_not_called()
+    assert _resolve_views_sql.cache_info().hits == 1
+
+    sql_file.write_text("SELECT 1 FROM read_parquet('@@BASE@@/y.parquet');\n", encoding="utf-8")
+    os.utime(sql_file, ns=(0, os.stat(sql_file).st_mtime_ns + 10_000_000_000))
+    assert "/lake/a/y.parquet" in load_views_sql("/lake/a", sql_path=str(sql_file))
+
+    with pytest.raises(FileNotFoundError, match="Views SQL file not found"):
+        load_views_sql("/lake/a", sql_path=str(tmp_path / "missing.sql"))
+
+
+def test_connect_and_register_views_shares_cached_instance(tmp_path):
+    """Shared in-memory view sets are registered once and handed out as cursors."""
+    base_path = create_test_bars_parquet(str(tmp_path))
+    views = tmp_path / "views.sql"
+    views.write_text(
+        "CREATE OR REPLACE VIEW bars_1s AS "
+        "SELECT * FROM read_parquet('@@BASE@@/parquet/binance/**/*.parquet');\n",
+        encoding="utf-8",
+    )
+    partial = tmp_path / "partial.sql"
+    partial.write_text(
+        views.read_text(encoding="utf-8")
+        + "CREATE OR REPLACE VIEW macro AS SELECT * FROM read_parquet('@@BASE@@/macro/*.parquet');\n",
+        encoding="utf-8",
+    )
+
+    # Private connections by default: caller DDL does not leak to other callers
+    private = connect_and_register_views(base_path, sql_path=str(views))
+    private.execute("CREATE TABLE private_marker AS SELECT 1")
+    other = connect_and_register_views(base_path, sql_path=str(views))
+    assert other.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'private_marker'"
+    ).fetchone()[0] == 0
+    private.close()
+    other.close()
+
+    first = connect_and_register_views(base_path, sql_path=str(views), shared=True)
+    with patch("tools.db.duckdb.connect") as connect:
+        second = connect_and_register_views(base_path, sql_path=str(views), shared=True)
+    connect.assert_not_called()
+    assert second is not first
+
+    # Closing one cursor leaves the shared instance usable
+    first.close()
+    assert second.execute("SELECT COUNT(*) FROM bars_1s").fetchone()[0] == 10
+    second.close()
+
+    # A view set with a skipped optional view is rebuilt on every call
+    a = connect_and_register_views(base_path, sql_path=str(partial), shared=True)
+    b = connect_and_register_views(base_path, sql_path=str(partial), shared=True)
+    a.execute("CREATE TABLE marker AS SELECT 1")
+    assert b.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'marker'").fetchone()[0] == 0
+    a.close()
+    b.close()
+
+
+def test_parse_view_statements_cached_with_names():
+    """Views SQL is split once per text, with the created object name per statement."""
+    sql = (
+        "-- header comment\n"
+        "PRAGMA threads=2;\n"
+        "CREATE OR REPLACE VIEW bars_1s AS\n  SELECT 1;\n"
+        "create table if not exists _bars_1m_wm AS SELECT 1;\n"
+    )
+    _parse_view_statements.cache_clear()
+
+    parsed = _parse_view_statements(sql)
+    assert _parse_view_statements(sql) is parsed
+    assert _parse_view_statements.cache_info().hits == 1
+    assert [name for _, name in parsed] == [None, "bars_1s", "_bars_1m_wm"]
+    assert parsed[1][0] == "CREATE OR REPLACE VIEW bars_1s AS\n  SELECT 1;"
+
+
+def test_find_files_stops_at_limit(tmp_path):
+    """The parquet pre-flight check stops listing once enough examples are found."""
+    for i in range(5):
+        d = tmp_path / f"sym{i}" / "year=2025"
+        d.mkdir(parents=True)
+        (d / "part.parquet").write_bytes(b"")
+        (d / "notes.txt").write_bytes(b"")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "x.parquet").write_bytes(b"")
+
+    listed = []
+    real_scandir = os.scandir
+
+    def spy_scandir(path):
+        listed.append(path)
+        return real_scandir(path)
+
+    with patch("tools.db.os.scandir", side_effect=spy_scandir):
+        found = _find_files(str(tmp_path), ".parquet", limit=2)
+
+    assert len(found) == 2 and all(f.endswith("/part.parquet") for f in found)
+    assert len(listed) < 11  # not every directory in the tree
+    assert len(_find_files(str(tmp_path), ".parquet", limit=10)) == 5  # hidden dir skipped
+    assert _find_files(str(tmp_path / "missing"), ".parquet", limit=3) == []
+
+
+def test_is_sqlalchemy_engine():
+    """DuckDB connections and cursors are never treated as SQLAlchemy engines."""
+    conn = duckdb.connect(":memory:")
+    try:
+        with patch("tools.db.hasattr", create=True) as duck_typed:
+            assert is_sqlalchemy_engine(conn) is False
+            assert is_sqlalchemy_engine(conn.cursor()) is False
+        duck_typed.assert_not_called()
+    finally:
+        conn.close()
+
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    engine = sqlalchemy.create_engine("sqlite:///:memory:")
+    try:
+        assert is_sqlalchemy_engine(engine) is True
+    finally:
+        engine.dispose()
+    assert is_sqlalchemy_engine(object()) is False
+
+
+def test_split_sql_statements_respects_literals_and_comments():
+    """Semicolons inside literals and comments do not end a statement; comments are dropped."""
+    sql = (
+        "-- leading comment; not a statement\n"
+        "CREATE VIEW a AS SELECT 'x;y' AS s, \"odd;col\" -- trailing; comment\n"
+        "FROM t;\n"
+        "/* block; comment */ CREATE MACRO m() AS $$ SELECT 1; $$;\n"
+        "SELECT 'it''s;' AS q"
+    )
+
+    assert _split_sql_statements(sql) == [
+        "CREATE VIEW a AS SELECT 'x;y' AS s, \"odd;col\" \nFROM t;",
+        "CREATE MACRO m() AS $$ SELECT 1; $$;",
+        "SELECT 'it''s;' AS q",
+    ]
+    assert _split_sql_statements("-- only a comment\n;\n") == []
+
+
+def test_importing_db_helpers_does_not_load_duckdb_or_sqlalchemy():
+    """Path helpers import without paying for duckdb/SQLAlchemy."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from tools.db import normalise_base, load_views_sql\n"
+        "print(sorted(m for m in ('duckdb', 'sqlalchemy') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,210 @@
+"""
+Tests for the async REST backfill (tools/backfill.py).
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from tools import backfill
+from tools.backfill import (
+    BARS_SCHEMA,
+    _AimdConcurrency,
+    _AsyncRateLimiter,
+    _fetch_with_retry,
+    _klines_to_table,
+    _write_partitions,
+)
+
+
+def make_klines(start: datetime, n: int):
+    """Build n consecutive 1-minute Binance kline rows from start."""
+    rows = []
+    for i in range(n):
+        open_ms = int((start + timedelta(minutes=i)).timestamp() * 1000)
+        rows.append([
+            open_ms, "100.0", "101.0", "99.0", "100.5", "10.0",
+            open_ms + 59_999, "1005.0", 5, "5.0", "502.5", "0",
+        ])
+    return rows
+
+
+def test_write_partitions_single_write_across_days(tmp_path):
+    """Test that buffered batches land in year/month/day partitions in one write."""
+    start = datetime(2025, 10, 20, 23, 0, tzinfo=timezone.utc)
+    rows = make_klines(start, 120)  # 23:00 -> 00:59 next day
+    tables = [_klines_to_table(rows[:60], "SOLUSDT"), _klines_to_table(rows[60:], "SOLUSDT")]
+
+    _write_partitions(pa.concat_tables(tables), str(tmp_path))
+
+    for day in (20, 21):
+        files = list((tmp_path / "year=2025" / "month=10" / f"day={day}").glob("*.parquet"))
+        assert len(files) == 1, "One file per partition per write"
+        assert ds.dataset(files, format="parquet").count_rows() == 60
+        row_group = pq.ParquetFile(files[0]).metadata.row_group(0)
+        assert row_group.column(0).compression == "ZSTD"
+        assert row_group.sorting_columns[0].column_index == BARS_SCHEMA.get_field_index("window_start")
+
+    # Reruns add files rather than overwriting them, as write_to_dataset did
+    _write_partitions(tables[0], str(tmp_path))
+    assert len(list((tmp_path / "year=2025" / "month=10" / "day=20").glob("*.parquet"))) == 2
+
+
+def test_klines_to_table_types_and_vwap():
+    """Test that kline rows become a typed Arrow table without pandas."""
+    start = datetime(2025, 10, 20, tzinfo=timezone.utc)
+    rows = make_klines(start, 2)
+    rows[1][5] = "0"  # no base volume: vwap falls back to close
+
+    table = _klines_to_table(rows, "SOLUSDT")
+
+    assert table.schema == BARS_SCHEMA
+    assert table["symbol"].to_pylist() == ["SOLUSDT", "SOLUSDT"]
+    assert table["window_start"][0].as_py() == start
+    assert table["close"].to_pylist() == [100.5, 100.5]
+    assert table["trade_count"].to_pylist() == [5, 5]
+    assert table["vwap"].to_pylist() == [100.5, 100.5]
+    assert table["bid"].null_count == 2
+
+    assert _klines_to_table([], "SOLUSDT").num_rows == 0
+
+
+class FakeResponse:
+    """Minimal aiohttp response context manager."""
+
+    def __init__(self, status=200, payload=None, headers=None):
+        self.status = status
+        self._payload = payload if payload is not None else []
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return json.dumps(self._payload).encode()
+
+    async def text(self):
+        return str(self._payload)
+
+
+class FakeSession:
+    """Records request times and replays queued responses."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(asyncio.get_running_loop().time())
+        return self.responses.pop(0)
+
+
+def test_rate_limiter_caps_requests_per_window():
+    """Test that the shared limiter spaces request starts across tasks."""
+    async def run():
+        limiter = _AsyncRateLimiter(3, period=0.2)
+        session = FakeSession([FakeResponse(payload=[i]) for i in range(4)])
+        results = await asyncio.gather(*[
+            _fetch_with_retry(session, "http://x/klines", {}, limiter=limiter) for _ in range(4)
+        ])
+        return session.calls, results
+
+    calls, results = asyncio.run(run())
+
+    assert sorted(r[0] for r in results) == [0, 1, 2, 3]
+    # Three requests go out immediately, the fourth waits for the window to slide
+    assert calls[3] - calls[0] >= 0.19
+    assert calls[2] - calls[0] < 0.1
+
+
+def test_fetch_honours_retry_after_and_aimd():
+    """Test that 429s sleep exactly Retry-After and shrink the concurrency window."""
+    async def run():
+        limiter = _AsyncRateLimiter(100, period=60.0)
+        concurrency = _AimdConcurrency(initial=8, maximum=32)
+        session = FakeSession([
+            FakeResponse(status=429, headers={"Retry-After": "0.05"}),
+            FakeResponse(payload=[1, 2, 3]),
+        ])
+        result = await _fetch_with_retry(session, "http://x/klines", {}, limiter=limiter, concurrency=concurrency)
+        return session.calls, result, concurrency.limit
+
+    calls, result, limit = asyncio.run(run())
+
+    assert result == [1, 2, 3]
+    assert calls[1] - calls[0] >= 0.05
+    assert limit == 8 * 0.5 + 1.0  # halved on throttle, +alpha on success
+
+
+def test_fetch_pauses_limiter_near_weight_limit(monkeypatch):
+    """Test that a near-limit used-weight header holds back the next request."""
+    monkeypatch.setattr(backfill, "binance_weight_pause", lambda headers: 0.1 if headers else 0.0)
+
+    async def run():
+        limiter = _AsyncRateLimiter(100, period=60.0)
+        session = FakeSession([
+            FakeResponse(payload=[1], headers={"X-MBX-USED-WEIGHT-1M": "1150"}),
+            FakeResponse(payload=[2]),
+        ])
+        await _fetch_with_retry(session, "http://x/klines", {}, limiter=limiter)
+        await _fetch_with_retry(session, "http://x/klines", {}, limiter=limiter)
+        return session.calls
+
+    calls = asyncio.run(run())
+    assert calls[1] - calls[0] >= 0.09
+
+
+def test_backfill_symbol_writes_off_event_loop(tmp_path, monkeypatch):
+    """Test that the partition write runs in a worker thread, not on the event loop."""
+    written = {}
+
+    def fake_write(table, out_root):
+        written["thread"] = threading.current_thread()
+        written["rows"] = table.num_rows
+
+    monkeypatch.setattr(backfill, "_write_partitions", fake_write)
+    start = datetime(2025, 10, 20, tzinfo=timezone.utc)
+    start_ms = int(start.timestamp() * 1000)
+    session = FakeSession([FakeResponse(payload=make_klines(start, 5))])
+
+    asyncio.run(backfill._backfill_symbol(
+        session, "http://x", "SOLUSDT", start_ms, start_ms + 5 * 60_000, str(tmp_path)
+    ))
+
+    assert written["rows"] == 5
+    assert written["thread"] is not threading.main_thread()
+
+
+def test_backfill_symbol_flushes_each_completed_day(tmp_path, monkeypatch):
+    """Test that completed days are written as they finish, not held to the end."""
+    writes = []
+
+    def fake_write(table, out_root):
+        writes.append(sorted({ts.day for ts in table["window_start"].to_pylist()}))
+
+    monkeypatch.setattr(backfill, "_write_partitions", fake_write)
+    start = datetime(2025, 10, 20, 22, 0, tzinfo=timezone.utc)
+    start_ms = int(start.timestamp() * 1000)
+    rows = make_klines(start, 180)  # 22:00 day 20 -> 00:59 day 21
+    session = FakeSession([
+        FakeResponse(payload=rows[:60]),
+        FakeResponse(payload=rows[60:150]),
+        FakeResponse(payload=rows[150:]),
+    ])
+
+    asyncio.run(backfill._backfill_symbol(
+        session, "http://x", "SOLUSDT", start_ms, start_ms + 180 * 60_000, str(tmp_path)
+    ))
+
+    assert writes == [[20], [21]], "Day 20 is flushed once its last page arrives"
@@ -2,12 +2,17 @@
 Tests for Binance backfill module.
 """
 
+import json
+import os
 import pytest
 import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch, MagicMock
 import pandas as pd
+import pyarrow.parquet as pq
 
 from tools.backfill_binance import BinanceBackfiller, backfill_binance
 
@@ -95,6 +100,26 @@ class TestBinanceBackfiller:
         assert df["open_time"].dt.tz is not None
         assert str(df["open_time"].dt.tz) == "UTC"
 
+    def test_klines_to_dataframe_values(self, temp_dir, mock_klines_response):
+        """Test that string prices and int times convert to typed columns."""
+        backfiller = BinanceBackfiller(temp_dir)
+        df = backfiller._klines_to_dataframe(mock_klines_response[:3])
+
+        assert list(df.columns) == [
+            "open_time", "open", "high", "low", "close", "volume",
+            "close_time", "quote_volume", "trades",
+            "taker_base_vol", "taker_quote_vol",
+        ]
+        assert df["open_time"].iloc[0] == pd.Timestamp("2025-10-20T00:00:00Z")
+        assert df["close_time"].iloc[2] == pd.Timestamp("2025-10-20T00:03:00Z")
+        assert df["close"].tolist() == [100.5, 100.5, 100.5]
+        assert df["taker_quote_vol"].dtype == "float64"
+        assert df["trades"].tolist() == [50, 50, 50]
+
+        empty = backfiller._klines_to_dataframe([])
+        assert empty.empty
+        assert empty["open_time"].dtype == "datetime64[ns, UTC]"
+
     @patch("tools.backfill_binance.BinanceBackfiller._fetch_klines")
     def test_deduplication(self, mock_fetch, temp_dir, mock_klines_response):
         """Test that existing timestamps are not overwritten."""
@@ -124,7 +149,7 @@ class TestBinanceBackfiller:
         backfiller.backfill_symbol("SOLUSDT", lookback_days=1, end_date=date)
 
         # Verify directory structure
-        expected_path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "day=20" / "data.parquet"
+        expected_path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet"
         assert expected_path.exists()
 
         # Verify Parquet file can be read
@@ -132,8 +157,188 @@ class TestBinanceBackfiller:
         assert len(df) > 0
         assert "open_time" in df.columns
 
+    def test_parquet_zstd_monthly_file_row_group_per_day(self, temp_dir, mock_klines_response):
+        """Test that a month is one zstd file with one sorted row group per day."""
+        backfiller = BinanceBackfiller(temp_dir)
+        df = backfiller._klines_to_dataframe(mock_klines_response[:2880])  # 2 days
+        columns_before = list(df.columns)
+
+        backfiller._write_parquet(df, "SOLUSDT")
+
+        assert list(df.columns) == columns_before  # input frame not mutated
+        month_dir = temp_dir / "SOLUSDT" / "year=2025" / "month=10"
+        assert [p.name for p in month_dir.iterdir()] == ["data.parquet"]
+        metadata = pq.ParquetFile(month_dir / "data.parquet").metadata
+        assert metadata.num_rows == 2880
+        assert metadata.num_row_groups == 2
+        for i, day in enumerate(("2025-10-20", "2025-10-21")):
+            row_group = metadata.row_group(i)
+            assert row_group.num_rows == 1440
+            assert row_group.column(0).compression == "ZSTD"
+            assert row_group.sorting_columns[0].column_index == 0  # open_time
+            assert str(row_group.column(0).statistics.min.date()) == day
+
+    def test_write_parquet_splits_unsorted_batch_across_months(self, temp_dir, mock_klines_response):
+        """Test that an out-of-order batch spanning a month end lands sorted in both months."""
+        backfiller = BinanceBackfiller(temp_dir)
+        shift = int((datetime(2025, 10, 31, 23, 58, tzinfo=timezone.utc)
+                     - datetime(2025, 10, 20, tzinfo=timezone.utc)).total_seconds() * 1000)
+        klines = [[k[0] + shift, *k[1:6], k[6] + shift, *k[7:]] for k in mock_klines_response[:4]]
+
+        backfiller._write_parquet(backfiller._klines_to_dataframe(klines[::-1]), "SOLUSDT")
+
+        october = pd.read_parquet(temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet")
+        november = pd.read_parquet(temp_dir / "SOLUSDT" / "year=2025" / "month=11" / "data.parquet")
+        assert [t.strftime("%d %H:%M") for t in october["open_time"]] == ["31 23:58", "31 23:59"]
+        assert [t.strftime("%d %H:%M") for t in november["open_time"]] == ["01 00:00", "01 00:01"]
+
+    def test_write_parquet_folds_legacy_day_files(self, temp_dir, mock_klines_response):
+        """Test that day=DD files from the daily layout are merged into the monthly file."""
+        backfiller = BinanceBackfiller(temp_dir)
+        legacy_dir = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "day=20"
+        legacy_dir.mkdir(parents=True)
+        legacy = backfiller._klines_to_dataframe(mock_klines_response[:10])
+        legacy.to_parquet(legacy_dir / "data.parquet", index=False)
+
+        day = datetime(2025, 10, 20, tzinfo=timezone.utc)
+        assert len(backfiller._get_existing_timestamps("SOLUSDT", day)) == 10
+
+        backfiller._write_parquet(backfiller._klines_to_dataframe(mock_klines_response[5:20]), "SOLUSDT")
+
+        assert not legacy_dir.exists()
+        df = pd.read_parquet(temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet")
+        assert len(df) == 20
+        assert df["open_time"].is_monotonic_increasing
+
+    def test_write_parquet_merges_existing_day(self, temp_dir, mock_klines_response):
+        """Test that rewrites of a day keep one row per open_time, newest wins, in order."""
+        backfiller = BinanceBackfiller(temp_dir)
+        backfiller._write_parquet(backfiller._klines_to_dataframe(mock_klines_response[10:20]), "SOLUSDT")
+
+        # Overlapping batch with revised closes, delivered out of order
+        revised = [list(k) for k in mock_klines_response[15:25]]
+        for k in revised:
+            k[4] = "200.0"
+        backfiller._write_parquet(backfiller._klines_to_dataframe(revised[::-1]), "SOLUSDT")
+
+        path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet"
+        df = pd.read_parquet(path)
+        assert len(df) == 15
+        assert df["open_time"].is_monotonic_increasing
+        assert df["close"].tolist() == [100.5] * 5 + [200.0] * 10
+
+    def test_existing_timestamps_cached_as_epoch_ms(self, temp_dir, mock_klines_response):
+        """Test that existing open times are read once per month as sorted epoch ms."""
+        backfiller = BinanceBackfiller(temp_dir)
+        backfiller._write_parquet(backfiller._klines_to_dataframe(mock_klines_response[:1440]), "SOLUSDT")
+        day = datetime(2025, 10, 20, tzinfo=timezone.utc)
+
+        with patch("tools.backfill_binance.pq.read_table", wraps=pq.read_table) as read_table:
+            first = backfiller._get_existing_timestamps("SOLUSDT", day)
+            second = backfiller._get_existing_timestamps("SOLUSDT", day)
+
+            third = backfiller._get_existing_timestamps("SOLUSDT", day + timedelta(days=1))
+
+        assert read_table.call_count == 1
+        assert second.tolist() == first.tolist()
+        assert len(third) == 0
+        assert first.dtype == "int64"
+        assert first[0] == mock_klines_response[0][0]
+        assert len(first) == 1440
+        assert len(backfiller._get_existing_timestamps("SOLUSDT", day + timedelta(days=5))) == 0
+
+        # Rewriting the partition changes its file signature and forces a re-read
+        backfiller._write_parquet(backfiller._klines_to_dataframe(mock_klines_response[:1]), "SOLUSDT")
+        path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet"
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        with patch("tools.backfill_binance.pq.read_table", wraps=pq.read_table) as read_table:
+            assert len(backfiller._get_existing_timestamps("SOLUSDT", day)) == 1440
+        assert read_table.call_count == 1
+
+    @patch("tools.backfill_binance.BinanceBackfiller._fetch_klines")
+    def test_day_windows_fetched_concurrently(self, mock_fetch, temp_dir, mock_klines_response):
+        """Test that day windows are fetched in parallel and written in order."""
+        barrier = threading.Barrier(2, timeout=5)
+        by_day = {kl[0]: mock_klines_response[i:i + 1440]
+                  for i, kl in enumerate(mock_klines_response) if i % 1440 == 0}
+
+        def fake_fetch(symbol, start_time, end_time):
+            # Only returns if both day windows are in flight at once
+            barrier.wait()
+            return by_day[start_time]
+
+        mock_fetch.side_effect = fake_fetch
+
+        backfiller = BinanceBackfiller(temp_dir)
+        end_date = datetime(2025, 10, 22, tzinfo=timezone.utc)
+        rows = backfiller.backfill_symbol("SOLUSDT", lookback_days=2, end_date=end_date)
+
+        assert rows == 2880
+        path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet"
+        assert pq.ParquetFile(path).metadata.num_row_groups == 2
+        assert len(pd.read_parquet(path)) == 2880
+
     @patch("tools.backfill_binance.BinanceBackfiller._fetch_klines")
-    def test_rate_limit_handling(self, mock_fetch, temp_dir):
+    def test_month_file_written_once_per_month(self, mock_fetch, temp_dir):
+        """Test that a backfill across a month boundary writes each month file once."""
+        def fake_fetch(symbol, start_time, end_time):
+            # Day windows share their boundary kline, as Binance's endTime is inclusive
+            return [
+                [t, "100.0", "101.0", "99.0", "100.5", "1.0", t + 59_999, "100.5", 1, "0.5", "50.25", "0"]
+                for t in range(start_time, end_time + 1, 3_600_000)
+            ]
+
+        mock_fetch.side_effect = fake_fetch
+        backfiller = BinanceBackfiller(temp_dir)
+        end_date = datetime(2025, 11, 3, tzinfo=timezone.utc)
+
+        with patch.object(backfiller, "_write_month_file", wraps=backfiller._write_month_file) as write:
+            rows = backfiller.backfill_symbol("SOLUSDT", lookback_days=5, end_date=end_date)
+
+        assert sorted(c.args[1].parent.name for c in write.call_args_list) == ["month=10", "month=11"]
+        # Oct 29 - Nov 2, plus the inclusive Nov 3 00:00 boundary kline
+        assert rows == 5 * 24 + 1
+        october = pd.read_parquet(temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet")
+        november = pd.read_parquet(temp_dir / "SOLUSDT" / "year=2025" / "month=11" / "data.parquet")
+        assert len(october) == 3 * 24
+        assert len(november) == 2 * 24 + 1
+        assert pq.ParquetFile(temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet").metadata.num_row_groups == 3
+
+    def test_write_parquet_skips_month_with_unreadable_files(self, temp_dir, mock_klines_response):
+        """Test that a month whose existing files cannot be read is left untouched."""
+        backfiller = BinanceBackfiller(temp_dir)
+        backfiller._write_parquet(backfiller._klines_to_dataframe(mock_klines_response[:1440]), "SOLUSDT")
+        month_dir = temp_dir / "SOLUSDT" / "year=2025" / "month=10"
+        legacy_dir = month_dir / "day=21"
+        legacy_dir.mkdir()
+        (legacy_dir / "data.parquet").write_bytes(b"not parquet")
+
+        written = backfiller._write_parquet(
+            backfiller._klines_to_dataframe(mock_klines_response[2880:2890]), "SOLUSDT"
+        )
+
+        assert written == 0
+        assert len(pd.read_parquet(month_dir / "data.parquet")) == 1440
+        assert (legacy_dir / "data.parquet").exists()
+
+    @patch("tools.backfill_binance.BinanceBackfiller._fetch_klines")
+    def test_day_windows_are_utc_midnights(self, mock_fetch, temp_dir):
+        """Test that fetch windows cover whole UTC days from the start date's midnight."""
+        mock_fetch.return_value = []
+
+        backfiller = BinanceBackfiller(temp_dir)
+        end_date = datetime(2025, 10, 22, 12, 30, tzinfo=timezone.utc)
+        backfiller.backfill_symbol("SOLUSDT", lookback_days=2, end_date=end_date)
+
+        midnight = int(datetime(2025, 10, 20, tzinfo=timezone.utc).timestamp() * 1000)
+        windows = sorted(c.args[1:] for c in mock_fetch.call_args_list)
+        assert windows == [
+            (midnight + i * 86_400_000, midnight + (i + 1) * 86_400_000) for i in range(3)
+        ]
+
+    @patch("tools.backfill_binance.time.sleep")
+    def test_rate_limit_handling(self, mock_sleep, temp_dir):
         """Test graceful handling of rate limit errors."""
         backfiller = BinanceBackfiller(temp_dir)
 
@@ -152,14 +357,31 @@ class TestBinanceBackfiller:
             # First call returns rate limit, second succeeds
             mock_get.side_effect = [
                 mock_response,
-                Mock(status_code=200, json=lambda: mock_klines)
+                Mock(status_code=200, content=json.dumps(mock_klines).encode(), headers={})
             ]
 
             result = backfiller._fetch_klines("SOLUSDT", 1697760000000, 1697763600000)
 
-            # Verify retry occurred
+            # Verify retry occurred after exactly Retry-After seconds
             assert mock_get.call_count == 2
             assert result == mock_klines
+            mock_sleep.assert_called_once_with(1.0)
+
+    @patch("tools.backfill_binance._REQUEST_PACER")
+    @patch("tools.backfill_binance.time.sleep")
+    def test_rate_limit_headers_pause_all_threads(self, mock_sleep, mock_pacer, temp_dir):
+        """Test that 418 Retry-After and a near-limit weight header pause the shared pacer."""
+        backfiller = BinanceBackfiller(temp_dir)
+        banned = Mock(status_code=418, headers={"Retry-After": "7"})
+        near_limit = Mock(status_code=200, content=b"[]", headers={"X-MBX-USED-WEIGHT-1M": "1150"})
+
+        with patch.object(backfiller.session, "get", side_effect=[banned, near_limit]):
+            assert backfiller._fetch_klines("SOLUSDT", 0, 60_000) == []
+
+        mock_sleep.assert_called_once_with(7.0)
+        pauses = [c.args[0] for c in mock_pacer.pause.call_args_list]
+        assert pauses[0] == 7.0
+        assert len(pauses) == 2 and 0 < pauses[1] <= 60
 
     @patch("tools.backfill_binance.BinanceBackfiller._fetch_klines")
     def test_data_schema_validation(self, mock_fetch, temp_dir, mock_klines_response):
@@ -171,7 +393,7 @@ class TestBinanceBackfiller:
         backfiller.backfill_symbol("SOLUSDT", lookback_days=1, end_date=date)
 
         # Read back and verify schema
-        parquet_path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "day=20" / "data.parquet"
+        parquet_path = temp_dir / "SOLUSDT" / "year=2025" / "month=10" / "data.parquet"
         df = pd.read_parquet(parquet_path)
 
         expected_columns = {
@@ -215,7 +437,16 @@ class TestBackfillFunction:
     def test_error_handling_multiple_symbols(self, mock_backfill, temp_dir):
         """Test error handling when backfilling multiple symbols."""
         # Mock: first symbol succeeds, second fails, third succeeds
-        mock_backfill.side_effect = [1000, Exception("API error"), 1500]
+        # (keyed by symbol since symbols run concurrently)
+        outcomes = {"SOLUSDT": 1000, "BTCUSDT": Exception("API error"), "ETHUSDT": 1500}
+
+        def fake_backfill(symbol, lookback_days):
+            outcome = outcomes[symbol]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        mock_backfill.side_effect = fake_backfill
 
         symbols = ["SOLUSDT", "BTCUSDT", "ETHUSDT"]
         results = backfill_binance(symbols, lookback_days=7, base_dir=temp_dir)
@@ -225,6 +456,24 @@ class TestBackfillFunction:
         assert results["BTCUSDT"] == 0  # Error results in 0 rows
         assert results["ETHUSDT"] == 1500
 
+    @patch("tools.backfill_binance.BinanceBackfiller.backfill_symbol")
+    def test_multiple_symbols_run_concurrently(self, mock_backfill, temp_dir):
+        """Test that symbols are backfilled in parallel and keep input order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_backfill(symbol, lookback_days):
+            # Only returns if all three symbols are in flight at once
+            barrier.wait()
+            return len(symbol)
+
+        mock_backfill.side_effect = fake_backfill
+
+        symbols = ["SOLUSDT", "BTCUSDT", "DOGEUSDT"]
+        results = backfill_binance(symbols, lookback_days=1, base_dir=temp_dir, max_workers=3)
+
+        assert list(results) == symbols
+        assert results == {"SOLUSDT": 7, "BTCUSDT": 7, "DOGEUSDT": 8}
+
     @patch("tools.backfill_binance.BinanceBackfiller.backfill_symbol")
     def test_summary_output(self, mock_backfill, temp_dir, capsys):
         """Test that summary information is logged."""
@@ -255,7 +504,7 @@ def test_exponential_backoff(temp_dir, mock_session):
     mock_session.get.side_effect = [
         Exception("Connection error"),
         Exception("Connection error"),
-        Mock(status_code=200, json=lambda: [])
+        Mock(status_code=200, content=b"[]", headers={})
     ]
 
     with patch("time.sleep") as mock_sleep:
@@ -267,3 +516,65 @@ def test_exponential_backoff(temp_dir, mock_session):
         # Second retry: 2^1 = 2 seconds
         assert mock_sleep.call_args_list[0][0][0] == 1
         assert mock_sleep.call_args_list[1][0][0] == 2
+
+
+def test_binance_rate_limit_headers():
+    """Test parsing of Binance used-weight and Retry-After headers."""
+    from tools.common import binance_retry_after, binance_used_weight, binance_weight_pause
+
+    assert binance_used_weight({"X-MBX-USED-WEIGHT-1M": "42"}) == 42
+    assert binance_used_weight({}) is None
+
+    # Below 90% of 1200: no pause; above: wait for the next UTC minute
+    assert binance_weight_pause({"X-MBX-USED-WEIGHT-1M": "1080"}, now=120.0) == 0.0
+    assert binance_weight_pause({"X-MBX-USED-WEIGHT-1M": "1081"}, now=125.0) == 55.0
+
+    assert binance_retry_after({"Retry-After": "3"}, default=60) == 3.0
+    assert binance_retry_after({}, default=60) == 60
+
+
+def test_request_pacer_spacing_and_pause():
+    """Test that the shared pacer spaces requests and honours pauses."""
+    from tools.backfill_binance import _REQUEST_PACER, _RequestPacer
+    from tools.common import BINANCE_REQUESTS_PER_MINUTE
+
+    # Default pace uses the whole weight budget rather than a fixed 10 req/s
+    assert _REQUEST_PACER.interval == pytest.approx(60.0 / BINANCE_REQUESTS_PER_MINUTE)
+
+    pacer = _RequestPacer(0.02)
+    start = time.monotonic()
+    for _ in range(3):
+        pacer.wait()
+    assert time.monotonic() - start >= 0.04
+
+    pacer.pause(0.1)
+    start = time.monotonic()
+    pacer.wait()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_closed_kline_windows_served_from_disk_cache(temp_dir):
+    """Test that closed windows are cached on disk and open windows always refetch."""
+    backfiller = BinanceBackfiller(temp_dir)
+    klines = [[1697760000000, "1", "2", "0.5", "1.5", "10", 1697760059999, "15", 3, "5", "7", "0"]]
+    closed = (1697760000000, 1697760000000 + 86_400_000)
+    now_ms = int(time.time() * 1000)
+    still_open = (now_ms - 60_000, now_ms + 60_000)
+
+    with patch.object(backfiller, "_fetch_klines", return_value=klines) as mock_fetch:
+        assert backfiller._fetch_klines_cached("SOLUSDT", *closed) == klines
+        assert backfiller._fetch_klines_cached("SOLUSDT", *closed) == klines
+        assert mock_fetch.call_count == 1
+
+        backfiller._fetch_klines_cached("SOLUSDT", *still_open)
+        backfiller._fetch_klines_cached("SOLUSDT", *still_open)
+        assert mock_fetch.call_count == 3
+
+    cached = list((Path(temp_dir) / ".cache").iterdir())
+    assert [p.suffixes for p in cached] == [[".json", ".gz"]]
+
+    # A restarted backfiller reads the cache without touching the API
+    restarted = BinanceBackfiller(temp_dir)
+    with patch.object(restarted, "_fetch_klines") as mock_fetch:
+        assert restarted._fetch_klines_cached("SOLUSDT", *closed) == klines
+        mock_fetch.assert_not_called()
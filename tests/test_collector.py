@@ -3,7 +3,6 @@ import os
 import time
 from datetime import datetime, timezone
 
-import duckdb
 import pandas as pd
 
 from collector.collector import parse_event, RotatingJSONLWriter
@@ -36,6 +35,23 @@ def test_parse_event_trade_and_quote():
     assert abs(q["ask"] - 0.2502) < 1e-9
     assert q["trade_id"] is None  # Quotes don't have trade_id
 
+def test_parse_event_dispatch_variants():
+    # Raw (non-combined) payload, seller-maker trade
+    t = parse_event({"e": "trade", "E": 1699999999000, "s": "adausdt", "p": "0.25", "q": "4", "t": 7, "m": True})
+    assert t["stream"] == "trade"
+    assert t["symbol"] == "ADAUSDT"
+    assert t["side"] == "sell"
+    assert t["ts_event"] == 1699999999000
+
+    # Unknown stream falls back to the payload event type with empty fields
+    d = parse_event({"stream": "adausdt@depth", "data": {"e": "depthUpdate", "T": 1699999999100, "s": "ADAUSDT"}})
+    assert d["stream"] == "depthUpdate"
+    assert d["ts_event"] == 1699999999100
+    assert d["price"] is None and d["bid"] is None and d["trade_id"] is None
+
+    # Malformed payloads are logged and skipped
+    assert parse_event({"stream": "adausdt@trade", "data": {"s": "ADAUSDT", "p": "bad"}}) is None
+
 def test_rotating_writer(tmp_path):
     base = tmp_path / "raw" / "binance"
     os.makedirs(base, exist_ok=True)
@@ -50,9 +66,46 @@ def test_rotating_writer(tmp_path):
     # Ensure two parts created
     date_str = datetime.fromtimestamp(now, tz=timezone.utc).strftime("%Y-%m-%d")
     d = base / "ADAUSDT" / date_str
-    files = list(sorted([f for f in os.listdir(d) if f.endswith(".jsonl")]))
+    files = sorted(entry.name for entry in os.scandir(d) if entry.name.endswith(".jsonl"))
     assert len(files) >= 2
 
+def test_rotating_writer_jsonl_roundtrip(tmp_path):
+    base = tmp_path / "raw" / "binance"
+    w = RotatingJSONLWriter(base_dir=str(base), symbol="ADAUSDT", interval_sec=60)
+
+    now = time.time()
+    records = [
+        {"symbol": "ADAUSDT", "price": 0.25, "qty": 10.0, "side": "buy", "bid": None, "trade_id": 1},
+        {"symbol": "ADAUSDT", "note": "ünïcode", "trade_id": 2},
+    ]
+    for r in records:
+        w.write_obj(r, now_epoch=now)
+    w.close()
+
+    date_str = datetime.fromtimestamp(now, tz=timezone.utc).strftime("%Y-%m-%d")
+    d = base / "ADAUSDT" / date_str
+    (part,) = [entry.name for entry in os.scandir(d) if entry.name.endswith(".jsonl")]
+    with open(d / part, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+def test_rotating_writer_creates_day_dir_once(tmp_path, monkeypatch):
+    import collector.collector as collector_mod
+
+    base = tmp_path / "raw" / "binance"
+    calls = []
+    real_ensure_dir = collector_mod.ensure_dir
+    monkeypatch.setattr(collector_mod, "ensure_dir", lambda p: (calls.append(p), real_ensure_dir(p)))
+
+    w = RotatingJSONLWriter(base_dir=str(base), symbol="ADAUSDT", interval_sec=1)
+    now = time.time()
+    for i in range(3):
+        w.write_obj({"a": i}, now_epoch=now + i * 1.1)  # rotates every write
+    w.close()
+
+    # Cross-midnight rotations could add a second directory, never a repeat
+    assert len(calls) == len(set(calls)) >= 1
+
 def _write_mock_raw(tmp_base: str, exchange: str, symbol: str, date: str):
     """Create a small raw dataset with trades and quotes spanning 3 seconds."""
     out_dir = os.path.join(tmp_base, "raw", exchange, symbol, date)
@@ -71,7 +124,7 @@ def _write_mock_raw(tmp_base: str, exchange: str, symbol: str, date: str):
         for r in rows:
             f.write(json.dumps(r) + "\n")
 
-def test_transformer_integration(tmp_path):
+def test_transformer_integration(tmp_path, duckdb_memory):
     # Create temp config pointing to tmp_path
     cfg_path = tmp_path / "config.yml"
     cfg_text = f"""
@@ -106,11 +159,7 @@ transformer:
     # Read Parquet partitions with DuckDB
     y, m, d = date.split("-")
     pattern = os.path.join(out_root, f"year={int(y)}", f"month={int(m)}", f"day={int(d)}", "*.parquet")
-    con = duckdb.connect()
-    try:
-        df = con.execute(f"SELECT * FROM read_parquet('{pattern.replace(chr(92), chr(92)*2)}') ORDER BY window_start").fetch_df()
-    finally:
-        con.close()
+    df = duckdb_memory.execute(f"SELECT * FROM read_parquet('{pattern.replace(chr(92), chr(92)*2)}') ORDER BY window_start").fetch_df()
 
     # Expect rows covering from t0 to last event second (>= 3 seconds)
     assert not df.empty
@@ -125,3 +174,25 @@ transformer:
     # Volumes
     assert first_row["volume_base"] > 0
     assert first_row["volume_quote"] > 0
+
+
+def test_rotating_writer_scans_dir_once_per_day(tmp_path, monkeypatch):
+    import collector.collector as collector_mod
+
+    base = tmp_path / "raw" / "binance"
+    now = 1761044400.0  # 2025-10-21 11:00 UTC, clear of a day rollover
+    d = base / "ADAUSDT" / "2025-10-21"
+    os.makedirs(d)
+    (d / "part_007.jsonl").write_text("")
+
+    scans = []
+    real_scandir = collector_mod.os.scandir
+    monkeypatch.setattr(collector_mod.os, "scandir", lambda p: (scans.append(p), real_scandir(p))[1])
+
+    w = RotatingJSONLWriter(base_dir=str(base), symbol="ADAUSDT", interval_sec=1)
+    for i in range(5):
+        w.write_obj({"i": i}, now_epoch=now + i * 1.1)
+    w.close()
+
+    assert len(scans) == 1, "Rotations should not rescan the directory"
+    assert w.part_index == 12, "Numbering should continue after existing parts"
@@ -0,0 +1,132 @@
+"""
+Tests for shared helpers in tools/common.py.
+"""
+
+import os
+import sys
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from unittest.mock import patch
+
+from tools import common
+from tools.common import safe_count_parquet
+
+
+def write_rows(path, n):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.table({"x": list(range(n))}), path)
+
+
+def test_safe_count_parquet_caches_unchanged_files(tmp_path):
+    """Test that row counts are reused until a file's mtime or size changes."""
+    common._ROWCOUNT_CACHE.clear()
+    write_rows(tmp_path / "a" / "one.parquet", 3)
+    write_rows(tmp_path / "two.parquet", 2)
+    pattern = (tmp_path / "**" / "*.parquet").as_posix()
+
+    assert safe_count_parquet(pattern) == 5
+
+    # Unchanged files are answered from the cache without touching DuckDB
+    with patch("tools.common._get_duck") as get_duck:
+        assert safe_count_parquet(pattern) == 5
+    get_duck.assert_not_called()
+
+    # A rewritten file is rescanned, the other still comes from the cache
+    write_rows(tmp_path / "two.parquet", 10)
+    st = os.stat(tmp_path / "two.parquet")
+    os.utime(tmp_path / "two.parquet", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert safe_count_parquet(pattern) == 13
+
+
+def test_safe_count_parquet_no_files(tmp_path):
+    """Test that an empty glob counts as zero rows."""
+    assert safe_count_parquet((tmp_path / "*.parquet").as_posix()) == 0
+
+
+def test_safe_count_parquet_reuses_one_connection(tmp_path):
+    """Test that counts share one lazily opened DuckDB connection."""
+    common._ROWCOUNT_CACHE.clear()
+    write_rows(tmp_path / "one.parquet", 4)
+    pattern = (tmp_path / "*.parquet").as_posix()
+
+    conn = common._get_duck()
+    with patch("tools.common.duckdb.connect") as connect:
+        assert safe_count_parquet(pattern) == 4
+    connect.assert_not_called()
+    assert common._get_duck() is conn
+    assert conn.execute("SELECT current_setting('enable_object_cache')").fetchone()[0] is True
+
+
+def test_load_config_cached_until_file_changes(tmp_path):
+    """Test that config.yml is parsed once while unchanged and callers get copies."""
+    cfg_path = tmp_path / "config.yml"
+    cfg_path.write_text("general:\n  base_path: /data\n", encoding="utf-8")
+    common._parse_yaml.cache_clear()
+
+    with patch("tools.common.yaml.load", wraps=common.yaml.load) as yaml_load:
+        first = common.load_config(str(cfg_path))
+        first["general"]["base_path"] = "/mutated"
+        second = common.load_config(str(cfg_path))
+    assert yaml_load.call_count == 1
+    assert second["general"]["base_path"] == "/data"
+
+    cfg_path.write_text("general:\n  base_path: /other\n", encoding="utf-8")
+    st = os.stat(cfg_path)
+    os.utime(cfg_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert common.load_config(str(cfg_path))["general"]["base_path"] == "/other"
+
+
+def test_setup_logging_writes_plain_file_log(tmp_path):
+    """Test that the file sink is enqueued and written without color markup."""
+    config = {"general": {"base_path": str(tmp_path), "log_level": "INFO"}}
+    try:
+        common.setup_logging("unit", config)
+        common.logger.info("plain line")
+        common.logger.complete()
+
+        text = (tmp_path / "logs" / "unit.log").read_text(encoding="utf-8")
+        assert "| INFO     | tests.test_common:" in text
+        assert text.rstrip().endswith("- plain line")
+        assert "\x1b[" not in text and "<green>" not in text
+    finally:
+        common.logger.remove()
+        common.logger.add(sys.stderr)
+
+
+def test_glob_root():
+    """Test that the watch root is the pattern's wildcard-free directory prefix."""
+    assert common._glob_root("D:/lake/parquet/**/*.parquet") == "D:/lake/parquet"
+    assert common._glob_root("/lake/sym=SOL*/x.parquet") == "/lake"
+    assert common._glob_root("*.parquet") == "."
+
+
+@pytest.mark.parametrize("use_watchdog", [False, True])
+def test_wait_for_parquet_files(tmp_path, use_watchdog):
+    """Test that waiting returns once a matching file arrives, and times out otherwise."""
+    if use_watchdog:
+        pytest.importorskip("watchdog")
+    pattern = (tmp_path / "**" / "*.parquet").as_posix()
+
+    with patch.object(common, "WATCHDOG_AVAILABLE", use_watchdog):
+        assert common.wait_for_parquet_files(pattern, timeout=0.2, check_interval=0.05) is False
+
+        timer = threading.Timer(0.1, write_rows, args=(tmp_path / "day=01" / "a.parquet", 1))
+        timer.start()
+        try:
+            assert common.wait_for_parquet_files(pattern, timeout=5, check_interval=0.05) is True
+        finally:
+            timer.join()
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_json_loads_decodes_bytes(use_orjson):
+    """Test that REST payloads decode the same with and without orjson."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    payload = b'[[1697760000000, "100.5", "101.0"], {"code": -1121}]'
+
+    with patch.object(common, "ORJSON_AVAILABLE", use_orjson):
+        assert common.json_loads(payload) == [[1697760000000, "100.5", "101.0"], {"code": -1121}]
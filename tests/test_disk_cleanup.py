@@ -0,0 +1,155 @@
+"""
+Tests for raw JSONL retention cleanup (tools/disk_cleanup.py).
+"""
+
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from loguru import logger
+
+from tools.disk_cleanup import _partition_key, check_disk_usage, cleanup_old_raw_files
+
+
+def make_file(path, size=10, age_days=0.0):
+    """Create a file of `size` bytes whose mtime is `age_days` in the past."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_cleanup_deletes_only_expired_jsonl(tmp_path):
+    """Test that only *.jsonl files past retention are removed, recursively."""
+    raw = tmp_path / "raw" / "binance" / "SOLUSDT" / "2025-10-20"
+    old = make_file(raw / "part-0.jsonl", size=100, age_days=10)
+    fresh = make_file(raw / "part-1.jsonl", age_days=1)
+    other = make_file(raw / "notes.txt", age_days=10)
+    hidden = make_file(tmp_path / "raw" / ".staging" / "part-2.jsonl", age_days=10)
+
+    stats = cleanup_old_raw_files(str(tmp_path), retention_days=7)
+
+    assert stats["deleted_count"] == 1
+    assert stats["deleted_size_gb"] == 100 / 1e9
+    assert stats["kept_count"] == 1
+    assert stats["error_count"] == 0
+    assert not old.exists()
+    assert fresh.exists() and other.exists() and hidden.exists()
+
+
+def test_cleanup_dry_run_keeps_files(tmp_path):
+    """Test that a dry run reports expired files without deleting them."""
+    old = make_file(tmp_path / "raw" / "a" / "b" / "part-0.jsonl", age_days=30)
+
+    stats = cleanup_old_raw_files(str(tmp_path), retention_days=7, dry_run=True)
+
+    assert stats["deleted_count"] == 1
+    assert stats["dry_run"] is True
+    assert old.exists()
+
+
+def test_cleanup_missing_raw_dir(tmp_path):
+    """Test that a lake without a raw/ directory is a no-op."""
+    stats = cleanup_old_raw_files(str(tmp_path), retention_days=7)
+
+    assert stats["deleted_count"] == 0
+    assert stats["kept_count"] == 0
+
+
+def test_cleanup_deletes_in_worker_threads_and_counts_errors(tmp_path):
+    """Test that deletes run on the worker pool and per-file failures are tallied."""
+    raw = tmp_path / "raw"
+    paths = [make_file(raw / f"d{i}" / "part.jsonl", size=5, age_days=10) for i in range(6)]
+    denied = str(paths[0])
+    threads = set()
+    real_remove = os.remove
+
+    def fake_remove(path):
+        threads.add(threading.current_thread().name)
+        if path == denied:
+            raise PermissionError("read-only")
+        real_remove(path)
+
+    with patch("tools.disk_cleanup.os.remove", side_effect=fake_remove):
+        stats = cleanup_old_raw_files(str(tmp_path), retention_days=7, workers=3)
+
+    assert stats["deleted_count"] == 5
+    assert stats["deleted_size_gb"] == 25 / 1e9
+    assert stats["error_count"] == 1
+    assert all(name.startswith("cleanup") for name in threads)
+    assert paths[0].exists() and not any(p.exists() for p in paths[1:])
+
+
+def test_cleanup_dry_run_debug_log_reports_age(tmp_path):
+    """Test that the lazily formatted dry-run line carries the file's age in days."""
+    make_file(tmp_path / "raw" / "part-0.jsonl", size=2_500_000, age_days=9.5)
+    messages = []
+    sink_id = logger.add(lambda msg: messages.append(msg.record["message"]), level="DEBUG")
+    try:
+        cleanup_old_raw_files(str(tmp_path), retention_days=7, dry_run=True)
+    finally:
+        logger.remove(sink_id)
+
+    assert any(m.startswith("[DRY RUN] Would delete:") and m.endswith("(2.50 MB, age: 9 days)")
+               for m in messages)
+
+
+def test_check_disk_usage_uses_portable_disk_usage(tmp_path):
+    """Test that disk stats come from shutil.disk_usage in GB and percent."""
+    with patch("tools.disk_cleanup.shutil.disk_usage", return_value=(200e9, 170e9, 30e9)) as usage:
+        stats = check_disk_usage(str(tmp_path))
+
+    usage.assert_called_once_with(str(tmp_path))
+    assert stats == {"total_gb": 200.0, "used_gb": 170.0, "free_gb": 30.0, "usage_percent": 85.0}
+
+
+def test_cleanup_removes_only_emptied_directories(tmp_path):
+    """Test that emptied partition dirs are pruned upward, leaving raw/ and unrelated dirs."""
+    raw = tmp_path / "raw"
+    make_file(raw / "binance" / "SOLUSDT" / "date=2025-01-01" / "part.jsonl", age_days=30)
+    kept = make_file(raw / "binance" / "BTCUSDT" / "date=2025-01-01" / "part.jsonl", age_days=1)
+    untouched_empty = raw / "binance" / "ETHUSDT"
+    untouched_empty.mkdir(parents=True)
+
+    cleanup_old_raw_files(str(tmp_path), retention_days=7)
+
+    assert not (raw / "binance" / "SOLUSDT").exists()
+    assert kept.exists()
+    assert untouched_empty.exists()
+    assert raw.is_dir()
+
+
+def test_partition_key_parses_day_and_hive_dirs():
+    """Test that date partition names map to (year, month, day) prefixes."""
+    assert _partition_key("2025-10-20", ()) == (2025, 10, 20)
+    assert _partition_key("date=2025-10-20", (2025,)) == (2025, 10, 20)
+    assert _partition_key("year=2025", ()) == (2025,)
+    assert _partition_key("month=03", (2025,)) == (2025, 3)
+    assert _partition_key("day=07", (2025, 3)) == (2025, 3, 7)
+    assert _partition_key("month=03", ()) is None  # not under a year partition
+    assert _partition_key("SOLUSDT", ()) is None
+
+
+def test_cleanup_prunes_partitions_after_cutoff(tmp_path):
+    """Test that newer day partitions are never listed, while older ones still are."""
+    raw = tmp_path / "raw" / "binance" / "SOLUSDT"
+    old = make_file(raw / "2020-01-01" / "part_0.jsonl", age_days=30)
+    make_file(raw / "2999-01-01" / "part_0.jsonl", age_days=30)
+    make_file(raw / "year=2999" / "month=01" / "part_0.jsonl", age_days=30)
+
+    listed = []
+    real_scandir = os.scandir
+
+    def spy_scandir(path):
+        listed.append(os.path.basename(path))
+        return real_scandir(path)
+
+    with patch("tools.disk_cleanup.os.scandir", side_effect=spy_scandir):
+        stats = cleanup_old_raw_files(str(tmp_path), retention_days=7)
+
+    assert stats["deleted_count"] == 1
+    assert not old.exists()
+    assert "2999-01-01" not in listed and "year=2999" not in listed
+    assert "2020-01-01" in listed
@@ -6,32 +6,113 @@ These tests ensure the system is production-ready for quantitative analysis.
 
 import pytest
 import os
+import sys
 from pathlib import Path
 import duckdb
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from datetime import datetime, timezone
 from tools.common import load_config
 
 
+@pytest.mark.readonly
 class TestSystemIntegrity:
     """Test overall system integrity and readiness."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def config(self):
         """Load configuration."""
         return load_config("config.yml")
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def base_path(self, config):
         """Get base path from config."""
         return Path(config["general"]["base_path"])
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def duckdb_conn(self):
-        """Create DuckDB connection."""
-        conn = duckdb.connect(":memory:")
+        """Create one DuckDB connection shared by all tests (read-only use)."""
+        # One worker thread: these are small scans and the pool startup dominates
+        conn = duckdb.connect(":memory:", config={"threads": "1", "memory_limit": "512MB"})
+        # Keep Parquet footers cached across the queries on the shared view
+        conn.execute("SET enable_object_cache=true")
         yield conn
         conn.close()
 
+    @pytest.fixture(scope="session")
+    def realtime_glob(self, base_path):
+        """DuckDB glob for the real-time 1s bar Parquet files."""
+        return (base_path / "parquet" / "binance" / "**" / "*.parquet").as_posix()
+
+    @pytest.fixture(scope="session")
+    def macro_glob(self, base_path):
+        """DuckDB glob for the macro minute Parquet files."""
+        return (base_path / "macro" / "minute" / "**" / "*.parquet").as_posix()
+
+    @pytest.fixture(scope="session")
+    def backfill_files(self, base_path):
+        """List every backfill Parquet file with a single directory walk."""
+        backfill_dir = base_path / "backfill" / "binance"
+        return sorted(p.as_posix() for p in backfill_dir.rglob("*.parquet"))
+
+    @pytest.fixture(scope="session")
+    def solusdt_files(self, base_path, backfill_files):
+        """SOLUSDT backfill files (repr() is a DuckDB list literal for read_parquet)."""
+        prefix = (base_path / "backfill" / "binance" / "SOLUSDT").as_posix() + "/"
+        return [f for f in backfill_files if f.startswith(prefix)]
+
+    @pytest.fixture(scope="session")
+    def backfill_view(self, solusdt_files, duckdb_conn):
+        """Register the SOLUSDT backfill Parquet files once as view `backfill`."""
+        duckdb_conn.execute(f"""
+        CREATE OR REPLACE VIEW backfill AS
+        SELECT * FROM read_parquet({solusdt_files!r})
+        """)
+        return "backfill"
+
+    @pytest.fixture(scope="session")
+    def backfill_stats(self, backfill_view, duckdb_conn):
+        """Compute every backfill aggregate the tests need in a single scan."""
+        query = f"""
+        SELECT
+            COUNT(DISTINCT open_time) AS unique_timestamps,
+            COUNT(*) FILTER (WHERE volume > 0) AS rows_with_volume,
+            AVG(trades) AS avg_trades,
+            MAX(trades) AS max_trades
+        FROM {backfill_view}
+        """
+        cursor = duckdb_conn.execute(query)
+        names = [col[0] for col in cursor.description]
+        return dict(zip(names, cursor.fetchone()))
+
+    @pytest.fixture(scope="session")
+    def backfill_dataset(self, solusdt_files):
+        """SOLUSDT backfill files as a pyarrow dataset for row-predicate counts."""
+        return ds.dataset(solusdt_files, format="parquet")
+
+    @pytest.fixture(scope="session")
+    def backfill_footer(self, solusdt_files):
+        """Row count and open_time range from Parquet footers (no data pages read)."""
+        total_rows = 0
+        mins, maxs = [], []
+        for path in solusdt_files:
+            metadata = pq.ParquetFile(path).metadata
+            total_rows += metadata.num_rows
+            col_idx = metadata.schema.to_arrow_schema().get_field_index("open_time")
+            for rg in range(metadata.num_row_groups):
+                stats = metadata.row_group(rg).column(col_idx).statistics
+                if stats is None or not stats.has_min_max:
+                    pytest.fail(f"No open_time statistics in {path}")
+                mins.append(stats.min)
+                maxs.append(stats.max)
+
+        return {
+            "total_rows": total_rows,
+            "earliest": min(mins) if mins else None,
+            "latest": max(maxs) if maxs else None,
+        }
+
     def test_backfill_directory_exists(self, base_path):
         """Test that backfill directory structure exists."""
         backfill_dir = base_path / "backfill" / "binance"
@@ -47,18 +128,15 @@ class TestSystemIntegrity:
         macro_dir = base_path / "macro" / "minute"
         assert macro_dir.exists(), "Macro data directory does not exist"
 
-    def test_backfill_parquet_files_exist(self, base_path):
+    def test_backfill_parquet_files_exist(self, backfill_files):
         """Test that backfill Parquet files exist."""
-        backfill_dir = base_path / "backfill" / "binance"
-        parquet_files = list(backfill_dir.rglob("*.parquet"))
-        assert len(parquet_files) > 0, "No backfill Parquet files found"
+        assert len(backfill_files) > 0, "No backfill Parquet files found"
 
-    def test_backfill_schema_correct(self, base_path, duckdb_conn):
+    def test_backfill_schema_correct(self, solusdt_files, duckdb_conn):
         """Test that backfill Parquet schema is correct."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
+        # parquet_schema reads file footers only, no data pages
         query = f"""
-        DESCRIBE SELECT * FROM read_parquet('{backfill_path.as_posix()}')
+        SELECT DISTINCT name FROM parquet_schema({solusdt_files!r})
         """
         schema = duckdb_conn.execute(query).fetchall()
         columns = [row[0] for row in schema]
@@ -71,53 +149,38 @@ class TestSystemIntegrity:
         for col in required_columns:
             assert col in columns, f"Required column '{col}' missing from backfill schema"
 
-    def test_no_duplicate_timestamps(self, base_path, duckdb_conn):
+    def test_no_duplicate_timestamps(self, backfill_stats, backfill_footer):
         """Test that there are no duplicate timestamps in backfill data."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
-        query = f"""
-        SELECT
-            COUNT(*) as total_rows,
-            COUNT(DISTINCT open_time) as unique_timestamps
-        FROM read_parquet('{backfill_path.as_posix()}')
-        """
-        result = duckdb_conn.execute(query).fetchone()
-
-        total_rows = result[0]
-        unique_timestamps = result[1]
+        total_rows = backfill_footer["total_rows"]
+        unique_timestamps = backfill_stats["unique_timestamps"]
 
         assert total_rows == unique_timestamps, f"Found {total_rows - unique_timestamps} duplicate timestamps"
 
-    def test_ohlc_relationships_valid(self, base_path, duckdb_conn):
+    def test_ohlc_relationships_valid(self, backfill_dataset):
         """Test that OHLC relationships are valid (low <= open,close <= high)."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
-        query = f"""
-        SELECT COUNT(*) FROM read_parquet('{backfill_path.as_posix()}')
-        WHERE low > open OR low > close OR high < open OR high < close
-        """
-        violations = duckdb_conn.execute(query).fetchone()[0]
+        # Only the four price columns are read; row groups whose statistics
+        # rule the predicate out are skipped
+        low, high = pc.field("low"), pc.field("high")
+        open_, close = pc.field("open"), pc.field("close")
+        invalid = (low > open_) | (low > close) | (high < open_) | (high < close)
+        violations = backfill_dataset.count_rows(filter=invalid)
 
         assert violations == 0, f"Found {violations} OHLC relationship violations"
 
-    def test_no_negative_prices(self, base_path, duckdb_conn):
+    def test_no_negative_prices(self, backfill_dataset):
         """Test that all prices are positive."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
-        query = f"""
-        SELECT COUNT(*) FROM read_parquet('{backfill_path.as_posix()}')
-        WHERE open <= 0 OR high <= 0 OR low <= 0 OR close <= 0
-        """
-        violations = duckdb_conn.execute(query).fetchone()[0]
+        invalid = (
+            (pc.field("open") <= 0) | (pc.field("high") <= 0) |
+            (pc.field("low") <= 0) | (pc.field("close") <= 0)
+        )
+        violations = backfill_dataset.count_rows(filter=invalid)
 
         assert violations == 0, f"Found {violations} negative or zero prices"
 
-    def test_timestamps_are_utc(self, base_path, duckdb_conn):
+    def test_timestamps_are_utc(self, backfill_view, duckdb_conn):
         """Test that timestamps have UTC timezone."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
         query = f"""
-        SELECT open_time FROM read_parquet('{backfill_path.as_posix()}')
+        SELECT open_time FROM {backfill_view}
         LIMIT 1
         """
         result = duckdb_conn.execute(query).fetchone()
@@ -127,13 +190,15 @@ class TestSystemIntegrity:
             # Check if timestamp has timezone info (DuckDB timestamps with timezone are timezone-aware)
             assert timestamp.tzinfo is not None, "Timestamps are not timezone-aware"
 
-    def test_real_time_data_exists_today(self, base_path, duckdb_conn):
+    def test_real_time_data_exists_today(self, base_path, realtime_glob, duckdb_conn):
         """Test that real-time data exists for today."""
-        parquet_path = base_path / "parquet" / "binance" / "**" / "*.parquet"
+        # Skip before DuckDB opens any footers when there is nothing to read
+        if next((base_path / "parquet" / "binance").rglob("*.parquet"), None) is None:
+            pytest.skip("Real-time data not available: no Parquet files")
 
         try:
             query = f"""
-            SELECT COUNT(*) FROM read_parquet('{parquet_path.as_posix()}')
+            SELECT COUNT(*) FROM read_parquet('{realtime_glob}')
             WHERE DATE(window_start) = CURRENT_DATE
             """
             count = duckdb_conn.execute(query).fetchone()[0]
@@ -141,13 +206,14 @@ class TestSystemIntegrity:
         except Exception as e:
             pytest.skip(f"Real-time data not available: {e}")
 
-    def test_macro_data_has_multiple_tickers(self, base_path, duckdb_conn):
+    def test_macro_data_has_multiple_tickers(self, base_path, macro_glob, duckdb_conn):
         """Test that macro data includes multiple tickers."""
-        macro_path = base_path / "macro" / "minute" / "**" / "*.parquet"
+        if next((base_path / "macro" / "minute").rglob("*.parquet"), None) is None:
+            pytest.skip("Macro data not available: no Parquet files")
 
         try:
             query = f"""
-            SELECT COUNT(DISTINCT ticker) FROM read_parquet('{macro_path.as_posix()}')
+            SELECT COUNT(DISTINCT ticker) FROM read_parquet('{macro_glob}')
             """
             ticker_count = duckdb_conn.execute(query).fetchone()[0]
             assert ticker_count >= 5, f"Expected at least 5 macro tickers, found {ticker_count}"
@@ -178,53 +244,31 @@ class TestSystemIntegrity:
         log_files = list(logs_dir.glob("**/*.log"))
         assert len(log_files) > 0, "No log files found"
 
-    def test_backfill_data_range(self, base_path, duckdb_conn):
+    def test_backfill_data_range(self, backfill_footer):
         """Test that backfill covers expected date range."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
-        query = f"""
-        SELECT
-            MIN(open_time) as earliest,
-            MAX(open_time) as latest,
-            EXTRACT(EPOCH FROM (MAX(open_time) - MIN(open_time))) / 86400 as days_span
-        FROM read_parquet('{backfill_path.as_posix()}')
-        """
-        result = duckdb_conn.execute(query).fetchone()
+        earliest = backfill_footer["earliest"]
+        latest = backfill_footer["latest"]
 
-        earliest, latest, days_span = result
-        assert days_span >= 1, f"Backfill spans only {days_span} days, expected at least 1"
         assert latest is not None, "No data in backfill"
         assert earliest is not None, "No data in backfill"
 
-    def test_volume_data_present(self, base_path, duckdb_conn):
-        """Test that volume data is present and non-zero."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
-        query = f"""
-        SELECT COUNT(*) FROM read_parquet('{backfill_path.as_posix()}')
-        WHERE volume > 0
-        """
-        rows_with_volume = duckdb_conn.execute(query).fetchone()[0]
+        days_span = (latest - earliest).total_seconds() / 86400
+        assert days_span >= 1, f"Backfill spans only {days_span} days, expected at least 1"
 
-        query2 = f"""
-        SELECT COUNT(*) FROM read_parquet('{backfill_path.as_posix()}')
-        """
-        total_rows = duckdb_conn.execute(query2).fetchone()[0]
+    def test_volume_data_present(self, backfill_stats, backfill_footer):
+        """Test that volume data is present and non-zero."""
+        rows_with_volume = backfill_stats["rows_with_volume"]
+        total_rows = backfill_footer["total_rows"]
 
         # At least 50% of rows should have volume > 0
         volume_percentage = (rows_with_volume / total_rows) * 100 if total_rows > 0 else 0
         assert volume_percentage >= 50, f"Only {volume_percentage:.1f}% of rows have volume > 0"
 
-    def test_trade_count_reasonable(self, base_path, duckdb_conn):
+    def test_trade_count_reasonable(self, backfill_stats):
         """Test that trade counts are reasonable."""
-        backfill_path = base_path / "backfill" / "binance" / "SOLUSDT" / "**" / "*.parquet"
-
-        query = f"""
-        SELECT AVG(trades), MAX(trades) FROM read_parquet('{backfill_path.as_posix()}')
-        """
-        result = duckdb_conn.execute(query).fetchone()
+        avg_trades = backfill_stats["avg_trades"]
+        max_trades = backfill_stats["max_trades"]
 
-        avg_trades, max_trades = result
         assert avg_trades >= 0, "Average trade count cannot be negative"
         assert max_trades >= 0, "Max trade count cannot be negative"
 
@@ -272,6 +316,9 @@ class TestSystemConfiguration:
         ]
 
         for package in required_packages:
+            # Already imported by this session; skip re-running package init
+            if package in sys.modules:
+                continue
             try:
                 __import__(package)
             except ImportError:
@@ -2,22 +2,49 @@
 
 import os
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import pytest
 
 from tools.macro_minute import fetch_yf_1m, write_parquet, _read_existing_data
 
-
-def test_fetch_yf_1m_utc_normalization():
-    """Test that fetched data is timezone-aware UTC."""
-    # Note: This test requires internet connection and yfinance API availability
-    # Using a small lookback to minimize data transfer
-    df = fetch_yf_1m("SPY", lookback_days=1)
-
-    if df.empty:
-        pytest.skip("No data returned from yfinance (market might be closed)")
-
+# Column types of fetch_yf_1m output, as written by write_parquet
+MACRO_SCHEMA = pa.schema([
+    ("ts", pa.timestamp("ns", tz="UTC")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.int64()),
+    ("ticker", pa.string()),
+])
+
+
+def _macro_frame(start, ticker, **columns):
+    """Build a 1-minute macro frame with MACRO_SCHEMA types, starting at start."""
+    n = len(columns["open"])
+    data = {"ts": pd.date_range(start=start, periods=n, freq="1min", tz="UTC"), **columns, "ticker": [ticker] * n}
+    return pa.Table.from_pydict(data, schema=MACRO_SCHEMA).to_pandas()
+
+
+def _yf_download_frame(ticker: str) -> pd.DataFrame:
+    """Canned yf.download() result: exchange-local index, (Price, Ticker) columns."""
+    index = pd.date_range("2025-05-09 09:30", periods=3, freq="1min", tz="America/New_York", name="Datetime")
+    columns = pd.MultiIndex.from_product(
+        [["Adj Close", "Close", "High", "Low", "Open", "Volume"], [ticker]],
+        names=["Price", "Ticker"],
+    )
+    prices = [[500.1, 500.1, 500.5, 499.5, 500.0, 1000],
+              [500.3, 500.3, 500.6, 499.9, 500.1, 1100],
+              [500.2, 500.2, 500.4, 500.0, 500.3, 1200]]
+    df = pd.DataFrame(prices, index=index, columns=columns)
+    return df.astype({("Volume", ticker): "int64"})
+
+
+def _assert_macro_frame(df, ticker):
     # Verify required columns exist
     required_cols = ['ts', 'open', 'high', 'low', 'close', 'volume', 'ticker']
     assert all(col in df.columns for col in required_cols), f"Missing required columns. Got: {list(df.columns)}"
@@ -35,7 +62,31 @@ def test_fetch_yf_1m_utc_normalization():
     assert df['ticker'].dtype == 'object'
 
     # Verify ticker value
-    assert all(df['ticker'] == 'SPY')
+    assert all(df['ticker'] == ticker)
+
+
+def test_fetch_yf_1m_utc_normalization():
+    """Test that fetched data is timezone-aware UTC."""
+    with patch("tools.macro_minute.yf.download", return_value=_yf_download_frame("SPY")) as download:
+        df = fetch_yf_1m("SPY", lookback_days=1)
+
+    download.assert_called_once()
+    _assert_macro_frame(df, "SPY")
+
+    # 09:30 New York (EDT) is 13:30 UTC; Close (not Adj Close) is used
+    assert df['ts'].iloc[0] == pd.Timestamp("2025-05-09T13:30:00Z")
+    assert df['close'].tolist() == [500.1, 500.3, 500.2]
+
+
+@pytest.mark.network
+def test_fetch_yf_1m_utc_normalization_live():
+    """Same checks against the live yfinance API."""
+    df = fetch_yf_1m("SPY", lookback_days=1)
+
+    if df.empty:
+        pytest.skip("No data returned from yfinance (market might be closed)")
+
+    _assert_macro_frame(df, "SPY")
 
 
 def test_dedup_logic(tmp_path):
@@ -45,29 +96,27 @@ def test_dedup_logic(tmp_path):
     base_ts = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
 
     # First batch
-    df1 = pd.DataFrame({
-        'ts': pd.date_range(start=base_ts, periods=5, freq='1min', tz='UTC'),
-        'open': [100.0, 101.0, 102.0, 103.0, 104.0],
-        'high': [100.5, 101.5, 102.5, 103.5, 104.5],
-        'low': [99.5, 100.5, 101.5, 102.5, 103.5],
-        'close': [100.2, 101.2, 102.2, 103.2, 104.2],
-        'volume': [1000, 1100, 1200, 1300, 1400],
-        'ticker': ['TEST'] * 5
-    })
+    df1 = _macro_frame(
+        base_ts, 'TEST',
+        open=[100.0, 101.0, 102.0, 103.0, 104.0],
+        high=[100.5, 101.5, 102.5, 103.5, 104.5],
+        low=[99.5, 100.5, 101.5, 102.5, 103.5],
+        close=[100.2, 101.2, 102.2, 103.2, 104.2],
+        volume=[1000, 1100, 1200, 1300, 1400],
+    )
 
     # Write first batch
     write_parquet(df1, str(tmp_path), compression='snappy')
 
     # Second batch overlaps with last 2 rows of first batch
-    df2 = pd.DataFrame({
-        'ts': pd.date_range(start=base_ts + pd.Timedelta(minutes=3), periods=5, freq='1min', tz='UTC'),
-        'open': [103.0, 104.0, 105.0, 106.0, 107.0],  # Overlaps with rows 3, 4 from df1
-        'high': [103.5, 104.5, 105.5, 106.5, 107.5],
-        'low': [102.5, 103.5, 104.5, 105.5, 106.5],
-        'close': [103.3, 104.3, 105.3, 106.3, 107.3],  # Different close values (simulating updates)
-        'volume': [1333, 1444, 1500, 1600, 1700],  # Different volumes
-        'ticker': ['TEST'] * 5
-    })
+    df2 = _macro_frame(
+        base_ts + pd.Timedelta(minutes=3), 'TEST',
+        open=[103.0, 104.0, 105.0, 106.0, 107.0],  # Overlaps with rows 3, 4 from df1
+        high=[103.5, 104.5, 105.5, 106.5, 107.5],
+        low=[102.5, 103.5, 104.5, 105.5, 106.5],
+        close=[103.3, 104.3, 105.3, 106.3, 107.3],  # Different close values (simulating updates)
+        volume=[1333, 1444, 1500, 1600, 1700],  # Different volumes
+    )
 
     # Write second batch
     write_parquet(df2, str(tmp_path), compression='snappy')
@@ -90,33 +139,30 @@ def test_parquet_schema(tmp_path):
     """Test that written Parquet files have correct schema."""
     base_ts = datetime(2025, 5, 10, 14, 30, 0, tzinfo=timezone.utc)
 
-    df = pd.DataFrame({
-        'ts': pd.date_range(start=base_ts, periods=3, freq='1min', tz='UTC'),
-        'open': [200.0, 201.0, 202.0],
-        'high': [200.5, 201.5, 202.5],
-        'low': [199.5, 200.5, 201.5],
-        'close': [200.2, 201.2, 202.2],
-        'volume': [5000, 5100, 5200],
-        'ticker': ['SPY'] * 3
-    })
+    df = _macro_frame(
+        base_ts, 'SPY',
+        open=[200.0, 201.0, 202.0],
+        high=[200.5, 201.5, 202.5],
+        low=[199.5, 200.5, 201.5],
+        close=[200.2, 201.2, 202.2],
+        volume=[5000, 5100, 5200],
+    )
 
     write_parquet(df, str(tmp_path), compression='snappy')
 
-    # Read back and verify
-    pattern = os.path.join(str(tmp_path), "macro", "minute", "SPY", "**", "*.parquet")
-    import glob
-    files = glob.glob(pattern, recursive=True)
+    # Read back and verify; the dataset scanner discovers the partition files
+    dataset = ds.dataset(os.path.join(str(tmp_path), "macro", "minute", "SPY"), format="parquet")
 
-    assert len(files) > 0, "No Parquet files were written"
+    assert len(dataset.files) > 0, "No Parquet files were written"
 
     # Read first file
-    df_read = pd.read_parquet(files[0])
+    table = ds.dataset(dataset.files[0], format="parquet").to_table()
 
     # Verify columns
     expected_cols = ['ts', 'open', 'high', 'low', 'close', 'volume', 'ticker']
-    assert all(col in df_read.columns for col in expected_cols)
+    assert all(col in table.schema.names for col in expected_cols)
 
     # Verify UTC timezone
-    df_read['ts'] = pd.to_datetime(df_read['ts'], utc=True)
-    assert df_read['ts'].dt.tz is not None
-    assert str(df_read['ts'].dt.tz) == "UTC"
+    ts_type = table.schema.field('ts').type
+    assert pa.types.is_timestamp(ts_type)
+    assert ts_type.tz == "UTC"
@@ -2,6 +2,7 @@
 Tests for the unified orchestrator.
 """
 
+import asyncio
 import json
 import os
 import tempfile
@@ -44,23 +45,26 @@ class TestOrchestrator:
         assert orch.base_path == "/tmp/test"
         assert orch.compression == "snappy"
 
+    @patch("tools.orchestrator.wait_for_parquet_files", return_value=True)
+    @patch("tools.orchestrator.summarize_files",
+           return_value={"raw_count_today": 0, "parquet_1s_rows_today": 0, "macro_min_rows_today": 0})
     @patch("tools.orchestrator.run_collector")
     @patch("tools.orchestrator.fetch_yf_1m")
     @patch("tools.orchestrator.write_parquet")
-    def test_orchestrator_start_stop(self, mock_write_parquet, mock_fetch_yf_1m, mock_run_collector):
+    def test_orchestrator_start_stop(self, mock_write_parquet, mock_fetch_yf_1m, mock_run_collector,
+                                     mock_summarize_files, mock_wait_for_parquet, tmp_path):
         """Test orchestrator starts and stops threads cleanly."""
         config = {
-            "general": {"base_path": "/tmp/test", "log_level": "INFO"},
+            "general": {"base_path": str(tmp_path), "log_level": "INFO"},
             "transformer": {"parquet_compression": "snappy"},
+            "exchanges": [{"name": "binance", "symbols": ["BTCUSDT"]}],
         }
 
-        # Mock collector to return immediately
+        # Mock collector runs until stop() is signalled into its event loop
         async def mock_collector_coro(*args, **kwargs):
-            # Wait for stop event
-            while not threading.current_thread()._target.__self__.stop_event.is_set():
-                await asyncio.sleep(0.1)
+            await orch._stop_requested().wait()
 
-        mock_run_collector.return_value = None
+        mock_run_collector.side_effect = mock_collector_coro
 
         # Mock macro fetch to return empty dataframe
         import pandas as pd
@@ -75,24 +79,41 @@ class TestOrchestrator:
             macro_interval_min=15,
         )
 
-        # Start orchestrator
+        # Start orchestrator and wait until every thread has been launched
         orch.start()
-
-        # Give threads time to start
-        time.sleep(0.5)
+        assert orch.ready_event.wait(timeout=2.0), "Orchestrator did not become ready"
 
         # Check threads are alive
-        assert orch.ws_thread is not None
-        assert orch.macro_thread is not None
-        assert orch.health_thread is not None
+        assert len(orch.ws_threads) == 1
+        threads = [*orch.ws_threads, orch.macro_thread, orch.transform_thread, orch.health_thread]
+        assert all(t is not None and t.is_alive() for t in threads)
 
-        # Stop orchestrator
+        # Stop orchestrator; threads wake on the stop event instead of finishing a sleep
+        started = time.monotonic()
         orch.stop(timeout=3.0)
+        assert time.monotonic() - started < 1.0, "stop() should not wait out polling sleeps"
+
+        # Check threads have stopped and the collector saw stop() rather than failing
+        assert not any(t.is_alive() for t in threads)
+        mock_run_collector.assert_called_once()
+        assert orch.health_data["collectors"]["binance"]["status"] == "stopped"
+
+    def test_stop_requested_bridges_stop_event(self):
+        """Test that stop() wakes coroutines awaiting _stop_requested()."""
+        orch = Orchestrator(
+            config={"general": {"base_path": "/tmp/test"}},
+            exchange_name="binance",
+            symbols=["BTCUSDT"],
+            macro_tickers=[],
+        )
 
-        # Check threads have stopped
-        assert not orch.ws_thread.is_alive()
-        assert not orch.macro_thread.is_alive()
-        assert not orch.health_thread.is_alive()
+        async def wait_for_stop():
+            stop_requested = orch._stop_requested()
+            assert not stop_requested.is_set()
+            asyncio.get_running_loop().call_later(0.01, orch.stop_event.set)
+            await asyncio.wait_for(stop_requested.wait(), timeout=1.0)
+
+        asyncio.run(wait_for_stop())
 
     def test_scheduler_interval_math(self):
         """Test scheduler calculates next run time correctly."""
@@ -188,21 +209,25 @@ class TestHeartbeat:
 class TestFileSummary:
     """Test file summary statistics collection."""
 
-    @patch("tools.health.duckdb.connect")
-    @patch("tools.health.glob.glob")
-    @patch("os.path.exists")
-    def test_summarize_files(self, mock_exists, mock_glob, mock_duckdb_connect):
+    @pytest.fixture(autouse=True)
+    def health_mocks(self):
+        """Patch the filesystem and DuckDB hooks summarize_files uses, once per test."""
+        with patch("tools.health.duckdb.connect") as mock_duckdb_connect, \
+                patch("tools.health.glob.glob") as mock_glob, \
+                patch("tools.health.os.path.exists", return_value=True), \
+                patch("tools.health.wait_for_parquet_files", return_value=True):
+            mock_conn = MagicMock()
+            mock_duckdb_connect.return_value = mock_conn
+            yield {"glob": mock_glob, "conn": mock_conn}
+
+    def test_summarize_files(self, health_mocks):
         """Test file summarization counts raw files and queries Parquet rows."""
         # Mock file system
-        mock_glob.return_value = [f"/tmp/part_{i:03d}.jsonl" for i in range(50)]
-        mock_exists.return_value = True
-
-        # Mock DuckDB query results
-        mock_conn = MagicMock()
-        mock_duckdb_connect.return_value = mock_conn
+        health_mocks["glob"].return_value = [f"/tmp/part_{i:03d}.jsonl" for i in range(50)]
 
         # First query (parquet_1s_rows): return 10000 rows
         # Second query (macro_min_rows): return 500 rows
+        mock_conn = health_mocks["conn"]
         mock_conn.execute.return_value.fetchone.side_effect = [(10000,), (500,)]
 
         result = summarize_files("/tmp/data", "2025-10-22")
@@ -214,11 +239,10 @@ class TestFileSummary:
         # Verify DuckDB was called twice (once for parquet, once for macro)
         assert mock_conn.execute.call_count == 2
 
-    @patch("tools.health.glob.glob")
-    def test_summarize_files_handles_errors(self, mock_glob):
+    def test_summarize_files_handles_errors(self, health_mocks):
         """Test file summarization handles errors gracefully."""
         # Mock glob to raise an exception
-        mock_glob.side_effect = Exception("Permission denied")
+        health_mocks["glob"].side_effect = Exception("Permission denied")
 
         result = summarize_files("/tmp/data", "2025-10-22")
 
@@ -228,9 +252,5 @@ class TestFileSummary:
         assert result["macro_min_rows_today"] == 0
 
 
-# Add asyncio import for mock_collector_coro
-import asyncio
-
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,11 +1,34 @@
-import os
 from datetime import datetime, timezone
 
-import duckdb
 import pandas as pd
+import pyarrow as pa
 
 from transformer.transformer import _aggregate_bars_1s
 
+# Raw event columns with explicit types: trade rows leave bid/ask null and
+# quote rows leave price/qty null, so every column stays numeric
+EVENT_SCHEMA = pa.schema([
+    ("symbol", pa.dictionary(pa.int32(), pa.string())),
+    ("ts_event", pa.int64()),
+    ("price", pa.float64()),
+    ("qty", pa.float64()),
+    ("bid", pa.float64()),
+    ("ask", pa.float64()),
+    ("stream", pa.dictionary(pa.int32(), pa.string())),
+])
+
+
+def events_frame(rows):
+    """Build an event DataFrame from dict rows without pandas dtype inference."""
+    return pa.Table.from_pylist(rows, schema=EVENT_SCHEMA).to_pandas()
+
+
+def assert_utc_window_start(out):
+    """Verify window_start field exists and is timezone-aware UTC."""
+    assert "window_start" in out.columns, "Output must have 'window_start' column"
+    assert out["window_start"].dt.tz is not None, "window_start must be timezone-aware"
+    assert str(out["window_start"].dt.tz) == "UTC", "window_start must be in UTC timezone"
+
 def test_aggregate_bars_1s_basic():
     # Construct a small trade+quote dataframe
     t0 = int(datetime(2025, 5, 5, 0, 0, 0, tzinfo=timezone.utc).timestamp() * 1000)
@@ -15,14 +38,11 @@ def test_aggregate_bars_1s_basic():
         {"symbol": "SUIUSDT", "ts_event": t0 + 900, "price": 1.1, "qty": 1.0, "stream": "trade"},
         {"symbol": "SUIUSDT", "ts_event": t0 + 1200, "bid": 1.05, "ask": 1.15, "stream": "bookTicker"},
     ]
-    df = pd.DataFrame(rows)
+    df = events_frame(rows)
     out = _aggregate_bars_1s(df, "SUIUSDT", second=1)
     assert not out.empty
 
-    # Verify window_start field exists and is timezone-aware UTC
-    assert "window_start" in out.columns, "Output must have 'window_start' column"
-    assert out["window_start"].dt.tz is not None, "window_start must be timezone-aware"
-    assert str(out["window_start"].dt.tz) == "UTC", "window_start must be in UTC timezone"
+    assert_utc_window_start(out)
 
     r0 = out.iloc[0]
     assert abs(r0["open"] - 1.0) < 1e-9
@@ -54,13 +74,10 @@ def test_quotes_only_no_trade_gaps():
         {"symbol": "BTCUSDT", "ts_event": t0 + 3400, "bid": 99.7, "ask": 100.7, "stream": "bookTicker"},
     ]
 
-    df = pd.DataFrame(rows)
+    df = events_frame(rows)
     out = _aggregate_bars_1s(df, "BTCUSDT", second=1)
 
-    # Verify window_start field exists and is timezone-aware UTC
-    assert "window_start" in out.columns, "Output must have 'window_start' column"
-    assert out["window_start"].dt.tz is not None, "window_start must be timezone-aware"
-    assert str(out["window_start"].dt.tz) == "UTC", "window_start must be in UTC timezone"
+    assert_utc_window_start(out)
 
     # Should have 4 rows (seconds 0-3)
     assert len(out) == 4
@@ -93,3 +110,28 @@ def test_quotes_only_no_trade_gaps():
     assert r3["volume_base"] == 0
     assert abs(r3["bid"] - 99.7) < 1e-9
     assert abs(r3["ask"] - 100.7) < 1e-9
+
+def test_aggregate_bars_unsorted_events_multi_second_interval():
+    """Out-of-order events are bucketed by integer interval and ordered by time."""
+    t0 = int(datetime(2025, 6, 1, 0, 0, 0, tzinfo=timezone.utc).timestamp() * 1000)
+    rows = [
+        {"symbol": "BTCUSDT", "ts_event": t0 + 6000, "price": 105.0, "qty": 1.0, "stream": "trade"},
+        {"symbol": "BTCUSDT", "ts_event": t0 + 4900, "price": 103.0, "qty": 1.0, "stream": "trade"},
+        {"symbol": "BTCUSDT", "ts_event": t0 + 100, "price": 101.0, "qty": 3.0, "stream": "trade"},
+        {"symbol": "BTCUSDT", "ts_event": t0 + 4000, "bid": 102.0, "ask": 102.5, "stream": "bookTicker"},
+        {"symbol": "BTCUSDT", "ts_event": t0 + 7000, "bid": 104.5, "ask": 105.5, "stream": "bookTicker"},
+    ]
+    out = _aggregate_bars_1s(events_frame(rows), "BTCUSDT", second=5)
+
+    assert_utc_window_start(out)
+    assert out["window_start"].tolist() == [
+        pd.Timestamp("2025-06-01T00:00:00Z"),
+        pd.Timestamp("2025-06-01T00:00:05Z"),
+    ]
+    r0 = out.iloc[0]
+    assert (r0["open"], r0["close"]) == (101.0, 103.0)
+    assert r0["trade_count"] == 2
+    assert abs(r0["vwap"] - (101.0 * 3 + 103.0) / 4) < 1e-9
+    assert abs(r0["spread"] - 0.5) < 1e-9
+    assert abs(out.iloc[1]["bid"] - 104.5) < 1e-9
+    assert (out["symbol"] == "BTCUSDT").all()
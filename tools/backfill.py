@@ -1,33 +1,141 @@
 import asyncio
+import bisect
+import contextlib
 import math
 import os
+import uuid
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 import aiohttp
-import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 from loguru import logger
 
 from tools.common import (
+    BINANCE_REQUESTS_PER_MINUTE,
+    binance_retry_after,
+    binance_weight_pause,
     ensure_dir,
     get_backfill_symbol_root,
     get_exchange_config,
+    json_loads,
     setup_logging,
 )
 
 BINANCE_LIMIT = 1000  # per klines request
+MAX_CONNECTIONS = 64
+MAX_CONNECTIONS_PER_HOST = 32
+DAY_MS = 86_400_000
 
-async def _fetch_with_retry(session: aiohttp.ClientSession, url: str, params: Dict[str, Any], retries: int = 5, backoff: float = 1.5) -> List[Any]:
+class _AsyncRateLimiter:
+    """Sliding-window limiter: at most max_rate request starts per period seconds."""
+
+    def __init__(self, max_rate: int, period: float = 60.0):
+        self.max_rate = max_rate
+        self.period = period
+        self._starts: Deque[float] = deque()
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request start for at least `seconds` from now."""
+        self._resume_at = max(self._resume_at, asyncio.get_running_loop().time() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                while self._starts and now - self._starts[0] >= self.period:
+                    self._starts.popleft()
+                if len(self._starts) < self.max_rate:
+                    self._starts.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self._starts[0]))
+
+    async def __aenter__(self) -> "_AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool:
+        return False
+
+class _AimdConcurrency:
+    """
+    Concurrent request window sized by AIMD.
+
+    The window grows by `alpha` after each successful request (up to
+    `maximum`) and is multiplied by `beta` whenever Binance throttles us.
+    """
+
+    def __init__(self, initial: int = 8, maximum: int = MAX_CONNECTIONS_PER_HOST, alpha: float = 1.0, beta: float = 0.5):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.alpha = alpha
+        self.beta = beta
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> "_AimdConcurrency":
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+    def on_success(self) -> None:
+        self.limit = min(float(self.maximum), self.limit + self.alpha)
+
+    def on_throttle(self) -> None:
+        self.limit = max(1.0, self.limit * self.beta)
+
+class _RateLimited(Exception):
+    """HTTP 418/429 from Binance, carrying the Retry-After delay."""
+
+    def __init__(self, status: int, retry_after: Optional[float]):
+        super().__init__(f"HTTP {status}: rate limited")
+        self.retry_after = retry_after
+
+async def _fetch_with_retry(session: aiohttp.ClientSession, url: str, params: Dict[str, Any], retries: int = 5, backoff: float = 1.5, limiter: Optional[_AsyncRateLimiter] = None, concurrency: Optional[_AimdConcurrency] = None) -> List[Any]:
     attempt = 0
     while True:
         try:
-            async with session.get(url, params=params, timeout=30) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                text = await resp.text()
-                raise RuntimeError(f"HTTP {resp.status}: {text}")
+            if limiter is not None:
+                await limiter.acquire()
+            async with (concurrency or contextlib.nullcontext()):
+                async with session.get(url, params=params, timeout=30) as resp:
+                    if resp.status == 200:
+                        payload = json_loads(await resp.read())
+                        pause = binance_weight_pause(resp.headers)
+                        break
+                    if resp.status in (418, 429):
+                        raise _RateLimited(resp.status, binance_retry_after(resp.headers, None))
+                    text = await resp.text()
+                    raise RuntimeError(f"HTTP {resp.status}: {text}")
+        except _RateLimited as e:
+            attempt += 1
+            if concurrency is not None:
+                concurrency.on_throttle()
+            if attempt > retries:
+                raise
+            # Retry-After is exact; without it fall back to exponential backoff
+            sleep_for = e.retry_after if e.retry_after is not None else backoff ** attempt
+            if limiter is not None:
+                limiter.pause(sleep_for)
+            logger.warning(f"{e}; retrying in {sleep_for:.1f}s")
+            await asyncio.sleep(sleep_for)
         except Exception as e:
             attempt += 1
             if attempt > retries:
@@ -36,68 +144,133 @@ async def _fetch_with_retry(session: aiohttp.ClientSession, url: str, params: Di
             logger.warning(f"REST error ({e}); retrying in {sleep_for:.1f}s")
             await asyncio.sleep(sleep_for)
 
-def _klines_to_df(rows: List[List[Any]], symbol: str) -> pd.DataFrame:
-    if not rows:
-        return pd.DataFrame()
-    # Binance kline spec (open time, open, high, low, close, volume, close time, quote volume, trades, taker buy base, taker buy quote, ignore)
-    cols = [
-        "open_time",
-        "open",
-        "high",
-        "low",
-        "close",
-        "volume_base",
-        "close_time",
-        "volume_quote",
-        "trade_count",
-        "taker_buy_base",
-        "taker_buy_quote",
-        "ignore",
-    ]
-    df = pd.DataFrame(rows, columns=cols)
-    for c in ("open", "high", "low", "close", "volume_base", "volume_quote"):
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    df["window_start"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-    df["symbol"] = symbol
-    # Approximate vwap as quote/base
-    df["vwap"] = (df["volume_quote"] / df["volume_base"]).where(df["volume_base"] > 0, df["close"])
-    # Placeholders for 1m-level fields that 1s has
-    df["bid"] = pd.NA
-    df["ask"] = pd.NA
-    df["spread"] = pd.NA
-    return df[["symbol", "window_start", "open", "high", "low", "close", "volume_base", "volume_quote", "trade_count", "vwap", "bid", "ask", "spread"]]
-
-async def _backfill_symbol(session: aiohttp.ClientSession, base_url: str, symbol: str, start_ts_ms: int, end_ts_ms: int, out_root: str) -> None:
+    if concurrency is not None:
+        concurrency.on_success()
+    # Near the minute's weight budget: hold every task until the window resets
+    if pause > 0 and limiter is not None:
+        logger.info(f"Request weight near limit; pausing requests for {pause:.1f}s")
+        limiter.pause(pause)
+    return payload
+
+# Output schema of backfilled 1m bars (bid/ask/spread are 1s-only, left null)
+BARS_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("window_start", pa.timestamp("ns", tz="UTC")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume_base", pa.float64()),
+    ("volume_quote", pa.float64()),
+    ("trade_count", pa.int64()),
+    ("vwap", pa.float64()),
+    ("bid", pa.float64()),
+    ("ask", pa.float64()),
+    ("spread", pa.float64()),
+])
+
+def _klines_to_table(rows: List[List[Any]], symbol: str) -> pa.Table:
+    # Binance kline spec (open time, open, high, low, close, volume, close time, quote volume, trades, taker buy base, taker buy quote, ignore).
+    # Transpose once and build each typed Arrow column directly, no pandas.
+    columns = list(zip(*rows)) if rows else [()] * 12
+
+    def as_float(idx: int) -> pa.Array:
+        # Prices and volumes arrive as decimal strings
+        return pa.array(columns[idx], type=pa.string()).cast(pa.float64())
+
+    n = len(rows)
+    close = as_float(4)
+    volume_base = as_float(5)
+    volume_quote = as_float(7)
+    nulls = pa.nulls(n, type=pa.float64())
+    return pa.Table.from_arrays([
+        pa.array([symbol] * n, type=pa.string()),
+        pa.array(columns[0], type=pa.int64()).cast(pa.timestamp("ms", tz="UTC")).cast(pa.timestamp("ns", tz="UTC")),
+        as_float(1),
+        as_float(2),
+        as_float(3),
+        close,
+        volume_base,
+        volume_quote,
+        pa.array(columns[8], type=pa.int64()),
+        # Approximate vwap as quote/base
+        pc.if_else(pc.greater(volume_base, 0), pc.divide(volume_quote, volume_base), close),
+        nulls,
+        nulls,
+        nulls,
+    ], schema=BARS_SCHEMA)
+
+def _write_partitions(table: pa.Table, out_root: str, compression: str = "zstd", compression_level: int = 3) -> None:
+    """Write bars to year=/month=/day= partitions under out_root in one dataset write."""
+    window_start = table["window_start"]
+    table = (
+        table.append_column("year", pc.year(window_start))
+        .append_column("month", pc.month(window_start))
+        .append_column("day", pc.day(window_start))
+    )
+    ds.write_dataset(
+        table,
+        out_root,
+        format="parquet",
+        partitioning=["year", "month", "day"],
+        partitioning_flavor="hive",
+        # Unique basename per write so reruns add files like write_to_dataset did
+        basename_template=f"{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression=compression,
+            compression_level=compression_level,
+            # symbol is constant per file, so its dictionary collapses to one entry
+            use_dictionary=["symbol"],
+            write_statistics=True,
+            data_page_size=1 << 20,
+            # Pages arrive in open-time order; let readers rely on it
+            sorting_columns=[pq.SortingColumn(BARS_SCHEMA.get_field_index("window_start"))],
+        ),
+    )
+
+async def _backfill_symbol(session: aiohttp.ClientSession, base_url: str, symbol: str, start_ts_ms: int, end_ts_ms: int, out_root: str, limiter: Optional[_AsyncRateLimiter] = None, concurrency: Optional[_AimdConcurrency] = None) -> None:
     ensure_dir(out_root)
     params = {"symbol": symbol, "interval": "1m", "limit": BINANCE_LIMIT}
     current = start_ts_ms
-    files_written = 0
+    # Pages are buffered and written once per completed UTC day, instead of a
+    # dataset write per page; an interrupted run keeps every finished day and
+    # memory stays bounded by one day of bars
+    pending: List[pa.Table] = []
+    pages = 0
+
+    async def flush() -> None:
+        if pending:
+            table = pa.concat_tables(pending)
+            pending.clear()
+            # Serialization and disk writes run on a worker thread (Arrow
+            # releases the GIL), so other symbols keep fetching meanwhile
+            await asyncio.to_thread(_write_partitions, table, out_root)
+
     while current < end_ts_ms:
         params["startTime"] = current
         params["endTime"] = min(current + BINANCE_LIMIT * 60_000, end_ts_ms - 1)
-        rows = await _fetch_with_retry(session, f"{base_url}/klines", params)
+        rows = await _fetch_with_retry(session, f"{base_url}/klines", params, limiter=limiter, concurrency=concurrency)
         if not rows:
             current = params["endTime"] + 1
             continue
+        pages += 1
 
-        df = _klines_to_df(rows, symbol)
-        if df.empty:
-            current = params["endTime"] + 1
-            continue
+        # Advance by number of rows * 1 minute (klines arrive in open-time order)
+        last_close = int(rows[-1][0]) + 60_000
+        current = max(current + len(rows) * 60_000, last_close)
 
-        # Partition by date
-        df["year"] = df["window_start"].dt.year
-        df["month"] = df["window_start"].dt.month
-        df["day"] = df["window_start"].dt.day
-        table = pa.Table.from_pandas(df, preserve_index=False)
-        pq.write_to_dataset(table, root_path=out_root, partition_cols=["year", "month", "day"], compression="snappy")
-        files_written += 1
+        # Rows before the current UTC day belong to completed days
+        split = bisect.bisect_left([int(row[0]) for row in rows], current - current % DAY_MS)
+        if split:
+            pending.append(_klines_to_table(rows[:split], symbol))
+            await flush()
+        if split < len(rows):
+            pending.append(_klines_to_table(rows[split:], symbol))
 
-        # Advance by number of rows * 1 minute
-        last_close = int(df["window_start"].max().timestamp() * 1000) + 60_000
-        current = max(current + len(rows) * 60_000, last_close)
+    await flush()
 
-    logger.info(f"Backfill complete for {symbol}, files_written={files_written}")
+    logger.info(f"Backfill complete for {symbol}, batches={pages}")
 
 async def _run_backfill_async(config: Dict[str, Any], exchange_name: str, days: int, symbols: Optional[List[str]]) -> None:
     setup_logging("backfill", config)
@@ -112,11 +285,15 @@ async def _run_backfill_async(config: Dict[str, Any], exchange_name: str, days:
     start_ts_ms = int(start.timestamp() * 1000)
     end_ts_ms = int(end.timestamp() * 1000)
 
-    async with aiohttp.ClientSession() as session:
+    # One request budget and connection pool shared by every symbol task
+    limiter = _AsyncRateLimiter(BINANCE_REQUESTS_PER_MINUTE, 60.0)
+    concurrency = _AimdConcurrency()
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
         tasks = []
         for sym in symbols:
             out_root = get_backfill_symbol_root(config, exchange_name, sym)
-            tasks.append(asyncio.create_task(_backfill_symbol(session, base_url, sym, start_ts_ms, end_ts_ms, out_root)))
+            tasks.append(asyncio.create_task(_backfill_symbol(session, base_url, sym, start_ts_ms, end_ts_ms, out_root, limiter=limiter, concurrency=concurrency)))
         await asyncio.gather(*tasks)
 
 def run_backfill(config: Dict[str, Any], exchange_name: str = "binance", days: int = 90, symbols: Optional[List[str]] = None) -> None:
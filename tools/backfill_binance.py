@@ -5,16 +5,94 @@ Fetches historical 1-minute OHLCV data from Binance REST API and writes
 partitioned Parquet files for efficient querying.
 """
 
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import requests
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from loguru import logger
 
+from tools.common import (
+    BINANCE_REQUESTS_PER_MINUTE,
+    BINANCE_WEIGHT_LIMIT_1M,
+    binance_retry_after,
+    binance_weight_pause,
+    json_loads,
+)
+
+# Symbols fetched concurrently by backfill_binance unless overridden
+DEFAULT_MAX_WORKERS = 4
+
+MS_PER_DAY = 86_400_000
+_INTERVAL_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": MS_PER_DAY, "w": 7 * MS_PER_DAY}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _interval_ms(interval: str) -> int:
+    """Length of a Binance kline interval such as "1m" or "4h" in milliseconds."""
+    return int(interval[:-1]) * _INTERVAL_UNIT_MS[interval[-1]]
+
+
+def _epoch_ms(column: pa.ChunkedArray) -> np.ndarray:
+    """Timestamp column as an int64 array of epoch milliseconds."""
+    return column.cast(pa.timestamp("ms", tz="UTC")).cast(pa.int64()).to_numpy()
+
+
+def _merge_on_open_time(existing: pa.Table, new: pa.Table) -> pa.Table:
+    """
+    Merge two kline tables sorted by open_time, keeping the last row per open_time.
+
+    The stable sort keeps `new` rows after `existing` ones with the same
+    open_time, so they win the dedup.
+    """
+    merged = pa.concat_tables([existing, new.cast(existing.schema)])
+    merged = merged.take(pc.sort_indices(merged, sort_keys=[("open_time", "ascending")]))
+    open_time = merged["open_time"].combine_chunks()
+    if len(open_time) < 2:
+        return merged
+    # Last row of each run of equal open_time values
+    keep = pc.not_equal(open_time[:-1], open_time[1:])
+    return merged.filter(pa.concat_arrays([keep, pa.array([True])]))
+
+
+class _RequestPacer:
+    """Spaces request starts at least `interval` seconds apart across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every waiting thread for at least `seconds` from now."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+# Shared by every backfiller and fetch thread. Paced to the minute's weight
+# budget; the used-weight and Retry-After headers pause it when needed.
+_REQUEST_PACER = _RequestPacer(60.0 / BINANCE_REQUESTS_PER_MINUTE)
+
 
 class BinanceBackfiller:
     """Handles backfilling historical OHLCV data from Binance REST API."""
@@ -24,8 +102,15 @@ class BinanceBackfiller:
 
     # Binance limits: 1000 klines per request, weight=1
     MAX_KLINES_PER_REQUEST = 1000
-    RATE_LIMIT_WEIGHT = 1200  # per minute
-    REQUESTS_PER_MINUTE = 1200 // RATE_LIMIT_WEIGHT
+    RATE_LIMIT_WEIGHT = BINANCE_WEIGHT_LIMIT_1M  # per minute
+    REQUESTS_PER_MINUTE = BINANCE_REQUESTS_PER_MINUTE
+
+    # Day windows fetched concurrently per symbol (paced by _REQUEST_PACER)
+    FETCH_WORKERS = 4
+
+    # Monthly partition files, one row group per UTC day
+    PARQUET_COMPRESSION = "zstd"
+    PARQUET_COMPRESSION_LEVEL = 3
 
     def __init__(self, base_dir: Path, interval: str = "1m"):
         """
@@ -39,8 +124,62 @@ class BinanceBackfiller:
         self.interval = interval
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "crypto-lake/1.0"})
+        # Partition directories already created by this backfiller
+        self._ensured_dirs: set = set()
+        # (file signature, sorted epoch-ms open times) per (symbol, year, month)
+        self._existing_cache: Dict[Tuple[str, int, int], Tuple[tuple, np.ndarray]] = {}
+        # Raw kline responses for closed windows, so restarted backfills skip the API
+        self.response_cache_dir = self.base_dir / ".cache"
+
+    def _month_dir(self, symbol: str, year: int, month: int) -> Path:
+        """Partition directory holding a symbol's data for one month."""
+        return self.base_dir / symbol / f"year={year}" / f"month={month:02d}"
+
+    @staticmethod
+    def _month_files(month_dir: Path) -> List[Path]:
+        """Monthly data file plus any day=DD files left by the older daily layout."""
+        files = sorted(month_dir.glob("day=*/*.parquet"))
+        month_file = month_dir / "data.parquet"
+        if month_file.exists():
+            files.insert(0, month_file)
+        return files
+
+    def _get_existing_month(self, symbol: str, year: int, month: int) -> np.ndarray:
+        """
+        Sorted int64 epoch-ms open times stored for a symbol and month.
 
-    def _get_existing_timestamps(self, symbol: str, date: datetime) -> set:
+        Only the open_time column is read, and the result is cached until a
+        partition file changes (by mtime or size).
+        """
+        month_dir = self._month_dir(symbol, year, month)
+        files = self._month_files(month_dir)
+        try:
+            signature = tuple((p.as_posix(), p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+        except FileNotFoundError:
+            signature = None
+
+        key = (symbol, year, month)
+        cached = self._existing_cache.get(key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+
+        existing = np.empty(0, dtype=np.int64)
+        if files:
+            try:
+                open_time = pa.chunked_array([
+                    chunk
+                    for path in files
+                    for chunk in pq.read_table(path, columns=["open_time"], partitioning=None)
+                    .column("open_time").cast(pa.timestamp("ms", tz="UTC")).chunks
+                ], type=pa.timestamp("ms", tz="UTC"))
+                existing = np.sort(_epoch_ms(open_time))
+            except Exception as e:
+                logger.warning(f"Failed to read existing data for {symbol} in {year}-{month:02d}: {e}")
+
+        self._existing_cache[key] = (signature, existing)
+        return existing
+
+    def _get_existing_timestamps(self, symbol: str, date: datetime) -> np.ndarray:
         """
         Get existing timestamps for a symbol on a specific date.
 
@@ -49,28 +188,23 @@ class BinanceBackfiller:
             date: Date to check
 
         Returns:
-            Set of existing timestamps (as pandas Timestamp objects)
+            Sorted int64 array of existing open times (epoch milliseconds)
         """
-        year = date.year
-        month = date.month
-        day = date.day
-
-        parquet_path = (
-            self.base_dir / symbol / f"year={year}" / f"month={month:02d}" / f"day={day:02d}"
-        )
-
-        if not parquet_path.exists():
-            return set()
-
-        try:
-            # Read all parquet files for this date
-            df = pd.read_parquet(parquet_path)
-            if "open_time" in df.columns:
-                return set(df["open_time"])
-            return set()
-        except Exception as e:
-            logger.warning(f"Failed to read existing data for {symbol} on {date.date()}: {e}")
-            return set()
+        existing = self._get_existing_month(symbol, date.year, date.month)
+        day_start = (date.toordinal() - _EPOCH.toordinal()) * MS_PER_DAY
+        lo, hi = np.searchsorted(existing, [day_start, day_start + MS_PER_DAY])
+        return existing[lo:hi]
+
+    def _existing_mask(self, symbol: str, open_ms: np.ndarray) -> np.ndarray:
+        """Mark klines whose open time is already stored, checking each UTC day they span."""
+        mask = np.zeros(len(open_ms), dtype=bool)
+        days = open_ms // MS_PER_DAY
+        for day in np.unique(days):
+            existing = self._get_existing_timestamps(symbol, _EPOCH + timedelta(days=int(day)))
+            if len(existing):
+                in_day = days == day
+                mask[in_day] = np.isin(open_ms[in_day], existing, assume_unique=True)
+        return mask
 
     def _fetch_klines(
         self,
@@ -107,15 +241,23 @@ class BinanceBackfiller:
                     timeout=30,
                 )
 
-                # Handle rate limits
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    logger.warning(f"Rate limited. Waiting {retry_after} seconds...")
+                # Handle rate limits (418 = IP banned for ignoring 429s);
+                # Retry-After is exact, and holds back every fetch thread
+                if response.status_code in (418, 429):
+                    retry_after = binance_retry_after(response.headers, 60)
+                    logger.warning(f"Rate limited (HTTP {response.status_code}). Waiting {retry_after:g} seconds...")
+                    _REQUEST_PACER.pause(retry_after)
                     time.sleep(retry_after)
                     continue
 
                 response.raise_for_status()
-                data = response.json()
+                data = json_loads(response.content)
+
+                # Near the minute's weight budget: stop all threads until it resets
+                pause = binance_weight_pause(response.headers)
+                if pause > 0:
+                    logger.info(f"Request weight near limit; pausing requests for {pause:.1f}s")
+                    _REQUEST_PACER.pause(pause)
 
                 # Handle API errors
                 if isinstance(data, dict) and "code" in data:
@@ -124,7 +266,7 @@ class BinanceBackfiller:
 
                 return data
 
-            except requests.exceptions.RequestException as e:
+            except Exception as e:
                 wait_time = min(2 ** attempt, 60)  # Exponential backoff, max 60s
                 logger.warning(
                     f"Request failed (attempt {attempt + 1}/{max_retries}): {e}. "
@@ -135,93 +277,193 @@ class BinanceBackfiller:
         logger.error(f"Failed to fetch klines for {symbol} after {max_retries} attempts")
         return None
 
-    def _klines_to_dataframe(self, klines: List) -> pd.DataFrame:
+    def _response_cache_path(self, symbol: str, start_time: int, end_time: int) -> Path:
+        """Cache file for one kline request window."""
+        key = hashlib.blake2b(
+            f"{symbol}|{self.interval}|{start_time}|{end_time}".encode(), digest_size=8
+        ).hexdigest()
+        return self.response_cache_dir / f"{key}.json.gz"
+
+    def _fetch_klines_cached(self, symbol: str, start_time: int, end_time: int) -> Optional[List]:
         """
-        Convert Binance klines to pandas DataFrame.
+        Fetch klines, reusing the on-disk response cache.
+
+        Only windows that closed at least two intervals ago are cached, so a
+        partial last bar is never stored. Cache hits skip the request pacer.
 
         Args:
-            klines: List of kline arrays from Binance API
+            symbol: Trading pair symbol
+            start_time: Start timestamp in milliseconds
+            end_time: End timestamp in milliseconds
 
         Returns:
-            DataFrame with standardized columns
+            List of klines or None if failed
         """
-        df = pd.DataFrame(
-            klines,
-            columns=[
-                "open_time", "open", "high", "low", "close", "volume",
-                "close_time", "quote_volume", "trades",
-                "taker_base_vol", "taker_quote_vol", "ignore"
-            ]
-        )
+        now_ms = int(time.time() * 1000)
+        cacheable = end_time < now_ms - 2 * _interval_ms(self.interval)
+        path = self._response_cache_path(symbol, start_time, end_time)
 
-        # Convert timestamp columns to datetime
-        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
+        if cacheable and path.exists():
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable kline cache file {path}: {e}")
 
-        # Convert numeric columns
-        numeric_cols = [
-            "open", "high", "low", "close", "volume",
-            "quote_volume", "taker_base_vol", "taker_quote_vol"
-        ]
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+        _REQUEST_PACER.wait()
+        klines = self._fetch_klines(symbol, start_time, end_time)
 
-        df["trades"] = pd.to_numeric(df["trades"], errors="coerce").astype("int64")
+        if cacheable and klines is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so an interrupted run never leaves a torn entry
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                    json.dump(klines, f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to cache klines for {symbol}: {e}")
 
-        # Drop the ignore column
-        df = df.drop(columns=["ignore"])
+        return klines
+
+    def _klines_to_dataframe(self, klines: List) -> pd.DataFrame:
+        """
+        Convert Binance klines to pandas DataFrame.
+
+        Args:
+            klines: List of kline arrays from Binance API
+
+        Returns:
+            DataFrame with standardized columns
+        """
+        # Transpose once, then convert each column with a single C-level cast.
+        # Binance sends prices/volumes as strings and times/trades as ints;
+        # slot 11 ("ignore") is never materialised.
+        columns = list(zip(*klines)) if klines else [()] * 12
+
+        def as_float(idx: int) -> np.ndarray:
+            return np.asarray(columns[idx], dtype=np.float64)
+
+        def as_int(idx: int) -> np.ndarray:
+            return np.asarray(columns[idx], dtype=np.int64)
+
+        df = pd.DataFrame({
+            "open_time": pd.to_datetime(as_int(0), unit="ms", utc=True),
+            "open": as_float(1),
+            "high": as_float(2),
+            "low": as_float(3),
+            "close": as_float(4),
+            "volume": as_float(5),
+            "close_time": pd.to_datetime(as_int(6), unit="ms", utc=True),
+            "quote_volume": as_float(7),
+            "trades": as_int(8),
+            "taker_base_vol": as_float(9),
+            "taker_quote_vol": as_float(10),
+        })
 
         return df
 
-    def _write_parquet(self, df: pd.DataFrame, symbol: str):
+    def _write_parquet(self, df: pd.DataFrame, symbol: str) -> int:
         """
-        Write DataFrame to partitioned Parquet files.
+        Write DataFrame to monthly partitioned Parquet files.
+
+        Each month is a single year=YYYY/month=MM/data.parquet file holding
+        one row group per UTC day, so readers still prune to a day using
+        row-group statistics on open_time. A month whose existing files
+        cannot be read is skipped rather than overwritten.
 
         Args:
             df: DataFrame with kline data
             symbol: Trading pair symbol
+
+        Returns:
+            Number of rows from df that were written
         """
         if df.empty:
             logger.warning(f"No data to write for {symbol}")
-            return
-
-        # Add partition columns
-        df["year"] = df["open_time"].dt.year
-        df["month"] = df["open_time"].dt.month
-        df["day"] = df["open_time"].dt.day
-
-        # Group by date and write each partition
-        for (year, month, day), group in df.groupby(["year", "month", "day"]):
-            partition_dir = (
-                self.base_dir / symbol / f"year={year}" / f"month={month:02d}" / f"day={day:02d}"
-            )
-            partition_dir.mkdir(parents=True, exist_ok=True)
-
-            # Drop partition columns from data
-            data_df = group.drop(columns=["year", "month", "day"])
-
-            # Check for existing data and merge
-            existing_file = partition_dir / "data.parquet"
-            if existing_file.exists():
+            return 0
+
+        # Sort once, then slice contiguous month ranges (without mutating df)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        open_ms = _epoch_ms(table["open_time"])
+        if np.any(open_ms[1:] < open_ms[:-1]):
+            order = np.argsort(open_ms, kind="stable")
+            table = table.take(order)
+            open_ms = open_ms[order]
+        months = open_ms.astype("datetime64[ms]").astype("datetime64[M]")
+        bounds = (np.flatnonzero(months[1:] != months[:-1]) + 1).tolist()
+
+        written = 0
+
+        for start, end in zip([0, *bounds], [*bounds, table.num_rows]):
+            month_start = months[start].item()
+            year, month = month_start.year, month_start.month
+            month_dir = self._month_dir(symbol, year, month)
+            if month_dir not in self._ensured_dirs:
+                month_dir.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(month_dir)
+
+            batch = table.slice(start, end - start)
+            new_rows = batch.num_rows
+
+            # Merge with existing data, folding in any legacy day=DD files
+            existing_files = self._month_files(month_dir)
+            if existing_files:
                 try:
-                    existing_df = pd.read_parquet(existing_file)
-                    # Combine and deduplicate
-                    combined_df = pd.concat([existing_df, data_df], ignore_index=True)
-                    combined_df = combined_df.drop_duplicates(subset=["open_time"], keep="last")
-                    combined_df = combined_df.sort_values("open_time")
-                    data_df = combined_df
+                    existing = pa.concat_tables([
+                        pq.read_table(path, partitioning=None) for path in existing_files
+                    ])
+                    batch = _merge_on_open_time(existing, batch)
                 except Exception as e:
-                    logger.warning(f"Failed to merge with existing data: {e}")
+                    # Never replace a month we could not read: that would drop
+                    # every stored kline in it, not just this batch
+                    logger.error(
+                        f"Failed to merge with existing data for {symbol} in "
+                        f"{year}-{month:02d}, skipping {new_rows} rows: {e}"
+                    )
+                    continue
+
+            month_file = month_dir / "data.parquet"
+            self._write_month_file(batch, month_file)
 
-            # Write to Parquet (reset index to avoid __index_level_0__ column)
-            data_df = data_df.reset_index(drop=True)
-            table = pa.Table.from_pandas(data_df, preserve_index=False)
-            pq.write_table(table, existing_file, compression="snappy")
+            for path in existing_files:
+                if path != month_file:
+                    path.unlink()
+                    try:
+                        path.parent.rmdir()
+                    except OSError:
+                        pass
 
+            written += new_rows
             logger.debug(
-                f"Wrote {len(data_df)} rows to {symbol}/year={year}/month={month:02d}/day={day:02d}"
+                f"Wrote {batch.num_rows} rows to {symbol}/year={year}/month={month:02d}"
             )
 
+        return written
+
+    def _write_month_file(self, table: pa.Table, path: Path):
+        """Write a month's open_time-sorted table with one row group per UTC day."""
+        open_ms = _epoch_ms(table["open_time"])
+        bounds = np.flatnonzero(np.diff(open_ms // MS_PER_DAY)) + 1
+        starts = [0, *bounds.tolist()]
+        ends = [*bounds.tolist(), table.num_rows]
+
+        # Write then rename so an interrupted run never leaves a torn month
+        tmp_path = path.with_name(path.name + ".tmp")
+        with pq.ParquetWriter(
+            tmp_path,
+            table.schema,
+            compression=self.PARQUET_COMPRESSION,
+            compression_level=self.PARQUET_COMPRESSION_LEVEL,
+            use_dictionary=True,
+            data_page_size=1 << 20,
+            write_statistics=True,
+            sorting_columns=[pq.SortingColumn(table.schema.get_field_index("open_time"))],
+        ) as writer:
+            for start, end in zip(starts, ends):
+                writer.write_table(table.slice(start, end - start), row_group_size=end - start)
+        os.replace(tmp_path, path)
+
     def backfill_symbol(
         self,
         symbol: str,
@@ -250,59 +492,81 @@ class BinanceBackfiller:
         )
 
         total_rows = 0
-        current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        while current_date < end_date:
-            # Fetch one day at a time
-            day_start = int(current_date.timestamp() * 1000)
-            day_end = int((current_date + timedelta(days=1)).timestamp() * 1000)
-
-            logger.info(f"Fetching {symbol} for {current_date.date()}")
-
-            # Check for existing data
-            existing_timestamps = self._get_existing_timestamps(symbol, current_date)
-            if existing_timestamps:
-                logger.debug(
-                    f"Found {len(existing_timestamps)} existing timestamps for {symbol} "
-                    f"on {current_date.date()}"
-                )
-
-            # Fetch klines
-            klines = self._fetch_klines(symbol, day_start, day_end)
-
-            if klines is None:
-                logger.error(f"Failed to fetch data for {symbol} on {current_date.date()}")
-                current_date += timedelta(days=1)
-                continue
-
-            if not klines:
-                logger.warning(f"No data returned for {symbol} on {current_date.date()}")
-                current_date += timedelta(days=1)
-                continue
-
-            # Convert to DataFrame
-            df = self._klines_to_dataframe(klines)
-
-            # Filter out existing timestamps
-            if existing_timestamps:
-                df = df[~df["open_time"].isin(existing_timestamps)]
-
-            # Write to Parquet
-            if not df.empty:
-                self._write_parquet(df, symbol)
-                total_rows += len(df)
-                logger.info(
-                    f"Wrote {len(df)} new rows for {symbol} on {current_date.date()} "
-                    f"(total: {total_rows})"
-                )
-            else:
-                logger.debug(f"No new data for {symbol} on {current_date.date()}")
-
-            # Move to next day
-            current_date += timedelta(days=1)
-
-            # Rate limit: sleep to avoid hitting limits
-            time.sleep(0.1)  # 10 requests per second max
+        # Day windows as integer epoch-ms offsets from the first midnight
+        first_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        base_ms = int(first_day.timestamp() * 1000)
+        end_ms = int(end_date.timestamp() * 1000)
+        n_days = max(0, -(-(end_ms - base_ms) // MS_PER_DAY))
+        day_starts = [base_ms + i * MS_PER_DAY for i in range(n_days)]
+        days = [(first_day + timedelta(days=i)).date() for i in range(n_days)]
+
+        def fetch_day(i: int) -> Optional[List]:
+            # Fetch one day at a time, paced across all fetch threads
+            logger.info(f"Fetching {symbol} for {days[i]}")
+            return self._fetch_klines_cached(symbol, day_starts[i], day_starts[i] + MS_PER_DAY)
+
+        # New klines are buffered per month and written once the backfill
+        # moves past it, so each month file is merged and rewritten once
+        pending: List[pd.DataFrame] = []
+        pending_month: Optional[Tuple[int, int]] = None
+        buffered_until = -1  # Last open time buffered, epoch ms
+
+        def flush(before_ms: Optional[int] = None) -> int:
+            """Write buffered klines, keeping those at or after before_ms buffered."""
+            nonlocal pending
+            if not pending:
+                return 0
+            df = pd.concat(pending, ignore_index=True)
+            pending = []
+            if before_ms is not None:
+                later = df["open_time"] >= pd.Timestamp(before_ms, unit="ms", tz="UTC")
+                if later.any():
+                    pending = [df[later]]
+                    df = df[~later]
+            return self._write_parquet(df, symbol) if not df.empty else 0
+
+        # Day windows are fetched concurrently; results are consumed in date
+        # order so dedup and partition writes stay sequential
+        workers = max(1, min(self.FETCH_WORKERS, len(days)))
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"klines-{symbol}") as executor:
+                for day, day_start, klines in zip(days, day_starts, executor.map(fetch_day, range(n_days))):
+                    if (day.year, day.month) != pending_month:
+                        total_rows += flush(day_start)
+                        pending_month = (day.year, day.month)
+
+                    if klines is None:
+                        logger.error(f"Failed to fetch data for {symbol} on {day}")
+                        continue
+
+                    if not klines:
+                        logger.warning(f"No data returned for {symbol} on {day}")
+                        continue
+
+                    # Drop klines already stored or buffered before building the
+                    # DataFrame (day windows share their midnight boundary kline)
+                    open_ms = np.fromiter((k[0] for k in klines), dtype=np.int64, count=len(klines))
+                    existing = self._existing_mask(symbol, open_ms) | (open_ms <= buffered_until)
+                    if existing.any():
+                        logger.debug(
+                            f"Found {int(existing.sum())} existing timestamps for {symbol} "
+                            f"on {day}"
+                        )
+                        klines = list(itertools.compress(klines, ~existing))
+                        open_ms = open_ms[~existing]
+
+                    # Convert to DataFrame
+                    df = self._klines_to_dataframe(klines)
+
+                    if not df.empty:
+                        pending.append(df)
+                        buffered_until = max(buffered_until, int(open_ms.max()))
+                        logger.info(f"Fetched {len(df)} new rows for {symbol} on {day}")
+                    else:
+                        logger.debug(f"No new data for {symbol} on {day}")
+        finally:
+            # Keep what was fetched if a later day fails
+            total_rows += flush()
 
         logger.info(f"Backfill complete for {symbol}: {total_rows} total rows written")
         return total_rows
@@ -312,30 +576,45 @@ def backfill_binance(
     symbols: List[str],
     lookback_days: int,
     base_dir: Path,
-    interval: str = "1m"
+    interval: str = "1m",
+    max_workers: Optional[int] = None,
 ) -> dict:
     """
     Backfill historical data for multiple symbols.
 
+    Symbols are fetched concurrently, each worker with its own backfiller
+    (and HTTP session); per-request throttling and 429 handling still apply.
+
     Args:
         symbols: List of trading pair symbols
         lookback_days: Number of days to backfill
         base_dir: Base directory for backfill data
         interval: Kline interval (default: 1m)
+        max_workers: Concurrent symbols (default: min(4, len(symbols)))
 
     Returns:
         Dictionary mapping symbols to row counts
     """
-    backfiller = BinanceBackfiller(base_dir, interval)
-    results = {}
+    # Pre-seed so results keep the caller's symbol order
+    results = {symbol: 0 for symbol in symbols}
+    if not symbols:
+        logger.info("Backfill complete: 0 total rows across 0 symbols")
+        return results
 
-    for symbol in symbols:
-        try:
-            rows = backfiller.backfill_symbol(symbol, lookback_days)
-            results[symbol] = rows
-        except Exception as e:
-            logger.error(f"Failed to backfill {symbol}: {e}")
-            results[symbol] = 0
+    workers = max_workers or min(DEFAULT_MAX_WORKERS, len(symbols))
+
+    def _run(symbol: str) -> int:
+        return BinanceBackfiller(base_dir, interval).backfill_symbol(symbol, lookback_days)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as executor:
+        futures = {executor.submit(_run, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result() or 0
+            except Exception as e:
+                logger.error(f"Failed to backfill {symbol}: {e}")
+                results[symbol] = 0
 
     # Summary
     total_rows = sum(results.values())
@@ -1,16 +1,51 @@
+import copy
+import functools
 import glob
+import json
 import os
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import duckdb
 from loguru import logger
 import yaml
 
-def load_config(path: str = "config.yml") -> Dict[str, Any]:
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# libyaml's C loader when available (same results, much faster than pure Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file; cached per (path, mtime_ns, size) so edits are picked up."""
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+def load_yaml_cached(path: str) -> Any:
+    """
+    Parse a YAML file, reusing the previous parse while the file is unchanged.
+
+    Returns a deep copy so callers can mutate the result freely.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    return copy.deepcopy(_parse_yaml(key, st.st_mtime_ns, st.st_size))
+
+def load_config(path: str = "config.yml") -> Dict[str, Any]:
+    return load_yaml_cached(path)
 
 def is_test_mode(config: Dict[str, Any], args: Optional[Any] = None) -> bool:
     """
@@ -31,6 +66,9 @@ def is_test_mode(config: Dict[str, Any], args: Optional[Any] = None) -> bool:
 
     return config.get("testing", {}).get("enabled", False)
 
+# Uncolored log file format (color markup is pure overhead on disk)
+LOG_FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+
 def setup_logging(app_name: str, config: Dict[str, Any], test_mode: bool = False) -> None:
     """
     Set up logging with rotation.
@@ -52,6 +90,7 @@ def setup_logging(app_name: str, config: Dict[str, Any], test_mode: bool = False
     level = str(config["general"].get("log_level", "INFO")).upper()
     log_path = os.path.join(logs_dir, f"{app_name}.log")
     logger.remove()
+    # Plain format on disk; records are formatted and written on loguru's worker thread
     logger.add(
         log_path,
         rotation="00:00",
@@ -59,8 +98,9 @@ def setup_logging(app_name: str, config: Dict[str, Any], test_mode: bool = False
         level=level,
         backtrace=True,
         diagnose=False,
-        enqueue=False,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        enqueue=True,
+        colorize=False,
+        format=LOG_FILE_FORMAT,
     )
     logger.add(
         lambda msg: print(msg, end=""),
@@ -106,30 +146,105 @@ def get_local_date_str_utc(epoch: Optional[float] = None) -> str:
         return datetime.now(timezone.utc).strftime("%Y-%m-%d")
     return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d")
 
+def json_loads(data: Any) -> Any:
+    """Decode JSON bytes or str with orjson when installed, else the stdlib json module."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _parquet_files_exist(path_pattern: str) -> bool:
+    return any(os.path.isfile(f) for f in glob.glob(path_pattern, recursive=True))
+
+def _glob_root(path_pattern: str) -> str:
+    """Deepest directory of a glob pattern that contains no wildcards."""
+    wildcard = min((i for i in map(path_pattern.find, "*?[") if i >= 0), default=len(path_pattern))
+    return os.path.dirname(path_pattern[:wildcard]) or "."
+
 def wait_for_parquet_files(path_pattern: str, timeout: int = 90, check_interval: int = 5) -> bool:
     """
     Wait until at least one Parquet file matching pattern exists.
 
+    With watchdog installed, the pattern's root directory is watched and the
+    glob is only re-checked when a .parquet file is created or moved in;
+    otherwise the glob is polled every check_interval seconds.
+
     Args:
         path_pattern: Glob pattern for Parquet files (e.g., "D:/CryptoDataLake/**/*.parquet")
         timeout: Maximum seconds to wait (default: 90)
-        check_interval: Seconds between checks (default: 5)
+        check_interval: Seconds between checks when polling (default: 5)
 
     Returns:
         True if files found, False if timeout reached
     """
+    if _parquet_files_exist(path_pattern):
+        return True
+
+    root = _glob_root(path_pattern)
+    if WATCHDOG_AVAILABLE and os.path.isdir(root):
+        return _watch_for_parquet_files(path_pattern, root, timeout)
+
     start = time.time()
     while time.time() - start < timeout:
-        files = glob.glob(path_pattern, recursive=True)
-        if any(os.path.isfile(f) for f in files):
-            return True
         time.sleep(check_interval)
+        if _parquet_files_exist(path_pattern):
+            return True
     return False
 
+def _watch_for_parquet_files(path_pattern: str, root: str, timeout: float) -> bool:
+    """Block on filesystem events under root until the pattern matches a file."""
+    arrived = threading.Event()
+
+    class _ParquetHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            path = getattr(event, "dest_path", "") or event.src_path
+            if not event.is_directory and str(path).endswith(".parquet"):
+                arrived.set()
+
+    observer = Observer()
+    observer.schedule(_ParquetHandler(), root, recursive=True)
+    observer.start()
+    try:
+        deadline = time.monotonic() + timeout
+        # Checked once the watch is live, so a file created meanwhile is not missed
+        while not _parquet_files_exist(path_pattern):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not arrived.wait(remaining):
+                return False
+            arrived.clear()
+        return True
+    finally:
+        observer.stop()
+        observer.join()
+
+# Shared in-memory DuckDB for helper queries; callers take a cursor each
+_DUCK: Optional[duckdb.DuckDBPyConnection] = None
+_DUCK_LOCK = threading.Lock()
+
+def _get_duck() -> duckdb.DuckDBPyConnection:
+    """Lazily open the module's DuckDB connection, with footer/file caching on."""
+    global _DUCK
+    with _DUCK_LOCK:
+        if _DUCK is None:
+            conn = duckdb.connect(":memory:")
+            conn.execute("SET enable_object_cache=true")
+            try:
+                conn.execute("SET enable_external_file_cache=true")
+            except duckdb.Error:
+                pass  # Setting only exists in newer DuckDB releases
+            _DUCK = conn
+        return _DUCK
+
+# Parquet row counts by path as (st_mtime_ns, st_size, rows); an entry is
+# reused only while the file is unchanged
+_ROWCOUNT_CACHE: Dict[str, Tuple[int, int, int]] = {}
+
 def safe_count_parquet(pattern: str) -> int:
     """
     Safely count rows in Parquet files matching pattern.
 
+    Per-file counts are cached by mtime and size, so repeated calls only
+    scan files that are new or have changed since the last call.
+
     Args:
         pattern: Glob pattern for Parquet files
 
@@ -137,13 +252,74 @@ def safe_count_parquet(pattern: str) -> int:
         Row count, or 0 if no files found or error occurred
     """
     try:
-        conn = duckdb.connect(":memory:")
-        result = conn.execute(f"SELECT COUNT(*) FROM read_parquet('{pattern}')").fetchone()
-        conn.close()
-        return result[0] if result else 0
+        counts: Dict[str, int] = {}
+        pending: Dict[str, Tuple[int, int]] = {}
+        for path in glob.glob(pattern, recursive=True):
+            st = os.stat(path)
+            cached = _ROWCOUNT_CACHE.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                counts[path] = cached[2]
+            else:
+                pending[path] = (st.st_mtime_ns, st.st_size)
+
+        if not counts and not pending:
+            logger.debug(f"No Parquet files found at {pattern}, returning 0.")
+            return 0
+
+        if pending:
+            # One scan over just the new or changed files
+            cursor = _get_duck().cursor()
+            try:
+                rows = cursor.execute(
+                    "SELECT filename, COUNT(*) FROM read_parquet(?, filename=true) GROUP BY filename",
+                    [list(pending)],
+                ).fetchall()
+            finally:
+                cursor.close()
+            by_file = {os.path.normpath(filename): count for filename, count in rows}
+            for path, (mtime_ns, size) in pending.items():
+                count = by_file.get(os.path.normpath(path), 0)
+                _ROWCOUNT_CACHE[path] = (mtime_ns, size, count)
+                counts[path] = count
+
+        return sum(counts.values())
     except duckdb.IOException:
         logger.debug(f"No Parquet files found at {pattern}, returning 0.")
         return 0
     except Exception as e:
         logger.warning(f"Unexpected error counting parquet at {pattern}: {e}")
         return 0
+
+# Binance REST request weight budget per UTC minute
+BINANCE_WEIGHT_LIMIT_1M = 1200
+# Pause proactively once used weight crosses 90% of the budget
+BINANCE_WEIGHT_PAUSE_AT = int(BINANCE_WEIGHT_LIMIT_1M * 0.9)
+# Request pace for weight-1 endpoints (klines), leaving headroom under the budget
+BINANCE_REQUESTS_PER_MINUTE = 1100
+
+def binance_used_weight(headers: Any) -> Optional[int]:
+    """Request weight used this minute, from the X-MBX-USED-WEIGHT-1M header."""
+    try:
+        return int(headers.get("X-MBX-USED-WEIGHT-1M"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def binance_weight_pause(headers: Any, now: Optional[float] = None) -> float:
+    """
+    Seconds to hold off further requests based on the used-weight header.
+
+    Returns the time until the weight window resets (next UTC minute) once
+    used weight is past BINANCE_WEIGHT_PAUSE_AT, otherwise 0.
+    """
+    used = binance_used_weight(headers)
+    if used is None or used <= BINANCE_WEIGHT_PAUSE_AT:
+        return 0.0
+    now = time.time() if now is None else now
+    return 60.0 - (now % 60.0)
+
+def binance_retry_after(headers: Any, default: float) -> float:
+    """Seconds to wait from a 418/429 Retry-After header, or default if absent."""
+    try:
+        return float(headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return default
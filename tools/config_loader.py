@@ -14,7 +14,8 @@ Environment variables (override config.yml values):
 
 from pathlib import Path
 import os
-import yaml
+
+from tools.common import load_yaml_cached
 
 
 def load_config(path: str = "config.yml") -> dict:
@@ -30,8 +31,7 @@ def load_config(path: str = "config.yml") -> dict:
     cfg = {}
     p = Path(path)
     if p.exists():
-        with open(p, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+        cfg = load_yaml_cached(str(p)) or {}
 
     # ENV overrides (env-first approach for cloud deployments)
     cfg.setdefault("database", {})
@@ -5,20 +5,29 @@ Handles @@BASE@@ placeholder resolution from config.yml for all SQL views.
 Supports multi-engine architecture: DuckDB, SQLite, and PostgreSQL.
 """
 
-import glob
+import atexit
+import functools
 import os
-from typing import Dict, Optional, Union
+import re
+import sys
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import duckdb
 from loguru import logger
 
-try:
+# duckdb and SQLAlchemy are heavy imports; they are loaded on first use so
+# tools that only need path helpers (normalise_base, load_views_sql) start fast
+if TYPE_CHECKING:
+    import duckdb
     from sqlalchemy.engine import Engine
-    from tools.sql_manager import init_database, register_views_if_supported
-    SQLALCHEMY_AVAILABLE = True
-except ImportError:
-    SQLALCHEMY_AVAILABLE = False
-    Engine = None
+
+
+def __getattr__(name: str):
+    """Resolve ``tools.db.duckdb`` lazily (kept for callers that patch it)."""
+    if name == "duckdb":
+        import duckdb
+        return duckdb
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def is_sqlalchemy_engine(conn) -> bool:
@@ -31,9 +40,63 @@ def is_sqlalchemy_engine(conn) -> bool:
     Returns:
         True if SQLAlchemy Engine, False if DuckDB connection
     """
-    if Engine and isinstance(conn, Engine):
+    # Neither type can exist unless its module has been imported, so check
+    # sys.modules rather than importing. DuckDB is the common case; settle it first.
+    duckdb_mod = sys.modules.get("duckdb")
+    if duckdb_mod is not None and isinstance(conn, duckdb_mod.DuckDBPyConnection):
+        return False
+    engine_mod = sys.modules.get("sqlalchemy.engine")
+    if engine_mod is not None and isinstance(conn, engine_mod.Engine):
         return True
-    return hasattr(conn, 'execute') and not isinstance(conn, duckdb.DuckDBPyConnection)
+    return hasattr(conn, 'execute')
+
+
+# Materialised bars_1m: the rollup view is renamed to a source view and a
+# table of the same name is built from it, tracked by a watermark table.
+BARS_1M_VIEW_DDL = "CREATE OR REPLACE VIEW bars_1m AS"
+BARS_1M_SOURCE = "_bars_1m_source"
+BARS_1M_WATERMARK = "_bars_1m_wm"
+
+# Native DuckDB store for bars_1s (see tools/ingest_duckdb.py), attached
+# read-only when present. bars_1s then reads each ingested partition from the
+# store while its files are unchanged, and everything else (the current day,
+# new or rewritten partitions) from the Parquet glob.
+BARS_1S_VIEW_DDL = "CREATE OR REPLACE VIEW bars_1s AS"
+DUCKDB_STORE_FILENAME = "bars.duckdb"
+DUCKDB_STORE_ALIAS = "store"
+BARS_1S_STORE_COLUMNS = (
+    "'binance' AS exchange, symbol, window_start AS ts, open, high, low, close, "
+    "volume_base, volume_quote, trade_count, vwap, bid, ask, spread"
+)
+BARS_1S_PARQUET_DIR = "parquet/binance"
+# Ingest bookkeeping: partition key -> file signature at ingest time. Store
+# rows carry their partition key in STORE_PARTITION_COLUMN.
+STORE_INGESTED_TABLE = "_ingested_partitions"
+STORE_PARTITION_COLUMN = "_partition"
+# Per-connection list of store partitions still matching their files
+STORE_PARTITIONS_TABLE = "_bars_1s_store_partitions"
+
+# Object-store prefixes that need DuckDB's httpfs extension
+REMOTE_PREFIXES = ("s3://", "gs://", "gcs://", "http://", "https://")
+HTTPFS_SETUP_SQL = "INSTALL httpfs;\nLOAD httpfs;\nSET http_keep_alive=true;\n\n"
+
+# In-memory DuckDB instances with every view registered, keyed by resolved
+# views SQL, for connect_and_register_views(shared=True); callers get cursors,
+# which share the catalog and settings
+_VIEWS_DB_CACHE: Dict[str, "duckdb.DuckDBPyConnection"] = {}
+_VIEWS_DB_LOCK = threading.Lock()
+
+
+@atexit.register
+def _close_cached_view_dbs() -> None:
+    """Close cached view databases (also used by tests to reset the cache)."""
+    with _VIEWS_DB_LOCK:
+        for conn in _VIEWS_DB_CACHE.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        _VIEWS_DB_CACHE.clear()
 
 
 def normalise_base(base_path: str) -> str:
@@ -51,13 +114,79 @@ def normalise_base(base_path: str) -> str:
     return base_path.replace("\\", "/").rstrip("/")
 
 
-def load_views_sql(base_path: str, sql_path: str = "sql/views.sql") -> str:
+def is_remote_base(base_path: str) -> bool:
+    """
+    Check if base path points at an object store or HTTP location.
+
+    Args:
+        base_path: Base data lake path
+
+    Returns:
+        True for s3://, gs://, gcs:// and http(s):// paths
+    """
+    return base_path.lower().startswith(REMOTE_PREFIXES)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_views_template(sql_path: str, mtime_ns: int) -> str:
+    """
+    Read the raw views SQL (with @@BASE@@ placeholders).
+
+    Cached per process; the mtime argument invalidates the cache when the
+    file changes on disk.
+
+    Args:
+        sql_path: Absolute path to views.sql
+        mtime_ns: File modification time in ns (cache key only)
+
+    Returns:
+        Unresolved SQL text
+    """
+    with open(sql_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_views_sql(sql_path: str, mtime_ns: int, base_norm: str, materialize: bool) -> str:
+    """
+    Resolve the views SQL for one base path.
+
+    Cached per (path, mtime, base, materialize) so repeated connections to
+    the same lake skip the substitution and rewrites.
+    """
+    sql = _read_views_template(sql_path, mtime_ns)
+
+    # Replace @@BASE@@ with actual path
+    sql_resolved = sql.replace("@@BASE@@", base_norm)
+
+    # Verify no placeholders remain
+    if "@@BASE@@" in sql_resolved:
+        logger.warning("@@BASE@@ placeholder still present after replacement")
+
+    # Remote lakes read through httpfs with connection reuse across range GETs
+    if is_remote_base(base_norm):
+        sql_resolved = HTTPFS_SETUP_SQL + sql_resolved
+
+    if materialize:
+        sql_resolved = _materialize_bars_1m(sql_resolved)
+
+    return sql_resolved
+
+
+def load_views_sql(
+    base_path: str,
+    sql_path: str = "sql/views.sql",
+    materialize: bool = False,
+) -> str:
     """
     Load SQL views file and replace @@BASE@@ placeholder with actual base path.
 
     Args:
         base_path: Base data lake path from config
         sql_path: Path to views.sql file (relative to project root)
+        materialize: If True, emit bars_1m as a table built from a source view
+            so repeated queries read stored minutes instead of re-aggregating
+            bars_1s (see refresh_bars_1m)
 
     Returns:
         SQL string with @@BASE@@ replaced by normalized base path
@@ -71,48 +200,245 @@ def load_views_sql(base_path: str, sql_path: str = "sql/views.sql") -> str:
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         sql_path = os.path.join(project_root, sql_path)
 
-    if not os.path.exists(sql_path):
-        raise FileNotFoundError(f"Views SQL file not found: {sql_path}")
+    try:
+        mtime_ns = os.stat(sql_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Views SQL file not found: {sql_path}") from None
 
-    # Read and replace placeholder
-    with open(sql_path, "r", encoding="utf-8") as f:
-        sql = f.read()
+    # Resolved SQL is cached per (path, mtime, base); a file edit invalidates it
+    return _resolve_views_sql(sql_path, mtime_ns, base_norm, materialize)
 
-    # Replace @@BASE@@ with actual path
-    sql_resolved = sql.replace("@@BASE@@", base_norm)
 
-    # Verify no placeholders remain
-    if "@@BASE@@" in sql_resolved:
-        logger.warning("@@BASE@@ placeholder still present after replacement")
+def duckdb_store_path(base_path: str, config: Optional[Dict] = None) -> Optional[str]:
+    """
+    Resolve the DuckDB store path for bars_1s.
 
-    return sql_resolved
+    Args:
+        base_path: Base data lake path
+        config: Optional configuration; duckdb.store_path overrides the
+            default location and duckdb.use_store: false disables the store
+
+    Returns:
+        Store path, or None when the store is disabled
+    """
+    duckdb_config = (config or {}).get("duckdb", {})
+    if not duckdb_config.get("use_store", True):
+        return None
+    return duckdb_config.get("store_path") or f"{normalise_base(base_path)}/{DUCKDB_STORE_FILENAME}"
+
+
+def partition_key(root: str, partition_dir: str) -> str:
+    """Partition directory relative to the bars root, with forward slashes."""
+    key = os.path.relpath(partition_dir, root).replace("\\", "/")
+    return "" if key == "." else key
+
+
+def partition_signature(partition_dir: str) -> str:
+    """File count, total size and newest mtime of a partition's Parquet files."""
+    count = size = newest = 0
+    with os.scandir(partition_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".parquet") and entry.is_file():
+                st = entry.stat()
+                count += 1
+                size += st.st_size
+                newest = max(newest, st.st_mtime_ns)
+    return f"{count}:{size}:{newest}"
+
+
+def _current_store_partitions(conn: "duckdb.DuckDBPyConnection", root: str) -> List[str]:
+    """Keys of store partitions whose Parquet files are unchanged since ingest."""
+    current = []
+    rows = conn.execute(
+        f"SELECT partition, signature FROM {DUCKDB_STORE_ALIAS}.{STORE_INGESTED_TABLE}"
+    ).fetchall()
+    for key, signature in rows:
+        try:
+            if signature == partition_signature(f"{root}/{key}" if key else root):
+                current.append(key)
+        except OSError:
+            pass
+    return current
+
+
+def _store_bars_1s_sql(root: str) -> str:
+    """bars_1s over current store partitions plus Parquet for all other partitions."""
+    # Partition key of each Parquet file: its directory relative to root
+    file_key = (
+        f"regexp_replace(substr(replace(filename, '\\', '/'), {len(root) + 2}), "
+        "'(^|/)[^/]*$', '')"
+    )
+    return (
+        f"{BARS_1S_VIEW_DDL}\n"
+        f"SELECT * EXCLUDE ({STORE_PARTITION_COLUMN}) FROM {DUCKDB_STORE_ALIAS}.bars_1s\n"
+        f"WHERE {STORE_PARTITION_COLUMN} IN (SELECT partition FROM {STORE_PARTITIONS_TABLE})\n"
+        "UNION ALL\n"
+        f"SELECT {BARS_1S_STORE_COLUMNS}\n"
+        f"FROM read_parquet('{root}/**/*.parquet', filename=true)\n"
+        "WHERE window_start IS NOT NULL\n"
+        f"  AND {file_key} NOT IN (SELECT partition FROM {STORE_PARTITIONS_TABLE});"
+    )
+
+
+def _replace_view(sql: str, view_ddl: str, replacement: str) -> Optional[str]:
+    """Replace the CREATE statement starting with view_ddl, or None if absent."""
+    start = sql.find(view_ddl)
+    if start < 0:
+        return None
+    end = sql.index(";", start) + 1
+    return f"{sql[:start]}{replacement}{sql[end:]}"
+
+
+def _materialize_bars_1m(sql: str) -> str:
+    """Rewrite the bars_1m view as a source view plus a table built from it."""
+    start = sql.find(BARS_1M_VIEW_DDL)
+    if start < 0:
+        logger.warning("bars_1m view not found, skipping materialisation")
+        return sql
+
+    end = sql.index(";", start) + 1
+    view_sql = sql[start:end].replace(
+        BARS_1M_VIEW_DDL, f"CREATE OR REPLACE VIEW {BARS_1M_SOURCE} AS", 1
+    )
+    table_sql = f"CREATE OR REPLACE TABLE bars_1m AS SELECT * FROM {BARS_1M_SOURCE};"
+
+    return f"{sql[:start]}{view_sql}\n\n{table_sql}{sql[end:]}"
+
+
+def refresh_bars_1m(conn: "duckdb.DuckDBPyConnection") -> int:
+    """
+    Incrementally refresh a materialised bars_1m table.
+
+    Minutes at or after the watermark are recomputed from bars_1s (the last
+    stored minute may have been partial), then the watermark is advanced.
+
+    Args:
+        conn: DuckDB connection created with materialize=True
+
+    Returns:
+        Number of bars_1m rows (re)inserted
+    """
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        last_ts = conn.execute(f"SELECT last_ts FROM {BARS_1M_WATERMARK}").fetchone()[0]
+
+        if last_ts is None:
+            conn.execute("DELETE FROM bars_1m")
+            inserted = conn.execute(
+                f"INSERT INTO bars_1m SELECT * FROM {BARS_1M_SOURCE}"
+            ).fetchone()[0]
+        else:
+            conn.execute("DELETE FROM bars_1m WHERE ts >= ?", [last_ts])
+            inserted = conn.execute(
+                f"INSERT INTO bars_1m SELECT * FROM {BARS_1M_SOURCE} WHERE ts >= ?",
+                [last_ts],
+            ).fetchone()[0]
+
+        conn.execute(f"UPDATE {BARS_1M_WATERMARK} SET last_ts = (SELECT max(ts) FROM bars_1m)")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    logger.info(f"Refreshed bars_1m: {inserted} rows from watermark {last_ts}")
+    return inserted
+
+
+def _find_files(root: str, suffix: str, limit: int) -> list:
+    """
+    Find up to `limit` files under root ending in suffix, stopping early.
+
+    Hidden entries are skipped, as with glob's **; only the directories
+    visited before the limit is reached are listed.
+    """
+    found = []
+    stack = [root]
+    while stack and len(found) < limit:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    found.append(entry.path.replace("\\", "/"))
+                    if len(found) == limit:
+                        break
+    return found
+
+
+# Name of the view/table a CREATE statement defines
+_OBJECT_NAME_RE = re.compile(r"(?is)\b(?:VIEW|TABLE)\s+(?:IF\s+NOT\s+EXISTS\s+)?([A-Za-z_][\w.]*)")
+
+
+# Lexical units that can hide a ";" or a comment marker, plus the separators
+_SQL_TOKEN_RE = re.compile(
+    r"""
+      '(?:[^']|'')*'            # string literal
+    | "(?:[^"]|"")*"            # quoted identifier
+    | \$(\w*)\$.*?\$\1\$        # dollar-quoted body
+    | --[^\n]*                  # line comment
+    | /\*.*?\*/                 # block comment
+    | ;
+    """,
+    re.S | re.X,
+)
 
 
 def _split_sql_statements(sql: str) -> list:
-    """Split SQL text into individual statements, handling semicolons correctly."""
+    """
+    Split SQL text into individual statements with comments removed.
+
+    Semicolons and comment markers inside string literals, quoted
+    identifiers and dollar-quoted bodies are left alone.
+    """
     statements = []
     current = []
-    for line in sql.split("\n"):
-        stripped = line.strip()
-        # Skip pure comment lines
-        if stripped.startswith("--"):
-            continue
-        current.append(line)
-        if stripped.endswith(";"):
-            statements.append("\n".join(current))
+    pos = 0
+    for match in _SQL_TOKEN_RE.finditer(sql):
+        token = match.group(0)
+        if token.startswith(("--", "/*")):
+            current.append(sql[pos:match.start()])
+            pos = match.end()
+        elif token == ";":
+            current.append(sql[pos:match.end()])
+            pos = match.end()
+            statement = "".join(current).strip()
+            if statement != ";":
+                statements.append(statement)
             current = []
     # Catch any trailing statement without semicolon
-    if current and any(l.strip() for l in current):
-        statements.append("\n".join(current))
+    current.append(sql[pos:])
+    tail = "".join(current).strip()
+    if tail:
+        statements.append(tail)
     return statements
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_view_statements(sql: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split resolved views SQL into (statement, created object name) pairs, once per SQL text."""
+    parsed = []
+    for statement in _split_sql_statements(sql):
+        statement = statement.strip()
+        if statement:
+            match = _OBJECT_NAME_RE.search(statement)
+            parsed.append((statement, match.group(1) if match else None))
+    return tuple(parsed)
+
+
 def connect_and_register_views(
     base_path: str,
     sql_path: str = "sql/views.sql",
     database: str = ":memory:",
     config: Optional[Dict] = None,
-) -> Union[duckdb.DuckDBPyConnection, "Engine"]:
+    materialize: bool = False,
+    shared: bool = False,
+) -> Union["duckdb.DuckDBPyConnection", "Engine"]:
     """
     Create database connection and register all views from views.sql.
 
@@ -125,6 +451,20 @@ def connect_and_register_views(
         sql_path: Path to views.sql file
         database: DuckDB database path (default: in-memory)
         config: Optional configuration dictionary with database settings
+        materialize: Store bars_1m as a table (DuckDB only); call
+            refresh_bars_1m to pick up new partitions
+        shared: Return a cursor on a cached in-memory DuckDB instead of a
+            private connection (see below)
+
+    When a bars.duckdb store exists (see duckdb_store_path), bars_1s reads
+    from it read-only instead of the Parquet glob.
+
+    With shared=True, every caller asking for the same view set gets a cursor
+    on one cached database, so views are registered only once. Cursors share
+    the catalog and settings: a CREATE, DROP, SET or ATTACH on one is seen by
+    all other holders. Only opt in for read-only query workloads; callers
+    that create tables or change settings must use the default private
+    connection.
 
     Returns:
         Database connection (SQLAlchemy Engine or DuckDB connection)
@@ -135,30 +475,19 @@ def connect_and_register_views(
 
         # Check if database.url or database.type is configured
         if db_config.get("url") or db_config.get("type"):
-            if not SQLALCHEMY_AVAILABLE:
+            try:
+                from tools.sql_manager import init_database_from_dict, register_views_if_supported
+            except ImportError:
                 logger.warning("Database URL configured but SQLAlchemy not available, falling back to DuckDB")
             else:
                 logger.info("Database URL configured, using SQL engine")
                 try:
-                    # Initialize SQL engine from config
-                    import yaml
-                    import tempfile
-
-                    # Create temporary config file for sql_manager
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
-                        yaml.dump(config, f)
-                        temp_config_path = f.name
+                    engine = init_database_from_dict(config, "auto")
 
-                    try:
-                        engine = init_database("auto", temp_config_path)
-
-                        # Register views if supported
-                        register_views_if_supported(engine, base_path)
-
-                        return engine
-                    finally:
-                        os.remove(temp_config_path)
+                    # Register views if supported
+                    register_views_if_supported(engine, base_path)
 
+                    return engine
                 except Exception as e:
                     logger.error(f"Failed to initialize SQL engine: {e}")
                     logger.info("Falling back to DuckDB in-memory")
@@ -169,46 +498,70 @@ def connect_and_register_views(
     base_norm = normalise_base(base_path)
 
     # Load and resolve SQL
-    sql = load_views_sql(base_path, sql_path)
+    sql = load_views_sql(base_path, sql_path, materialize=materialize)
+
+    # Prefer the native store for bars_1s when it has been ingested
+    store_path = None if is_remote_base(base_norm) else duckdb_store_path(base_path, config)
+    use_store = bool(store_path and os.path.exists(store_path))
+
+    # Shared in-memory view sets are built once per resolved SQL and handed out
+    # as cursors. Store-backed connections are not cached, so ingest can take
+    # the store's write lock once they are closed.
+    cacheable = shared and database == ":memory:" and not materialize and not use_store
+    if cacheable:
+        with _VIEWS_DB_LOCK:
+            root = _VIEWS_DB_CACHE.get(sql)
+        if root is not None:
+            return root.cursor()
+
+    import duckdb
 
     # Connect to DuckDB
     conn = duckdb.connect(database)
 
-    # Verify parquet files exist before registering views
+    if use_store:
+        try:
+            conn.execute(f"ATTACH '{store_path}' AS {DUCKDB_STORE_ALIAS} (READ_ONLY)")
+            root = f"{base_norm}/{BARS_1S_PARQUET_DIR}"
+            current = _current_store_partitions(conn, root)
+            conn.execute(f"CREATE OR REPLACE TABLE {STORE_PARTITIONS_TABLE} (partition VARCHAR)")
+            if current:
+                conn.executemany(
+                    f"INSERT INTO {STORE_PARTITIONS_TABLE} VALUES (?)", [(key,) for key in current]
+                )
+                sql = _replace_view(sql, BARS_1S_VIEW_DDL, _store_bars_1s_sql(root)) or sql
+                logger.info(
+                    f"Using DuckDB store for bars_1s: {store_path} "
+                    f"({len(current)} current partitions, the rest from Parquet)"
+                )
+        except Exception as e:
+            logger.warning(f"Could not attach DuckDB store {store_path}, using Parquet views: {e}")
+
+    # Verify parquet files exist before registering views (local lakes only)
     test_pattern = f"{base_norm}/parquet/binance/**/*.parquet"
-    matches = glob.glob(test_pattern, recursive=True)
-    if matches:
-        # Log first 3 matches for verification
-        examples = (matches + ["", "", ""])[:3]
-        logger.info(f"Parquet check OK. Example matches:\n  {examples[0]}\n  {examples[1]}\n  {examples[2]}")
+    if is_remote_base(base_norm):
+        logger.info(f"Remote base path {base_norm}, skipping local parquet check")
     else:
-        logger.warning(f"No parquet files matched {test_pattern}")
+        matches = _find_files(f"{base_norm}/parquet/binance", ".parquet", limit=3)
+        if matches:
+            # Log first 3 matches for verification
+            examples = (matches + ["", "", ""])[:3]
+            logger.info(f"Parquet check OK. Example matches:\n  {examples[0]}\n  {examples[1]}\n  {examples[2]}")
+        else:
+            logger.warning(f"No parquet files matched {test_pattern}")
 
     # Execute view definitions individually so optional view failures
     # (klines, derivs, macro) don't prevent required views from registering.
     # Split on CREATE OR REPLACE VIEW and also handle PRAGMA statements.
     registered = []
     failed = []
-    for statement in _split_sql_statements(sql):
-        statement = statement.strip()
-        if not statement:
-            continue
+    for statement, name in _parse_view_statements(sql):
         try:
             conn.execute(statement)
-            # Extract view name for logging
-            if "VIEW" in statement.upper():
-                parts = statement.split()
-                idx = next((i for i, p in enumerate(parts) if p.upper() == "VIEW"), -1)
-                if idx >= 0 and idx + 1 < len(parts):
-                    registered.append(parts[idx + 1])
+            if name:
+                registered.append(name)
         except Exception as e:
-            # Extract view name from failed statement
-            view_name = "unknown"
-            if "VIEW" in statement.upper():
-                parts = statement.split()
-                idx = next((i for i, p in enumerate(parts) if p.upper() == "VIEW"), -1)
-                if idx >= 0 and idx + 1 < len(parts):
-                    view_name = parts[idx + 1]
+            view_name = name or "unknown"
             failed.append(view_name)
             logger.debug(f"View {view_name} skipped (missing data source): {e}")
 
@@ -217,20 +570,56 @@ def connect_and_register_views(
     if failed:
         logger.warning(f"Skipped {len(failed)} optional views (missing data): {', '.join(failed)}")
 
+    if materialize and "bars_1m" in registered:
+        conn.execute(
+            f"CREATE OR REPLACE TABLE {BARS_1M_WATERMARK} AS "
+            "SELECT max(ts) AS last_ts FROM bars_1m"
+        )
+
+    # Cache only complete view sets; a skipped optional view is retried on
+    # the next call once its data exists
+    if cacheable and not failed:
+        with _VIEWS_DB_LOCK:
+            root = _VIEWS_DB_CACHE.setdefault(sql, conn)
+        if root is not conn:
+            conn.close()
+        return root.cursor()
+
     return conn
 
 
-def get_connection_with_views(config: dict) -> Union[duckdb.DuckDBPyConnection, "Engine"]:
+# SQLAlchemy engines (connection pools) by (base_path, database config)
+_ENGINE_CACHE: Dict[Tuple[str, str], "Engine"] = {}
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_connection_with_views(config: dict, fresh: bool = False) -> Union["duckdb.DuckDBPyConnection", "Engine"]:
     """
     Convenience wrapper to get a database connection with views from config.
 
     Supports multi-engine architecture based on config.database settings.
+    SQLAlchemy engines are cached per base path and database config, so
+    repeated calls share one pool. DuckDB connections are private to the
+    caller (see connect_and_register_views for the opt-in shared cache).
 
     Args:
         config: Configuration dictionary with general.base_path and optional database settings
+        fresh: Build a new connection/engine instead of reusing a cached one
 
     Returns:
         Database connection (SQLAlchemy Engine or DuckDB connection) with views registered
     """
     base_path = config["general"]["base_path"]
-    return connect_and_register_views(base_path, config=config)
+    key = (base_path, repr(config.get("database")))
+
+    if not fresh:
+        with _ENGINE_LOCK:
+            engine = _ENGINE_CACHE.get(key)
+        if engine is not None:
+            return engine
+
+    conn = connect_and_register_views(base_path, config=config)
+    if is_sqlalchemy_engine(conn):
+        with _ENGINE_LOCK:
+            _ENGINE_CACHE[key] = conn
+    return conn
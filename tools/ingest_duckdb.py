@@ -0,0 +1,217 @@
+"""
+DuckDB native store ingest.
+
+Copies 1-second bar partitions from the Parquet lake into a DuckDB database
+file (bars.duckdb) so interactive queries read DuckDB's native storage, with
+its zonemaps and statistics, instead of re-scanning Parquet globs.
+
+Each day-partition directory is recorded in a bookkeeping table with the
+signature (file count, size, newest mtime) of its Parquet files, and is
+ingested again whenever that signature changes. Partitions for the current
+UTC day are skipped because the transformer is still writing them.
+connect_and_register_views() attaches the store read-only when it exists and
+reads every partition the store does not currently cover from Parquet.
+
+Usage:
+    python -m tools.ingest_duckdb --config config.yml [--include-today]
+"""
+
+import argparse
+import glob
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import duckdb
+from loguru import logger
+
+from tools.common import load_config, setup_logging
+from tools.db import (
+    BARS_1S_PARQUET_DIR,
+    BARS_1S_STORE_COLUMNS,
+    STORE_INGESTED_TABLE,
+    STORE_PARTITION_COLUMN,
+    duckdb_store_path,
+    normalise_base,
+    partition_key,
+    partition_signature,
+)
+
+INGESTED_TABLE = STORE_INGESTED_TABLE
+
+
+def _sql_literal(value: str) -> str:
+    """Quote a string as a SQL literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def find_bar_partitions(base_path: str) -> List[str]:
+    """
+    List day-partition directories holding 1-second bar Parquet files.
+
+    Args:
+        base_path: Base data lake path
+
+    Returns:
+        Sorted list of partition directories (forward slashes)
+    """
+    pattern = os.path.join(base_path, "parquet", "binance", "**", "*.parquet")
+    dirs = {os.path.dirname(path) for path in glob.glob(pattern, recursive=True)}
+    return sorted(normalise_base(d) for d in dirs)
+
+
+def _is_current_day(partition: str, today: datetime) -> bool:
+    """Check if a year=/month=/day= partition path is for today's UTC date."""
+    keys = dict(
+        part.split("=", 1) for part in partition.split("/") if "=" in part
+    )
+    try:
+        return (int(keys["year"]), int(keys["month"]), int(keys["day"])) == (
+            today.year, today.month, today.day
+        )
+    except (KeyError, ValueError):
+        return False
+
+
+def _drop_legacy_store(conn: duckdb.DuckDBPyConnection) -> None:
+    """Drop store tables written before partition tracking so they are rebuilt."""
+    columns = {
+        (table, column)
+        for table, column in conn.execute(
+            "SELECT table_name, column_name FROM duckdb_columns() "
+            "WHERE database_name = current_database() AND table_name IN (?, ?)",
+            ["bars_1s", INGESTED_TABLE],
+        ).fetchall()
+    }
+    tables = {table for table, _ in columns}
+    if (
+        ("bars_1s" in tables and ("bars_1s", STORE_PARTITION_COLUMN) not in columns)
+        or (INGESTED_TABLE in tables and (INGESTED_TABLE, "signature") not in columns)
+    ):
+        logger.warning("DuckDB store predates partition tracking; rebuilding it from Parquet")
+        conn.execute("DROP TABLE IF EXISTS bars_1s")
+        conn.execute(f"DROP TABLE IF EXISTS {INGESTED_TABLE}")
+
+
+def ingest_partitions(
+    base_path: str,
+    store_path: Optional[str] = None,
+    include_today: bool = False,
+) -> Dict[str, Any]:
+    """
+    Ingest new or changed bar partitions into the DuckDB store.
+
+    A partition already in the store is replaced when its Parquet files
+    changed (by count, size or mtime) since it was ingested.
+
+    Args:
+        base_path: Base data lake path
+        store_path: DuckDB database file (default: <base_path>/bars.duckdb)
+        include_today: Also ingest the current UTC day (normally excluded
+            as it is still being written)
+
+    Returns:
+        dict: Statistics about the ingest
+    """
+    store_path = store_path or duckdb_store_path(base_path)
+    today = datetime.now(timezone.utc)
+
+    partitions = [
+        p for p in find_bar_partitions(base_path)
+        if include_today or not _is_current_day(p, today)
+    ]
+
+    root = f"{normalise_base(base_path)}/{BARS_1S_PARQUET_DIR}"
+
+    conn = duckdb.connect(store_path)
+    try:
+        _drop_legacy_store(conn)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {INGESTED_TABLE} "
+            "(partition VARCHAR PRIMARY KEY, rows BIGINT, ingested_at TIMESTAMP, signature VARCHAR)"
+        )
+        done = dict(conn.execute(f"SELECT partition, signature FROM {INGESTED_TABLE}").fetchall())
+
+        # Signatures are taken before reading, so a write racing the ingest
+        # leaves a stale signature and the partition is picked up next run
+        pending = []
+        for partition in partitions:
+            key = partition_key(root, partition)
+            signature = partition_signature(partition)
+            if done.get(key) != signature:
+                pending.append((partition, key, signature))
+
+        ingested_rows = 0
+        refreshed = 0
+        for partition, key, signature in pending:
+            source = (
+                f"SELECT {BARS_1S_STORE_COLUMNS}, {_sql_literal(key)} AS {STORE_PARTITION_COLUMN} "
+                f"FROM read_parquet({_sql_literal(partition + '/*.parquet')}) "
+                "WHERE window_start IS NOT NULL"
+            )
+
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS bars_1s AS {source} LIMIT 0")
+                if key in done:
+                    # Rewritten partition: replace the rows ingested last time
+                    conn.execute(f"DELETE FROM bars_1s WHERE {STORE_PARTITION_COLUMN} = ?", [key])
+                    conn.execute(f"DELETE FROM {INGESTED_TABLE} WHERE partition = ?", [key])
+                    refreshed += 1
+                # Sorted inserts keep per-row-group min/max tight for pruning
+                rows = conn.execute(
+                    f"INSERT INTO bars_1s {source} ORDER BY symbol, ts"
+                ).fetchone()[0]
+                conn.execute(
+                    f"INSERT INTO {INGESTED_TABLE} VALUES (?, ?, now(), ?)",
+                    [key, rows, signature],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            ingested_rows += rows
+            logger.info(f"Ingested {rows:,} rows from {partition}")
+
+        if pending:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bars_symbol_ts ON bars_1s(symbol, ts)")
+    finally:
+        conn.close()
+
+    logger.info(
+        f"DuckDB ingest complete: {len(pending)} new or changed partitions "
+        f"({refreshed} re-ingested), {ingested_rows:,} rows into {store_path}"
+    )
+
+    return {
+        "store_path": store_path,
+        "partitions_ingested": len(pending),
+        "partitions_refreshed": refreshed,
+        "partitions_skipped": len(partitions) - len(pending),
+        "rows_ingested": ingested_rows,
+    }
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Ingest Parquet bars into a DuckDB store")
+    parser.add_argument("--config", type=str, default="config.yml", help="Path to config.yml")
+    parser.add_argument("--store", type=str, default=None,
+                        help="DuckDB store path (default: duckdb.store_path or <base_path>/bars.duckdb)")
+    parser.add_argument("--include-today", action="store_true",
+                        help="Include the current UTC day (normally excluded while still being written)")
+
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    setup_logging("ingest_duckdb", config)
+
+    base_path = config["general"]["base_path"]
+    store_path = args.store or duckdb_store_path(base_path, config)
+
+    ingest_partitions(base_path, store_path, include_today=args.include_today)
+
+
+if __name__ == "__main__":
+    main()
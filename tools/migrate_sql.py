@@ -216,24 +216,24 @@ def import_parquet_to_sql(
                     os.remove(tmp_path)
 
         else:
-            # SQLite or small datasets: Use pandas to_sql with batching
-            logger.info(f"Using pandas to_sql for {table_name}")
+            # SQLite or small datasets: executemany batches in one transaction
+            logger.info(f"Using batched executemany inserts for {table_name}")
 
-            # Import in batches
             imported = 0
-            for i in range(0, row_count, batch_size):
-                batch = df_sample.iloc[i:i+batch_size]
-                batch.to_sql(
-                    table_name,
-                    engine,
-                    if_exists="append",
-                    index=False,
-                    method="multi",
-                )
-                imported += len(batch)
-
-                if row_count > batch_size:
-                    logger.info(f"  Progress: {imported:,}/{row_count:,} rows ({100*imported//row_count}%)")
+            with engine.begin() as conn:
+                for i in range(0, row_count, batch_size):
+                    batch = df_sample.iloc[i:i+batch_size]
+                    batch.to_sql(
+                        table_name,
+                        conn,
+                        if_exists="append",
+                        index=False,
+                        method=None,  # executemany with a prepared statement
+                    )
+                    imported += len(batch)
+
+                    if row_count > batch_size:
+                        logger.info(f"  Progress: {imported:,}/{row_count:,} rows ({100*imported//row_count}%)")
 
             logger.info(f"Imported {imported:,} rows to {table_name}")
 
@@ -101,6 +101,7 @@ class Orchestrator:
 
         # Threading control
         self.stop_event = threading.Event()
+        self.ready_event = threading.Event()  # Set once all threads are started
         self.ws_threads: List[threading.Thread] = []  # One per exchange
         self.macro_thread: Optional[threading.Thread] = None
         self.transform_thread: Optional[threading.Thread] = None
@@ -232,6 +233,7 @@ class Orchestrator:
                 self.health_data["api"]["port"] = self.api_port
             logger.info(f"Started API server on {self.api_host}:{self.api_port}")
 
+        self.ready_event.set()
         logger.info("Orchestrator started successfully")
 
         # Wait for initial data write to complete before validation/health checks
@@ -311,6 +313,26 @@ class Orchestrator:
             with self.health_lock:
                 self.health_data["api"]["status"] = "error"
 
+    def _stop_requested(self) -> asyncio.Event:
+        """
+        Bridge stop_event into the running event loop.
+
+        Returns an asyncio.Event that is set (thread-safely) once stop_event
+        is set, so coroutines can await stop() instead of polling for it.
+        """
+        loop = asyncio.get_running_loop()
+        stop_requested = asyncio.Event()
+
+        def signal_when_stopped():
+            self.stop_event.wait()
+            try:
+                loop.call_soon_threadsafe(stop_requested.set)
+            except RuntimeError:
+                pass  # Loop already closed; the collector exited on its own
+
+        threading.Thread(target=signal_when_stopped, daemon=True).start()
+        return stop_requested
+
     def _run_ws_collector(self, exchange_name: str, symbols: list):
         """
         Run WebSocket collector for a specific exchange in a separate thread.
@@ -334,18 +356,20 @@ class Orchestrator:
                     run_collector(self.config, exchange_name=exchange_name, symbols=symbols, event_bus=self.event_bus)
                 )
 
-                while not self.stop_event.is_set():
-                    if collector_task.done():
-                        try:
-                            await collector_task
-                        except Exception as e:
-                            logger.exception(f"[{exchange_name}] Collector exited with error: {e}")
-                            with self.health_lock:
-                                if exchange_name in self.health_data.get("collectors", {}):
-                                    self.health_data["collectors"][exchange_name]["status"] = "error"
-                        return
-
-                    await asyncio.sleep(1)
+                # Wake on whichever comes first: collector exit or stop()
+                stop_task = asyncio.create_task(self._stop_requested().wait())
+                await asyncio.wait({collector_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+                stop_task.cancel()
+
+                if collector_task.done() and not self.stop_event.is_set():
+                    try:
+                        await collector_task
+                    except Exception as e:
+                        logger.exception(f"[{exchange_name}] Collector exited with error: {e}")
+                        with self.health_lock:
+                            if exchange_name in self.health_data.get("collectors", {}):
+                                self.health_data["collectors"][exchange_name]["status"] = "error"
+                    return
 
                 logger.info(f"Stop requested, cancelling {exchange_name} collector...")
                 collector_task.cancel()
@@ -395,8 +419,8 @@ class Orchestrator:
                     next_run = time.time() + (self.macro_interval_min * 60)
                     logger.info(f"Next macro fetch scheduled in {self.macro_interval_min} minutes")
 
-                # Sleep for a short interval to check stop event frequently
-                time.sleep(10)
+                # Wait a short interval, waking immediately on stop
+                self.stop_event.wait(10)
 
         except Exception as e:
             logger.exception(f"Macro fetcher loop failed: {e}")
@@ -501,10 +525,8 @@ class Orchestrator:
             if self.test_mode:
                 # TEST MODE: Force transform after 2-minute warmup
                 logger.warning("[TEST MODE] Waiting 2 minutes before guaranteed initial transform")
-                for _ in range(120):  # 2 minutes
-                    if self.stop_event.is_set():
-                        return
-                    time.sleep(1)
+                if self.stop_event.wait(120):  # 2 minutes
+                    return
 
                 logger.warning("[TEST MODE] Running guaranteed transform cycle")
                 self._run_transformer()
@@ -513,10 +535,8 @@ class Orchestrator:
             else:
                 # PRODUCTION: Wait full interval before first transform
                 logger.info(f"Waiting {self.transform_interval_min} minutes before first transform")
-                for _ in range(self.transform_interval_min * 60):
-                    if self.stop_event.is_set():
-                        return
-                    time.sleep(1)
+                if self.stop_event.wait(self.transform_interval_min * 60):
+                    return
 
             # Periodic transform loop (both modes)
             while not self.stop_event.is_set():
@@ -526,10 +546,8 @@ class Orchestrator:
                     self.test_metrics["transform_cycles"] += 1
 
                 logger.info(f"Next transformer run scheduled in {self.transform_interval_min} minutes")
-                for _ in range(self.transform_interval_min * 60):
-                    if self.stop_event.is_set():
-                        return
-                    time.sleep(1)
+                if self.stop_event.wait(self.transform_interval_min * 60):
+                    return
 
         except Exception as e:
             logger.exception(f"Transformer loop failed: {e}")
@@ -586,10 +604,8 @@ class Orchestrator:
             if self.test_mode:
                 # TEST MODE: Force macro transform after 1-minute warmup
                 logger.warning("[TEST MODE] Waiting 1 minute before guaranteed macro transform")
-                for _ in range(60):  # 1 minute
-                    if self.stop_event.is_set():
-                        return
-                    time.sleep(1)
+                if self.stop_event.wait(60):  # 1 minute
+                    return
 
                 logger.warning("[TEST MODE] Running guaranteed macro transform cycle")
                 self._run_macro_transformer()
@@ -598,10 +614,8 @@ class Orchestrator:
             else:
                 # PRODUCTION: Wait full interval before first macro transform
                 logger.info(f"Waiting {self.macro_transform_interval_min} minutes before first macro transform")
-                for _ in range(self.macro_transform_interval_min * 60):
-                    if self.stop_event.is_set():
-                        return
-                    time.sleep(1)
+                if self.stop_event.wait(self.macro_transform_interval_min * 60):
+                    return
 
             # Periodic macro transform loop (both modes)
             while not self.stop_event.is_set():
@@ -611,10 +625,8 @@ class Orchestrator:
                     self.test_metrics["macro_transform_cycles"] += 1
 
                 logger.info(f"Next macro transformer run scheduled in {self.macro_transform_interval_min} minutes")
-                for _ in range(self.macro_transform_interval_min * 60):
-                    if self.stop_event.is_set():
-                        return
-                    time.sleep(1)
+                if self.stop_event.wait(self.macro_transform_interval_min * 60):
+                    return
 
         except Exception as e:
             logger.exception(f"Macro transformer loop failed: {e}")
@@ -675,11 +687,8 @@ class Orchestrator:
                 except Exception as e:
                     logger.exception(f"Failed to write health metrics: {e}")
 
-                # Sleep for 60 seconds, checking stop event periodically
-                for _ in range(60):
-                    if self.stop_event.is_set():
-                        break
-                    time.sleep(1)
+                # Wait 60 seconds, waking immediately on stop
+                self.stop_event.wait(60)
 
         except Exception as e:
             logger.exception(f"Health monitoring loop failed: {e}")
@@ -15,9 +15,10 @@ Usage:
 """
 
 import argparse
+import functools
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
 import pandas as pd
@@ -27,58 +28,107 @@ from tools.common import ensure_dir, load_config, setup_logging
 from tools.db import connect_and_register_views
 
 
-def build_slice_query(
-    symbols: List[str],
-    start: str,
-    end: str,
+# Slice shapes: (tf, source) -> (view, columns)
+SLICE_SHAPES: Dict[Tuple[str, str], Tuple[str, Tuple[str, ...]]] = {
+    ("1s", "bars"): ("bars_1s", (
+        "symbol", "ts", "open", "high", "low", "close",
+        "volume_base", "volume_quote", "trade_count", "vwap",
+        "bid", "ask", "spread",
+    )),
+    ("1m", "bars"): ("bars_1m", (
+        "symbol", "ts", "open", "high", "low", "close",
+        "volume_base", "volume_quote", "trade_count", "vwap",
+        "bid", "ask", "spread",
+    )),
+    ("1m", "klines"): ("klines_1m", (
+        "symbol", "ts", "open", "high", "low", "close",
+        "volume_base", "volume_quote", "trade_count",
+        "taker_buy_base", "taker_buy_quote",
+    )),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _slice_sql_template(
     tf: str,
     source: str,
-) -> tuple[str, List[str]]:
-    """
-    Build SQL query for data slice.
-
-    Returns:
-        (sql_query, columns_to_export)
-    """
-    # Determine source view
-    if tf == "1s":
-        if source != "bars":
+    columns: Optional[Tuple[str, ...]] = None,
+) -> Tuple[str, Tuple[str, ...]]:
+    """Build the parameterised slice SQL once per (tf, source, columns) shape."""
+    if (tf, source) not in SLICE_SHAPES:
+        if tf == "1s":
             raise ValueError("1s timeframe only available for bars source")
-        view = "bars_1s"
-        columns = ["symbol", "ts", "open", "high", "low", "close",
-                  "volume_base", "volume_quote", "trade_count", "vwap",
-                  "bid", "ask", "spread"]
-    elif tf == "1m":
-        if source == "bars":
-            view = "bars_1m"
-            columns = ["symbol", "ts", "open", "high", "low", "close",
-                      "volume_base", "volume_quote", "trade_count", "vwap",
-                      "bid", "ask", "spread"]
-        elif source == "klines":
-            view = "klines_1m"
-            columns = ["symbol", "ts", "open", "high", "low", "close",
-                      "volume_base", "volume_quote", "trade_count",
-                      "taker_buy_base", "taker_buy_quote"]
-        else:
+        if tf == "1m":
             raise ValueError(f"Unknown source: {source}")
-    else:
         raise ValueError(f"Unsupported timeframe: {tf} (use 1s or 1m)")
 
-    # Build WHERE clause
-    symbol_list = ", ".join([f"'{s}'" for s in symbols])
+    view, available = SLICE_SHAPES[(tf, source)]
+
+    if columns is None:
+        columns = available
+    else:
+        unknown = [c for c in columns if c not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns for {source} {tf}: {', '.join(unknown)}")
+        if not columns:
+            raise ValueError("At least one column is required")
 
     query = f"""
     SELECT {', '.join(columns)}
     FROM {view}
-    WHERE symbol IN ({symbol_list})
-      AND ts >= TIMESTAMP '{start}'
-      AND ts < TIMESTAMP '{end}'
+    WHERE symbol = ANY(?)
+      AND ts >= epoch_ms(?)
+      AND ts < epoch_ms(?)
     ORDER BY symbol, ts
     """
 
     return query, columns
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> int:
+    """
+    Parse an ISO timestamp to epoch milliseconds (UTC).
+
+    Naive timestamps are taken as UTC, matching CAST(... AS TIMESTAMP).
+    """
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def build_slice_query(
+    symbols: List[str],
+    start: str,
+    end: str,
+    tf: str,
+    source: str,
+    columns: Optional[List[str]] = None,
+) -> Tuple[str, List[Any], List[str]]:
+    """
+    Build parameterised SQL query for data slice.
+
+    The SQL text depends only on (tf, source, columns), so it is cached and
+    symbols and time bounds are bound as parameters instead of inlined.
+    Bounds are bound as epoch milliseconds; repeated ISO strings are parsed
+    once. Selecting a subset of columns lets DuckDB skip the other Parquet
+    column chunks entirely.
+
+    Args:
+        columns: Columns to select (default: all columns for the source)
+
+    Returns:
+        (sql_query, params, columns_to_export)
+    """
+    query, columns = _slice_sql_template(
+        tf, source, tuple(columns) if columns is not None else None
+    )
+    params = [list(symbols), _parse_iso(start), _parse_iso(end)]
+
+    return query, params, list(columns)
+
+
 def export_slice(
     config: Dict[str, Any],
     symbols: List[str],
@@ -88,6 +138,7 @@ def export_slice(
     source: str,
     out: str,
     format: str,
+    columns: Optional[List[str]] = None,
 ) -> None:
     """
     Export data slice to Parquet or CSV.
@@ -101,6 +152,7 @@ def export_slice(
         source: Data source (bars or klines)
         out: Output file path
         format: Output format (parquet or csv)
+        columns: Columns to export (default: all columns for the source)
     """
     setup_logging("slice", config)
 
@@ -121,11 +173,11 @@ def export_slice(
     try:
 
         # Build query
-        query, columns = build_slice_query(symbols, start, end, tf, source)
-        logger.debug(f"Query: {query}")
+        query, params, columns = build_slice_query(symbols, start, end, tf, source, columns)
+        logger.debug(f"Query: {query} params={params}")
 
         # Execute query
-        result = conn.execute(query)
+        result = conn.execute(query, params)
         df = result.fetchdf()
 
         if df.empty:
@@ -150,7 +202,8 @@ def export_slice(
 
         logger.info(f"✓ Exported {len(df):,} rows to {out}")
         logger.info(f"  Columns: {list(df.columns)}")
-        logger.info(f"  Time range: {df['ts'].min()} to {df['ts'].max()}")
+        if "ts" in df.columns:
+            logger.info(f"  Time range: {df['ts'].min()} to {df['ts'].max()}")
 
     except Exception as e:
         logger.exception(f"Failed to export slice: {e}")
@@ -177,6 +230,8 @@ def main():
                        help="Output file path")
     parser.add_argument("--format", type=str, default="parquet", choices=["parquet", "csv"],
                        help="Output format (parquet or csv)")
+    parser.add_argument("--columns", type=str, default=None,
+                       help="Comma-separated columns to export (default: all, e.g., ts,symbol,close)")
 
     args = parser.parse_args()
 
@@ -200,6 +255,7 @@ def main():
         source=args.source,
         out=args.out,
         format=args.format,
+        columns=[c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None,
     )
 
 
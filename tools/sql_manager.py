@@ -5,6 +5,7 @@ Provides portable SQL database management across DuckDB, SQLite, and PostgreSQL.
 Handles schema creation, view registration, and integrity verification.
 """
 
+import functools
 import os
 import re
 from pathlib import Path
@@ -12,13 +13,47 @@ from typing import Dict, List, Optional, Tuple, Union
 
 import duckdb
 from loguru import logger
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
 # Type alias for database connections
 DatabaseConnection = Union[Engine, duckdb.DuckDBPyConnection]
 
+# Objects created by schema.sql, checked by verify_integrity()
+EXPECTED_TABLES = (
+    "bars_1s",
+    "bars_1m",
+    "klines_1m",
+    "compare_our_vs_kline_1m",
+    "funding_oi_hourly",
+    "macro_minute",
+)
+
+EXPECTED_INDEXES = {
+    "bars_1s": ("idx_bars_1s_symbol_ts", "idx_bars_1s_ts"),
+    "bars_1m": ("idx_bars_1m_symbol_ts", "idx_bars_1m_ts"),
+    "klines_1m": ("idx_klines_1m_symbol_ts", "idx_klines_1m_ts"),
+    "compare_our_vs_kline_1m": ("idx_compare_symbol_ts", "idx_compare_abs_error"),
+    "funding_oi_hourly": ("idx_funding_oi_symbol_ts", "idx_funding_oi_ts"),
+    "macro_minute": ("idx_macro_minute_key_ts", "idx_macro_minute_ts"),
+}
+
+# Single catalog queries returning (object_type, name, table_name) rows
+_CATALOG_QUERIES = {
+    "sqlite": (
+        "SELECT type, name, tbl_name FROM sqlite_master "
+        "WHERE type IN ('table', 'view', 'index')"
+    ),
+    "postgresql": (
+        "SELECT 'table', table_name, table_name FROM information_schema.tables "
+        "WHERE table_schema = current_schema() "
+        "UNION ALL "
+        "SELECT 'index', indexname, tablename FROM pg_indexes "
+        "WHERE schemaname = current_schema()"
+    ),
+}
+
 
 def get_connection_string(config: Dict) -> str:
     """
@@ -113,6 +148,24 @@ def sanitize_connection_string(conn_str: str) -> str:
     return re.sub(r":([^:@]+)@", r":****@", conn_str)
 
 
+def enable_sqlite_pragmas(engine: Engine) -> None:
+    """
+    Enable WAL journaling and NORMAL sync on every new SQLite connection.
+
+    WAL lets readers proceed during writes and, with synchronous=NORMAL,
+    avoids an fsync per committed transaction during bulk inserts.
+
+    Args:
+        engine: SQLAlchemy engine for a SQLite database
+    """
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 def init_database(engine: str = "duckdb", config_path: str = "config.yml") -> DatabaseConnection:
     """
     Initialize database connection from configuration.
@@ -136,6 +189,23 @@ def init_database(engine: str = "duckdb", config_path: str = "config.yml") -> Da
     with open(config_path, "r", encoding="utf-8") as f:
         config = yaml.safe_load(f)
 
+    return init_database_from_dict(config, engine)
+
+
+def init_database_from_dict(config: Dict, engine: str = "auto") -> DatabaseConnection:
+    """
+    Initialize database connection from an already-loaded configuration.
+
+    Args:
+        config: Configuration dictionary (as loaded from config.yml)
+        engine: Database engine ("duckdb", "sqlite", "postgres", or "auto")
+
+    Returns:
+        SQLAlchemy Engine for sqlite/postgres, DuckDB connection for duckdb
+
+    Raises:
+        ValueError: If engine type is unsupported or config is invalid
+    """
     # Get connection string
     try:
         conn_str = get_connection_string(config)
@@ -180,6 +250,9 @@ def init_database(engine: str = "duckdb", config_path: str = "config.yml") -> Da
                 echo=False
             )
 
+            if engine == "sqlite":
+                enable_sqlite_pragmas(engine_instance)
+
             # Test connection
             with engine_instance.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -193,6 +266,48 @@ def init_database(engine: str = "duckdb", config_path: str = "config.yml") -> Da
         raise ValueError(f"Unsupported database engine: {engine}")
 
 
+@functools.lru_cache(maxsize=4)
+def _load_schema_statements(schema_path: str, mtime: float, sqlite: bool) -> Tuple[str, ...]:
+    """
+    Read schema.sql and split it into individual statements.
+
+    Cached per process; the mtime argument invalidates the cache when the
+    file changes on disk.
+
+    Args:
+        schema_path: Path to schema.sql
+        mtime: File modification time (cache key only)
+        sqlite: Apply SQLite dialect transformations
+
+    Returns:
+        Tuple of SQL statements with comments removed
+    """
+    with open(schema_path, "r", encoding="utf-8") as f:
+        schema_sql = f.read()
+
+    if sqlite:
+        # SQLite uses REAL instead of DOUBLE PRECISION
+        schema_sql = schema_sql.replace("DOUBLE PRECISION", "REAL")
+
+    # Remove SQL comments to prevent parsing issues
+    cleaned_lines = []
+    for line in schema_sql.split("\n"):
+        # Remove inline comments (-- comment)
+        comment_pos = line.find("--")
+        if comment_pos >= 0:
+            # Keep the line up to the comment (unless comment is at start)
+            line_content = line[:comment_pos].rstrip()
+            if line_content:
+                cleaned_lines.append(line_content)
+        else:
+            cleaned_lines.append(line)
+
+    schema_sql_clean = "\n".join(cleaned_lines)
+
+    # Split by semicolon once; callers execute statements in order
+    return tuple(s.strip() for s in schema_sql_clean.split(";") if s.strip())
+
+
 def apply_schema(engine: DatabaseConnection) -> bool:
     """
     Load and execute schema.sql to create tables and indexes.
@@ -212,54 +327,36 @@ def apply_schema(engine: DatabaseConnection) -> bool:
         logger.error(f"Schema file not found: {schema_path}")
         return False
 
-    with open(schema_path, "r", encoding="utf-8") as f:
-        schema_sql = f.read()
-
     # Detect engine type
     is_duckdb = isinstance(engine, duckdb.DuckDBPyConnection)
     is_sqlite = not is_duckdb and "sqlite" in str(engine.url).lower()
     is_postgres = not is_duckdb and "postgres" in str(engine.url).lower()
 
-    # Apply dialect-specific transformations
     if is_sqlite:
-        # SQLite uses REAL instead of DOUBLE PRECISION
-        schema_sql = schema_sql.replace("DOUBLE PRECISION", "REAL")
         logger.debug("Applied SQLite dialect transformations (DOUBLE PRECISION → REAL)")
     elif is_postgres:
         # PostgreSQL can enable partitioning by uncommenting hints
         # For now, leave as-is (partitioning hints are in comments)
         logger.debug("Using PostgreSQL dialect (partitioning hints available in comments)")
 
-    # Remove SQL comments to prevent parsing issues
-    lines = schema_sql.split("\n")
-    cleaned_lines = []
-    for line in lines:
-        # Remove inline comments (-- comment)
-        comment_pos = line.find("--")
-        if comment_pos >= 0:
-            # Keep the line up to the comment (unless comment is at start)
-            line_content = line[:comment_pos].rstrip()
-            if line_content:
-                cleaned_lines.append(line_content)
-        else:
-            cleaned_lines.append(line)
-
-    schema_sql_clean = "\n".join(cleaned_lines)
+    # Parsed statements are cached per (path, mtime, dialect)
+    statements = _load_schema_statements(
+        str(schema_path), schema_path.stat().st_mtime, is_sqlite
+    )
 
     # Execute schema
     try:
         if is_duckdb:
             # DuckDB: Execute directly
             logger.info("Applying schema to DuckDB...")
-            engine.execute(schema_sql_clean)
+            engine.execute(";\n".join(statements) + ";")
             logger.info("Schema applied successfully to DuckDB")
             return True
         else:
             # SQLAlchemy: Execute in transaction
             logger.info(f"Applying schema to {engine.url.drivername}...")
             with engine.begin() as conn:
-                # Split by semicolon and execute each statement
-                statements = [s.strip() for s in schema_sql_clean.split(";") if s.strip()]
+                # Execute each statement in a single transaction
                 for i, stmt in enumerate(statements):
                     if stmt:
                         try:
@@ -345,6 +442,38 @@ def register_views_if_supported(engine: DatabaseConnection, base_path: str) -> b
         return False
 
 
+def _fetch_catalog(engine: Engine) -> Tuple[set, set]:
+    """
+    Fetch existing table/view names and (table, index) pairs.
+
+    Uses a single catalog query for SQLite and PostgreSQL, falling back to
+    the SQLAlchemy inspector for other dialects.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Tuple of (table_names, {(table_name, index_name), ...})
+    """
+    query = _CATALOG_QUERIES.get(engine.dialect.name)
+
+    if query is None:
+        inspector = inspect(engine)
+        tables = set(inspector.get_table_names())
+        indexes = set()
+        for table in EXPECTED_TABLES:
+            if table in tables:
+                indexes.update((table, idx["name"]) for idx in inspector.get_indexes(table))
+        return tables, indexes
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(query)).fetchall()
+
+    tables = {name for obj_type, name, _ in rows if obj_type in ("table", "view")}
+    indexes = {(table, name) for obj_type, name, table in rows if obj_type == "index"}
+    return tables, indexes
+
+
 def verify_integrity(engine: DatabaseConnection) -> Tuple[bool, List[str]]:
     """
     Verify database schema integrity by checking expected tables and indexes.
@@ -355,24 +484,6 @@ def verify_integrity(engine: DatabaseConnection) -> Tuple[bool, List[str]]:
     Returns:
         Tuple of (all_present: bool, missing: List[str])
     """
-    expected_tables = [
-        "bars_1s",
-        "bars_1m",
-        "klines_1m",
-        "compare_our_vs_kline_1m",
-        "funding_oi_hourly",
-        "macro_minute",
-    ]
-
-    expected_indexes = {
-        "bars_1s": ["idx_bars_1s_symbol_ts", "idx_bars_1s_ts"],
-        "bars_1m": ["idx_bars_1m_symbol_ts", "idx_bars_1m_ts"],
-        "klines_1m": ["idx_klines_1m_symbol_ts", "idx_klines_1m_ts"],
-        "compare_our_vs_kline_1m": ["idx_compare_symbol_ts", "idx_compare_abs_error"],
-        "funding_oi_hourly": ["idx_funding_oi_symbol_ts", "idx_funding_oi_ts"],
-        "macro_minute": ["idx_macro_minute_key_ts", "idx_macro_minute_ts"],
-    }
-
     missing = []
 
     try:
@@ -384,7 +495,7 @@ def verify_integrity(engine: DatabaseConnection) -> Tuple[bool, List[str]]:
             existing_tables = {row[0] for row in result}
 
             # Check tables
-            for table in expected_tables:
+            for table in EXPECTED_TABLES:
                 if table not in existing_tables:
                     missing.append(f"table:{table}")
                     logger.debug(f"Missing table: {table}")
@@ -393,25 +504,19 @@ def verify_integrity(engine: DatabaseConnection) -> Tuple[bool, List[str]]:
             logger.debug("Skipping index verification for DuckDB (not exposed in information_schema)")
 
         else:
-            # SQLAlchemy: Use inspector
-            inspector = inspect(engine)
-            existing_tables = set(inspector.get_table_names())
+            # SQLAlchemy: One catalog round-trip, then set lookups
+            existing_tables, existing_indexes = _fetch_catalog(engine)
 
-            # Check tables
-            for table in expected_tables:
+            for table in EXPECTED_TABLES:
                 if table not in existing_tables:
                     missing.append(f"table:{table}")
                     logger.debug(f"Missing table: {table}")
-                else:
-                    # Check indexes for this table
-                    try:
-                        existing_indexes = {idx["name"] for idx in inspector.get_indexes(table)}
-                        for expected_idx in expected_indexes.get(table, []):
-                            if expected_idx not in existing_indexes:
-                                missing.append(f"index:{table}.{expected_idx}")
-                                logger.debug(f"Missing index: {expected_idx} on {table}")
-                    except Exception as e:
-                        logger.warning(f"Could not verify indexes for {table}: {e}")
+                    continue
+
+                for expected_idx in EXPECTED_INDEXES.get(table, ()):
+                    if (table, expected_idx) not in existing_indexes:
+                        missing.append(f"index:{table}.{expected_idx}")
+                        logger.debug(f"Missing index: {expected_idx} on {table}")
 
         if not missing:
             logger.info("Database integrity verified: all tables and indexes present")
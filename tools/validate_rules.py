@@ -15,11 +15,13 @@ Usage:
 """
 
 import argparse
+import functools
 import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -32,6 +34,12 @@ SPREAD_TO_MID_MAX_BPS = 500  # 5% spread to mid threshold
 SPREAD_OUTLIER_MAX_PCT = 0.1  # Allow 0.1% of rows to exceed spread threshold
 MAX_OFFENDING_ROWS = 25  # Max rows to show per rule in report
 
+NAT_NS = np.iinfo(np.int64).min
+ONE_SECOND_NS = 1_000_000_000
+
+# Bar width per timeframe
+TF_NS = {"1s": ONE_SECOND_NS, "1m": 60 * ONE_SECOND_NS}
+
 
 def fetch_data(
     conn: duckdb.DuckDBPyConnection,
@@ -76,126 +84,232 @@ def fetch_data(
     return df
 
 
-def rule_r1_ohlc_ordering(df: pd.DataFrame) -> Tuple[int, pd.DataFrame]:
-    """R1: OHLC ordering - low <= open,close <= high"""
-    violations = df[
-        ~((df["low"] <= df["open"]) &
-          (df["low"] <= df["close"]) &
-          (df["open"] <= df["high"]) &
-          (df["close"] <= df["high"]))
-    ].copy()
+def _ts_ns(ts: pd.Series) -> np.ndarray:
+    """Return timestamps as int64 nanoseconds since epoch (NaT -> int64 min)."""
+    return pd.DatetimeIndex(ts).as_unit("ns").asi8
 
-    return len(violations), violations.head(MAX_OFFENDING_ROWS)
 
+class RuleColumns(dict):
+    """
+    Column arrays of a bars frame, extracted on first use and shared by rules.
 
-def rule_r2_positive_prices(df: pd.DataFrame) -> Tuple[int, pd.DataFrame]:
-    """R2: Non-negative prices - open,high,low,close > 0"""
-    violations = df[
-        ~((df["open"] > 0) &
-          (df["high"] > 0) &
-          (df["low"] > 0) &
-          (df["close"] > 0))
-    ].copy()
+    Passing one instance to several rule_r* functions converts each column to
+    NumPy once instead of once per rule. The dict starts empty (and so is
+    falsy); callers must test it against None, not for truthiness.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__()
+        self.df = df
 
-    return len(violations), violations.head(MAX_OFFENDING_ROWS)
+    def __missing__(self, key: str) -> np.ndarray:
+        if key == "ts":
+            value = _ts_ns(self.df["ts"])
+        elif key == "symbol_codes":
+            value = pd.factorize(self.df["symbol"])[0]
+        else:
+            value = self.df[key].to_numpy(dtype="float64")
+        self[key] = value
+        return value
 
 
-def rule_r3_ask_gte_bid(df: pd.DataFrame) -> Tuple[int, pd.DataFrame]:
-    """R3: Ask >= Bid (bars only; ignore if NaN)"""
-    if "bid" not in df.columns or "ask" not in df.columns:
-        return 0, pd.DataFrame()
+def _find_gaps(
+    ts_ns: np.ndarray,
+    group_codes: np.ndarray,
+    max_gap_ns: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find gaps larger than max_gap_ns between consecutive timestamps per group.
 
-    # Only check rows where both bid and ask are not NaN
-    valid_quotes = df[df["bid"].notna() & df["ask"].notna()].copy()
+    Rows are ordered by (group code, ts) once and diffed in a single pass;
+    NaT timestamps (int64 min) never form a gap.
 
-    if valid_quotes.empty:
-        return 0, pd.DataFrame()
+    Args:
+        ts_ns: int64 nanosecond timestamps
+        group_codes: int64 group code per row (e.g. from pd.factorize)
+        max_gap_ns: Largest allowed step between consecutive rows
+
+    Returns:
+        (order, gap_positions, gap_sizes_ns) where order is the sort
+        permutation and gap_positions index into it (the row after the gap)
+    """
+    order = np.lexsort((ts_ns, group_codes))
+    ts_sorted = ts_ns[order]
+    codes_sorted = group_codes[order]
+    valid_sorted = ts_sorted != NAT_NS
+
+    diffs = np.diff(ts_sorted)
+    gaps = (
+        (codes_sorted[1:] == codes_sorted[:-1]) &
+        valid_sorted[1:] & valid_sorted[:-1] &
+        (diffs > max_gap_ns)
+    )
+    gap_idx = np.flatnonzero(gaps)
 
-    violations = valid_quotes[~(valid_quotes["ask"] >= valid_quotes["bid"])].copy()
+    return order, gap_idx + 1, diffs[gap_idx]
 
-    return len(violations), violations.head(MAX_OFFENDING_ROWS)
 
+def _offending_rows(df: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    """Materialise only the first MAX_OFFENDING_ROWS rows at positions."""
+    return df.iloc[positions[:MAX_OFFENDING_ROWS]].copy()
 
-def rule_r4_no_nans_ohlc(df: pd.DataFrame) -> Tuple[int, pd.DataFrame]:
-    """R4: No NaNs in OHLC (allow NaN in bid/ask/spread if unavailable)"""
-    violations = df[
-        df["open"].isna() |
-        df["high"].isna() |
-        df["low"].isna() |
-        df["close"].isna()
-    ].copy()
 
-    return len(violations), violations.head(MAX_OFFENDING_ROWS)
+def _r1_mask(cols: RuleColumns) -> np.ndarray:
+    o, h, l, c = cols["open"], cols["high"], cols["low"], cols["close"]
+    # Negate the valid condition so NaN rows count as violations
+    return ~((l <= o) & (l <= c) & (o <= h) & (c <= h))
 
 
-def rule_r5_timestamp_continuity(df: pd.DataFrame, tf: str) -> Tuple[int, pd.DataFrame]:
-    """R5: Timestamp continuity"""
-    violations_list = []
+def _r2_mask(cols: RuleColumns) -> np.ndarray:
+    o, h, l, c = cols["open"], cols["high"], cols["low"], cols["close"]
+    return ~((o > 0) & (h > 0) & (l > 0) & (c > 0))
 
-    if tf == "1m":
-        # Check UTC minute alignment (ts % 60 == 0)
-        df_check = df.copy()
-        df_check["ts_second"] = df_check["ts"].dt.second
 
-        misaligned = df_check[df_check["ts_second"] != 0].copy()
-        violations_list.append(misaligned)
+def _r3_mask(cols: RuleColumns) -> Optional[np.ndarray]:
+    if "bid" not in cols.df.columns or "ask" not in cols.df.columns:
+        return None
+    bid, ask = cols["bid"], cols["ask"]
+    # Only check rows where both bid and ask are not NaN
+    return ~np.isnan(bid) & ~np.isnan(ask) & (ask < bid)
 
-    elif tf == "1s":
-        # Check for gaps > 1 second between consecutive timestamps per symbol
-        for symbol in df["symbol"].unique():
-            symbol_df = df[df["symbol"] == symbol].sort_values("ts").copy()
 
-            if len(symbol_df) < 2:
-                continue
+def _r4_mask(cols: RuleColumns) -> np.ndarray:
+    o, h, l, c = cols["open"], cols["high"], cols["low"], cols["close"]
+    return np.isnan(o) | np.isnan(h) | np.isnan(l) | np.isnan(c)
 
-            symbol_df["ts_diff"] = symbol_df["ts"].diff()
-            # Allow up to 1 second gap (gaps > 1s are violations)
-            gaps = symbol_df[symbol_df["ts_diff"] > pd.Timedelta(seconds=1)].copy()
 
-            if not gaps.empty:
-                violations_list.append(gaps)
+def _r5_gaps(cols: RuleColumns, tol_ns: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """R5 core: rows following a gap larger than tol_ns within a symbol."""
+    order, gap_pos, gap_ns = _find_gaps(cols["ts"], cols["symbol_codes"], tol_ns)
+    return order[gap_pos], gap_ns
 
-    if violations_list:
-        violations = pd.concat(violations_list, ignore_index=True)
-        return len(violations), violations.head(MAX_OFFENDING_ROWS)
 
-    return 0, pd.DataFrame()
+def _r5_alignment(cols: RuleColumns, step_ns: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """R5 core: rows whose whole-second timestamp is not on a step_ns boundary."""
+    ts_ns = cols["ts"]
+    return np.flatnonzero((ts_ns != NAT_NS) & (ts_ns % step_ns >= ONE_SECOND_NS)), None
 
 
-def rule_r6_spread_sanity(df: pd.DataFrame) -> Tuple[int, pd.DataFrame, Dict[str, Any]]:
-    """R6: Spread sanity (bars only)"""
-    if "spread" not in df.columns or "bid" not in df.columns or "ask" not in df.columns:
-        return 0, pd.DataFrame(), {}
+# R5 check per timeframe, specialised once at import:
+# 1s bars allow up to a 1 second step, 1m bars must sit on UTC minutes
+R5_FOR = {
+    "1s": functools.partial(_r5_gaps, tol_ns=TF_NS["1s"]),
+    "1m": functools.partial(_r5_alignment, step_ns=TF_NS["1m"]),
+}
 
-    # Filter to rows with valid spread data
-    valid_spread = df[df["spread"].notna() & df["bid"].notna() & df["ask"].notna()].copy()
 
-    if valid_spread.empty:
-        return 0, pd.DataFrame(), {}
+def _r5_violations(cols: RuleColumns, tf: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Return (row positions, gap sizes in ns or None) for R5."""
+    check = R5_FOR.get(tf)
+    if check is None or cols.df.empty:
+        return np.empty(0, dtype=np.int64), None
+    return check(cols)
+
 
-    # Check spread >= 0
-    negative_spread = valid_spread[valid_spread["spread"] < 0].copy()
+def _r6_masks(cols: RuleColumns) -> Optional[Dict[str, np.ndarray]]:
+    """Return valid/negative/excessive masks and spread-to-mid for R6."""
+    if not {"spread", "bid", "ask"}.issubset(cols.df.columns):
+        return None
+
+    spread, bid, ask = cols["spread"], cols["bid"], cols["ask"]
+
+    # Filter to rows with valid spread data
+    valid = ~np.isnan(spread) & ~np.isnan(bid) & ~np.isnan(ask)
 
     # Check spread / mid < 5% for >99.9% of rows
-    valid_spread["mid"] = (valid_spread["bid"] + valid_spread["ask"]) / 2
-    valid_spread["spread_to_mid_bps"] = (valid_spread["spread"] / valid_spread["mid"]) * 10000
+    mid = (bid + ask) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_to_mid_bps = (spread / mid) * 10000
+
+    return {
+        "valid": valid,
+        "negative": valid & (spread < 0),
+        "excessive": valid & (spread_to_mid_bps >= SPREAD_TO_MID_MAX_BPS),
+        "mid": mid,
+        "spread_to_mid_bps": spread_to_mid_bps,
+    }
+
+
+def rule_r1_ohlc_ordering(df: pd.DataFrame, cols: Optional[RuleColumns] = None) -> Tuple[int, pd.DataFrame]:
+    """R1: OHLC ordering - low <= open,close <= high"""
+    positions = np.flatnonzero(_r1_mask(cols if cols is not None else RuleColumns(df)))
+    return len(positions), _offending_rows(df, positions)
+
+
+def rule_r2_positive_prices(df: pd.DataFrame, cols: Optional[RuleColumns] = None) -> Tuple[int, pd.DataFrame]:
+    """R2: Non-negative prices - open,high,low,close > 0"""
+    positions = np.flatnonzero(_r2_mask(cols if cols is not None else RuleColumns(df)))
+    return len(positions), _offending_rows(df, positions)
+
+
+def rule_r3_ask_gte_bid(df: pd.DataFrame, cols: Optional[RuleColumns] = None) -> Tuple[int, pd.DataFrame]:
+    """R3: Ask >= Bid (bars only; ignore if NaN)"""
+    mask = _r3_mask(cols if cols is not None else RuleColumns(df))
+    if mask is None:
+        return 0, pd.DataFrame()
+
+    positions = np.flatnonzero(mask)
+    return len(positions), _offending_rows(df, positions)
+
+
+def rule_r4_no_nans_ohlc(df: pd.DataFrame, cols: Optional[RuleColumns] = None) -> Tuple[int, pd.DataFrame]:
+    """R4: No NaNs in OHLC (allow NaN in bid/ask/spread if unavailable)"""
+    positions = np.flatnonzero(_r4_mask(cols if cols is not None else RuleColumns(df)))
+    return len(positions), _offending_rows(df, positions)
+
+
+def rule_r5_timestamp_continuity(
+    df: pd.DataFrame,
+    tf: str,
+    cols: Optional[RuleColumns] = None,
+) -> Tuple[int, pd.DataFrame]:
+    """R5: Timestamp continuity"""
+    positions, gap_ns = _r5_violations(cols if cols is not None else RuleColumns(df), tf)
+    if len(positions) == 0:
+        return 0, pd.DataFrame()
+
+    offending = _offending_rows(df, positions)
+    if gap_ns is None:
+        offending["ts_second"] = offending["ts"].dt.second
+        return len(positions), offending
 
-    excessive_spread = valid_spread[valid_spread["spread_to_mid_bps"] >= SPREAD_TO_MID_MAX_BPS].copy()
+    offending["ts_diff"] = pd.to_timedelta(gap_ns[:MAX_OFFENDING_ROWS], unit="ns")
+    return len(positions), offending.reset_index(drop=True)
+
+
+def rule_r6_spread_sanity(
+    df: pd.DataFrame,
+    cols: Optional[RuleColumns] = None,
+) -> Tuple[int, pd.DataFrame, Dict[str, Any]]:
+    """R6: Spread sanity (bars only)"""
+    r6 = _r6_masks(cols if cols is not None else RuleColumns(df))
+    if r6 is None:
+        return 0, pd.DataFrame(), {}
+
+    total_checked = int(r6["valid"].sum())
+    if total_checked == 0:
+        return 0, pd.DataFrame(), {}
 
-    total_violations = len(negative_spread) + len(excessive_spread)
-    pct_excessive = (len(excessive_spread) / len(valid_spread)) * 100 if len(valid_spread) > 0 else 0
+    negative_count = int(r6["negative"].sum())
+    excessive_count = int(r6["excessive"].sum())
+    total_violations = negative_count + excessive_count
+    pct_excessive = (excessive_count / total_checked) * 100
 
-    # Combine violations
-    all_violations = pd.concat([negative_spread, excessive_spread], ignore_index=True)
+    # Negative-spread rows first, then excessive-spread rows
+    positions = np.concatenate([np.flatnonzero(r6["negative"]), np.flatnonzero(r6["excessive"])])
+    positions = positions[:MAX_OFFENDING_ROWS]
+    offending = df.iloc[positions].copy()
+    offending["mid"] = r6["mid"][positions]
+    offending["spread_to_mid_bps"] = r6["spread_to_mid_bps"][positions]
 
     stats = {
-        "total_checked": len(valid_spread),
-        "negative_spread_count": len(negative_spread),
-        "excessive_spread_count": len(excessive_spread),
+        "total_checked": total_checked,
+        "negative_spread_count": negative_count,
+        "excessive_spread_count": excessive_count,
         "excessive_spread_pct": pct_excessive,
     }
 
-    return total_violations, all_violations.head(MAX_OFFENDING_ROWS), stats
+    return total_violations, offending.reset_index(drop=True), stats
 
 
 def rule_r7_kline_parity(
@@ -391,12 +505,13 @@ def run_validation(
 
         logger.info(f"Loaded {len(df):,} rows for validation")
 
-        # Run validation rules
+        # Run validation rules over one shared set of column arrays
         results = {"total_rows": len(df), "rules": {}}
+        cols = RuleColumns(df)
 
         # R1: OHLC ordering
         logger.info("Running R1: OHLC ordering...")
-        r1_count, r1_rows = rule_r1_ohlc_ordering(df)
+        r1_count, r1_rows = rule_r1_ohlc_ordering(df, cols)
         results["rules"]["R1"] = {
             "description": "OHLC ordering (low <= open,close <= high)",
             "checked": len(df),
@@ -406,7 +521,7 @@ def run_validation(
 
         # R2: Positive prices
         logger.info("Running R2: Positive prices...")
-        r2_count, r2_rows = rule_r2_positive_prices(df)
+        r2_count, r2_rows = rule_r2_positive_prices(df, cols)
         results["rules"]["R2"] = {
             "description": "Non-negative prices (OHLC > 0)",
             "checked": len(df),
@@ -416,17 +531,17 @@ def run_validation(
 
         # R3: Ask >= Bid
         logger.info("Running R3: Ask >= Bid...")
-        r3_count, r3_rows = rule_r3_ask_gte_bid(df)
+        r3_count, r3_rows = rule_r3_ask_gte_bid(df, cols)
         results["rules"]["R3"] = {
             "description": "Ask >= Bid (bars only)",
-            "checked": len(df[df["bid"].notna() & df["ask"].notna()]) if "bid" in df.columns else 0,
+            "checked": int((df["bid"].notna() & df["ask"].notna()).sum()) if "bid" in df.columns else 0,
             "violations": r3_count,
             "offending_rows": r3_rows,
         }
 
         # R4: No NaNs in OHLC
         logger.info("Running R4: No NaNs in OHLC...")
-        r4_count, r4_rows = rule_r4_no_nans_ohlc(df)
+        r4_count, r4_rows = rule_r4_no_nans_ohlc(df, cols)
         results["rules"]["R4"] = {
             "description": "No NaNs in OHLC",
             "checked": len(df),
@@ -436,7 +551,7 @@ def run_validation(
 
         # R5: Timestamp continuity
         logger.info("Running R5: Timestamp continuity...")
-        r5_count, r5_rows = rule_r5_timestamp_continuity(df, tf)
+        r5_count, r5_rows = rule_r5_timestamp_continuity(df, tf, cols)
         results["rules"]["R5"] = {
             "description": "Timestamp continuity and alignment",
             "checked": len(df),
@@ -446,7 +561,7 @@ def run_validation(
 
         # R6: Spread sanity
         logger.info("Running R6: Spread sanity...")
-        r6_count, r6_rows, r6_stats = rule_r6_spread_sanity(df)
+        r6_count, r6_rows, r6_stats = rule_r6_spread_sanity(df, cols)
         results["rules"]["R6"] = {
             "description": "Spread sanity (spread >= 0, < 5% mid)",
             "checked": r6_stats.get("total_checked", 0),
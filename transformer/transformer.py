@@ -4,6 +4,7 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -37,28 +38,31 @@ def _aggregate_bars_1s(df: pd.DataFrame, symbol: str, second: int = 1) -> pd.Dat
     if df.empty:
         return pd.DataFrame()
 
-    # Timestamps
-    df = df.copy()
-    df["ts"] = pd.to_datetime(df["ts_event"], unit="ms", utc=True)
-    df["sec"] = df["ts"].dt.floor(f"{second}s")
-
-    # Trade-based OHLCV
-    trades = df[df["stream"] == "trade"].copy()
-    quotes = df[df["stream"] == "bookTicker"].copy()
+    # Integer bucket per event: ts_event (ms) floored to the interval, in ns
+    interval_ns = second * 1_000_000_000
+    ts_ns = pd.to_numeric(df["ts_event"]).to_numpy(dtype="int64") * 1_000_000
+    bucket = ts_ns // interval_ns * interval_ns
+    stream = df["stream"].to_numpy()
 
-    # Sort by timestamp for deterministic first/last aggregation
-    if not trades.empty:
-        trades = trades.sort_values("ts")
-    if not quotes.empty:
-        quotes = quotes.sort_values("ts")
+    # Stable sort by event time for deterministic first/last aggregation;
+    # buckets are then already ascending so groupby can skip sorting
+    order = np.argsort(ts_ns, kind="stable")
+    is_trade = stream[order] == "trade"
+    is_quote = stream[order] == "bookTicker"
 
     bars = []
-    if not trades.empty:
-        trades["price"] = pd.to_numeric(trades["price"])
-        trades["qty"] = pd.to_numeric(trades["qty"])
-        trades["pq"] = trades["price"] * trades["qty"]
-
-        agg = trades.groupby("sec").agg(
+    if is_trade.any():
+        idx = order[is_trade]
+        price = pd.to_numeric(df["price"]).to_numpy(dtype="float64")[idx]
+        qty = pd.to_numeric(df["qty"]).to_numpy(dtype="float64")[idx]
+        trades = pd.DataFrame({
+            "window_start": bucket[idx],
+            "price": price,
+            "qty": qty,
+            "pq": price * qty,
+        })
+
+        agg = trades.groupby("window_start", sort=False).agg(
             open=("price", "first"),
             high=("price", "max"),
             low=("price", "min"),
@@ -74,14 +78,20 @@ def _aggregate_bars_1s(df: pd.DataFrame, symbol: str, second: int = 1) -> pd.Dat
         bars_df = bars[0]
     else:
         # No trades present, create empty bar frame
-        bars_df = pd.DataFrame(columns=["open", "high", "low", "close", "volume_base", "volume_quote", "trade_count", "vwap"])
+        bars_df = pd.DataFrame(
+            columns=["open", "high", "low", "close", "volume_base", "volume_quote", "trade_count", "vwap"],
+            index=pd.Index([], dtype="int64", name="window_start"),
+        )
 
     # Quote snapshots (last bid/ask per second)
-    if not quotes.empty:
-        quotes["bid"] = pd.to_numeric(quotes["bid"])
-        quotes["ask"] = pd.to_numeric(quotes["ask"])
-        # Already sorted above for determinism
-        q_agg = quotes.groupby("sec").agg(bid=("bid", "last"), ask=("ask", "last"))
+    if is_quote.any():
+        idx = order[is_quote]
+        quotes = pd.DataFrame({
+            "window_start": bucket[idx],
+            "bid": pd.to_numeric(df["bid"]).to_numpy(dtype="float64")[idx],
+            "ask": pd.to_numeric(df["ask"]).to_numpy(dtype="float64")[idx],
+        })
+        q_agg = quotes.groupby("window_start", sort=False).agg(bid=("bid", "last"), ask=("ask", "last"))
         bars_df = bars_df.join(q_agg, how="outer")
 
     # Spread
@@ -90,17 +100,11 @@ def _aggregate_bars_1s(df: pd.DataFrame, symbol: str, second: int = 1) -> pd.Dat
 
     # Drop rows with no actual trade data (gap periods).
     # Missing data stays missing rather than being fabricated with forward-fill.
-    bars_df = bars_df.dropna(subset=["close"])
-
-    # Finalize schema
-    out = bars_df.reset_index().rename(columns={"index": "window_start"})
+    bars_df = bars_df.dropna(subset=["close"]).sort_index()
 
-    # --- NEW: Ensure timestamps are normalised to UTC ---
-    if out["window_start"].dt.tz is not None:
-        out["window_start"] = out["window_start"].dt.tz_convert("UTC")
-    else:
-        out["window_start"] = out["window_start"].dt.tz_localize("UTC")
-    # ----------------------------------------------------
+    # Finalize schema; bucket keys become UTC timestamps once, at the end
+    out = bars_df.reset_index()
+    out["window_start"] = pd.to_datetime(out["window_start"].to_numpy(dtype="int64"), unit="ns", utc=True)
 
     out["symbol"] = symbol
     # Ensure types